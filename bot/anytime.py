@@ -0,0 +1,134 @@
+import threading
+
+# the value next returns once a search is over
+FINISHED = object()
+
+
+class AnytimeSearch:
+    def __init__(self, helper, deadline=0.2, on_refined=None) -> None:
+        """
+        Runs the searches of a helper bot (see bot.main.BotInterface.search)
+        in a background thread, so its suggestion is ready within a deadline
+        and keeps improving while the player types their guess.
+
+        helper: the bot searching, from bot.main or bot.multi_bot
+        deadline: seconds best waits for a search to finish before returning
+        its best guess so far
+        on_refined: called from the search thread with the game and the final
+        guess when a search finishes after its deadline with a better guess
+        than the one best returned
+        """
+        self.helper = helper
+        self.deadline = deadline
+        self.on_refined = on_refined
+
+        # lock is held while the search thread advances a search, so the
+        # helper is only ever used by one thread at a time
+        self.lock = threading.Lock()
+
+        # the state of the current search: the last guess it yielded, whether
+        # it has yielded one yet, whether it is over and whether it was asked
+        # to stop
+        self.guess = None
+        self.found = threading.Event()
+        self.done = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = None
+
+        # shown is the guess best returned for the current search, or None
+        self.shown = None
+
+        # error is an exception the current search raised, re-raised by best
+        self.error = None
+
+        # counters reported by __repr__
+        self.searches = 0
+        self.cut_short = 0
+        self.refined = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"searches: {self.searches}, cut short by the deadline: "
+            f"{self.cut_short}, refined while typing: {self.refined}"
+        )
+
+    def start(self, game) -> None:
+        """
+        Stops any search still running and starts searching for the next
+        guess of game
+        """
+        self.stop()
+        self.guess = None
+        self.shown = None
+        self.error = None
+        self.found.clear()
+        self.done.clear()
+        self.stopping.clear()
+        self.searches += 1
+        self.thread = threading.Thread(target=self.run, args=(game,), daemon=True)
+        self.thread.start()
+
+    def run(self, game) -> None:
+        """
+        Advances a search of game until it is over or asked to stop. Runs in
+        the search thread.
+        """
+        try:
+            search = self.helper.search(game)
+            while not self.stopping.is_set():
+                with self.lock:
+                    guess = next(search, FINISHED)
+                    if guess is FINISHED:
+                        refined = self.shown is not None and self.guess != self.shown
+                        break
+                    self.guess = guess
+                self.found.set()
+            else:
+                return
+        except Exception as error:
+            self.error = error
+            self.found.set()
+            return
+        finally:
+            self.done.set()
+
+        if refined:
+            self.refined += 1
+            if self.on_refined is not None:
+                self.on_refined(game, self.guess)
+
+    def best(self, game) -> str:
+        """
+        Starts a search of game and returns its guess once it finishes, or
+        its best guess so far once the deadline has passed. If the search has
+        no guess by then, waits for its first.
+        """
+        self.start(game)
+        if not self.done.wait(self.deadline):
+            self.cut_short += 1
+        self.found.wait()
+        with self.lock:
+            if self.error is not None:
+                raise self.error
+            self.shown = self.guess
+            return self.shown
+
+    def suggest(self, game, k=5) -> list[tuple[str, float, float]]:
+        """
+        Returns the best guess of a search of game within the deadline,
+        ranked with the helper's next best guesses as bot.main.BotInterface
+        .suggest does
+        """
+        pick = self.best(game)
+        with self.lock:
+            return self.helper.rank(game, pick, k)
+
+    def stop(self) -> None:
+        """
+        Asks the current search to stop after its next guess and waits for it.
+        Call before game changes, as the search reads it.
+        """
+        if self.thread is not None:
+            self.stopping.set()
+            self.thread.join()
+            self.thread = None
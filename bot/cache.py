@@ -0,0 +1,123 @@
+import collections
+import hashlib
+import os
+import numpy as np
+
+
+def fingerprint(*parts) -> bytes:
+    """
+    Returns a 16-byte digest of parts, which can be strings, bytes or numpy
+    arrays. Arrays are hashed by their raw bytes, so a candidate set should be
+    passed as a boolean mask (see packbits) or a sorted id array.
+    """
+    sha = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            if part.dtype == bool:
+                part = np.packbits(part)
+            part = np.ascontiguousarray(part).tobytes()
+        elif not isinstance(part, bytes):
+            part = str(part).encode()
+        # the length keeps ("ab", "c") and ("a", "bc") apart
+        sha.update(len(part).to_bytes(8, "little"))
+        sha.update(part)
+    return sha.digest()
+
+
+class GuessCache:
+    def __init__(self, max_entries=4096, path=None) -> None:
+        """
+        A least recently used cache from a fingerprint of a candidate set to
+        the guess chosen for it and that guess's score. Many games end up
+        with the same candidates after a few turns, and a bot whose choice
+        only depends on the candidates can then skip scoring them again.
+
+        max_entries: the most guesses kept, 0 disabling the cache
+        path: an optional .npz file the cache is loaded from if it exists,
+        and written to by save
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = collections.OrderedDict()
+
+        # counters reported by __repr__
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def get(self, key: bytes):
+        """
+        Returns the (guess, score) stored for key, or None on a miss
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: bytes, guess: str, score: float) -> None:
+        """
+        Stores the guess for key, evicting the least recently used guesses
+        once the cache is full
+        """
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = (guess, float(score))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def save(self, path=None) -> None:
+        """
+        Writes the cache to path (self.path by default), least recently used
+        first so loading it keeps the eviction order
+        """
+        path = self.path if path is None else path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # write to a temporary file first so a concurrent reader never sees a
+        # half-written cache
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        # keys are kept as raw bytes, as a bytes dtype strips trailing zeros
+        keys = np.frombuffer(b"".join(self.entries), dtype=np.uint8)
+        np.savez(
+            tmp_path,
+            keys=keys.reshape(-1, 16),
+            guesses=np.array([guess for guess, _ in self.entries.values()], dtype=str),
+            scores=np.array([score for _, score in self.entries.values()]),
+        )
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> None:
+        """
+        Adds the guesses saved at path
+        """
+        with np.load(path) as data:
+            for key, guess, score in zip(
+                map(bytes, data["keys"]),
+                data["guesses"].tolist(),
+                data["scores"].tolist(),
+            ):
+                self.put(key, guess, score)
+
+    def hit_rate(self) -> float:
+        """
+        Returns the fraction of lookups that were hits
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the cache
+        """
+        return (
+            f"entries: {len(self.entries)}/{self.max_entries}, "
+            f"hits: {self.hits}, misses: {self.misses}, "
+            f"hit rate: {round(self.hit_rate(), 3)}, evictions: {self.evictions}"
+        )
@@ -0,0 +1,304 @@
+import argparse
+import functools
+import os
+import random
+import time
+import numpy as np
+from bot.main import (
+    SimpleBot,
+    MiddleBot,
+    MiddleBotTf,
+    MiddleBotGenetic,
+    HardBot,
+    MinimaxBot,
+    MinimaxBotExpected,
+)
+from bot.lockstep import LOCKSTEP_BOTS, LockstepSimulator
+from wordle.main import encode_feedback
+from wordle.patterns import pattern_table
+from wordle.shared import worker_pool
+from wordle.words import ANSWERS_PATH, GUESSES_PATH, CACHE_DIR, get_dictionary
+
+# bots that can be profiled. Bots in bot.lockstep.LOCKSTEP_BOTS play the same
+# game for an answer whatever the seed, so they are played once per answer by
+# the lockstep simulator; the others are played once per answer and seed.
+PROFILE_BOTS = {
+    "SimpleBot": SimpleBot,
+    "MiddleBot": MiddleBot,
+    "MiddleBotTf": MiddleBotTf,
+    "MiddleBotGenetic": MiddleBotGenetic,
+    "HardBot": functools.partial(HardBot, "green", 3),
+    "MinimaxBot": MinimaxBot,
+    "MinimaxBotExpected": MinimaxBotExpected,
+}
+
+# columns of a difficulty table, one row per bot and answer. remaining has a
+# column per turn: the mean number of answers still consistent with the
+# feedback after that turn, over the games that got that far (NaN if none).
+COLUMNS = ["bot", "answer", "games", "wins", "win_rate", "mean_turns", "remaining"]
+
+
+def remaining_answers(patterns, guesses: np.ndarray, codes: np.ndarray) -> list:
+    """
+    Returns how many answers are still consistent with the feedback after
+    each turn of a game, given its guess ids and pattern codes
+    """
+    candidates = np.arange(len(patterns.answers))
+    remaining = []
+    for guess, code in zip(guesses.tolist(), codes.tolist()):
+        candidates = candidates[patterns.table[guess, candidates] == code]
+        remaining.append(len(candidates))
+    return remaining
+
+
+def profile_chunk(task) -> dict:
+    """
+    Plays a chunk of games in a worker process. task is (bot name, answer
+    ids, seeds, max turns, answers path, guesses path).
+
+    The game of answer a and seed s is played right after
+    random.seed(s * len(answers) + a), so it does not depend on how the
+    games were split across workers. The bots pick from sets, whose order
+    changes between runs unless PYTHONHASHSEED is set.
+    """
+    bot_name, answer_ids, seeds, max_turns, answers_path, guesses_path = task
+    dictionary = get_dictionary(answers_path, guesses_path)
+    patterns = pattern_table(dictionary)
+    bot = PROFILE_BOTS[bot_name](dictionary=dictionary)
+
+    n = len(answer_ids) * len(seeds)
+    results = {
+        "answers": np.zeros(n, dtype=np.int64),
+        "turns": np.zeros(n, dtype=np.int64),
+        "wins": np.zeros(n, dtype=bool),
+        "remaining": np.zeros((n, max_turns), dtype=np.int64),
+    }
+    row = 0
+    for seed in seeds:
+        for answer in answer_ids:
+            random.seed(seed * len(dictionary.answers) + answer)
+            game = bot.play_game(max_turns, word=dictionary.answers[answer])
+            bot.games.clear()
+            guesses = [patterns.guess_ids["".join(guess)] for guess in game.guesses]
+            codes = [encode_feedback(feedback) for feedback in game.feedback]
+            remaining = remaining_answers(patterns, np.array(guesses), np.array(codes))
+            results["answers"][row] = answer
+            results["turns"][row] = len(game.guesses)
+            results["wins"][row] = game.win
+            results["remaining"][row, : len(remaining)] = remaining
+            row += 1
+    return results
+
+
+def play_lockstep(bot_name: str, answer_ids, max_turns: int, dictionary) -> dict:
+    """
+    Plays every answer once with a deterministic bot, in the same layout as
+    profile_chunk
+    """
+    patterns = pattern_table(dictionary)
+    results = LockstepSimulator(bot_name, max_turns, dictionary).run(answer_ids)
+    remaining = np.zeros((len(answer_ids), max_turns), dtype=np.int64)
+    for row in range(len(answer_ids)):
+        turns = results["turns"][row]
+        remaining[row, :turns] = remaining_answers(
+            patterns, results["history"][row, :turns], results["codes"][row, :turns]
+        )
+    return {
+        "answers": np.asarray(answer_ids),
+        "turns": results["turns"].astype(np.int64),
+        "wins": results["wins"],
+        "remaining": remaining,
+    }
+
+
+def summarize(bot_index: int, results: dict, num_answers: int, max_turns: int):
+    """
+    Turns the games of one bot into the rows of a difficulty table. A lost
+    game counts as max_turns + 1 turns in mean_turns.
+    """
+    answers = results["answers"]
+    games = np.bincount(answers, minlength=num_answers)
+    wins = np.bincount(answers, weights=results["wins"], minlength=num_answers)
+    turns = np.where(results["wins"], results["turns"], max_turns + 1)
+    turn_sums = np.bincount(answers, weights=turns, minlength=num_answers)
+
+    # a turn was played by a game if it made at least that many guesses
+    played = np.arange(max_turns) < results["turns"][:, None]
+    remaining = np.zeros((num_answers, max_turns))
+    counts = np.zeros((num_answers, max_turns))
+    np.add.at(remaining, answers, np.where(played, results["remaining"], 0))
+    np.add.at(counts, answers, played)
+
+    profiled = np.flatnonzero(games > 0)
+    with np.errstate(invalid="ignore"):
+        return {
+            "bot": np.full(len(profiled), bot_index, dtype=np.uint8),
+            "answer": profiled.astype(np.int32),
+            "games": games[profiled].astype(np.int32),
+            "wins": wins[profiled].astype(np.int32),
+            "win_rate": (wins / np.maximum(games, 1))[profiled].astype(np.float32),
+            "mean_turns": (turn_sums / np.maximum(games, 1))[profiled].astype(
+                np.float32
+            ),
+            "remaining": (remaining / counts)[profiled].astype(np.float32),
+        }
+
+
+def profile(
+    bot_names: list[str],
+    seeds=3,
+    max_turns=6,
+    answer_ids=None,
+    processes=None,
+    chunk_size=50,
+    dictionary=None,
+) -> dict:
+    """
+    Plays every answer (or the given answer ids) with each bot, across seeds
+    for bots with random choices, and returns the difficulty table as a dict
+    of columns (see COLUMNS), with the bot names as "bots"
+    """
+    if dictionary is None:
+        dictionary = get_dictionary()
+    if answer_ids is None:
+        answer_ids = np.arange(len(dictionary.answers))
+    answer_ids = np.asarray(answer_ids)
+
+    parts = []
+    with worker_pool(processes, dictionary) as pool:
+        for bot_index, bot_name in enumerate(bot_names):
+            if bot_name in LOCKSTEP_BOTS:
+                results = play_lockstep(bot_name, answer_ids, max_turns, dictionary)
+            else:
+                tasks = [
+                    (
+                        bot_name,
+                        answer_ids[start : start + chunk_size].tolist(),
+                        list(range(seeds)),
+                        max_turns,
+                        dictionary.answers_path,
+                        dictionary.guesses_path,
+                    )
+                    for start in range(0, len(answer_ids), chunk_size)
+                ]
+                chunks = pool.map(profile_chunk, tasks, chunksize=1)
+                results = {
+                    name: np.concatenate([chunk[name] for chunk in chunks])
+                    for name in chunks[0]
+                }
+            parts.append(
+                summarize(bot_index, results, len(dictionary.answers), max_turns)
+            )
+
+    table = {name: np.concatenate([part[name] for part in parts]) for name in COLUMNS}
+    table["bots"] = np.array(bot_names)
+    return table
+
+
+def save_table(path: str, table: dict) -> None:
+    """
+    Writes every column of table to its own .npy file in the directory path,
+    so a column can be memory-mapped without reading the others
+    """
+    os.makedirs(path, exist_ok=True)
+    for name, column in table.items():
+        column_path = os.path.join(path, f"{name}.npy")
+        # write to a temporary file first so a concurrent reader never sees
+        # a half-written column
+        tmp_path = f"{column_path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, column)
+        os.replace(tmp_path, column_path)
+
+
+def load_table(path: str) -> dict:
+    """
+    Returns the difficulty table saved in the directory path, with every
+    column memory-mapped
+    """
+    return {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in COLUMNS + ["bots"]
+    }
+
+
+def hardest(table: dict, bot_name: str, k=20) -> np.ndarray:
+    """
+    Returns the rows of table of bot_name's k hardest answers: the most mean
+    turns first (where losses count extra), then the lowest win rate
+    """
+    rows = np.flatnonzero(table["bot"] == list(table["bots"]).index(bot_name))
+    order = np.lexsort((table["win_rate"][rows], -table["mean_turns"][rows]))
+    return rows[order[:k]]
+
+
+def hardest_families(table: dict, bot_name: str, answers: list, k=10, suffix=4):
+    """
+    Groups bot_name's answers by their last suffix letters and returns the k
+    groups of at least 3 answers with the most mean turns, as (suffix, number
+    of answers, win rate, mean turns) tuples
+    """
+    rows = np.flatnonzero(table["bot"] == list(table["bots"]).index(bot_name))
+    families = {}
+    for row in rows.tolist():
+        word = answers[table["answer"][row]]
+        families.setdefault(word[-suffix:], []).append(row)
+    ranked = [
+        (
+            ending,
+            len(members),
+            float(table["win_rate"][members].mean()),
+            float(table["mean_turns"][members].mean()),
+        )
+        for ending, members in families.items()
+        if len(members) >= 3
+    ]
+    ranked.sort(key=lambda family: -family[3])
+    return ranked[:k]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--bots", nargs="+", choices=list(PROFILE_BOTS), default=list(PROFILE_BOTS)
+    )
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--max-turns", type=int, default=6)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--answers", default=ANSWERS_PATH)
+    parser.add_argument("--guesses", default=GUESSES_PATH)
+    args = parser.parse_args()
+
+    dictionary = get_dictionary(args.answers, args.guesses)
+    if args.output is None:
+        args.output = os.path.join(CACHE_DIR, f"difficulty-{dictionary.digest}")
+    start = time.perf_counter()
+    table = profile(
+        args.bots,
+        args.seeds,
+        args.max_turns,
+        processes=args.processes,
+        dictionary=dictionary,
+    )
+    seconds = time.perf_counter() - start
+    save_table(args.output, table)
+    print(f"profiled in {round(seconds, 2)}s, saved to {args.output}")
+
+    for bot_name in args.bots:
+        print(f"\n{bot_name}, hardest answers:")
+        for row in hardest(table, bot_name, args.top):
+            print(
+                f"{dictionary.answers[table['answer'][row]]}: "
+                f"win rate {round(float(table['win_rate'][row]), 3)}, "
+                f"mean turns {round(float(table['mean_turns'][row]), 2)}, "
+                f"remaining {np.round(table['remaining'][row], 1).tolist()}"
+            )
+        print(f"{bot_name}, hardest endings:")
+        for ending, size, win_rate, mean_turns in hardest_families(
+            table, bot_name, dictionary.answers, args.top
+        ):
+            print(
+                f"-{ending} ({size} answers): win rate {round(win_rate, 3)}, "
+                f"mean turns {round(mean_turns, 2)}"
+            )
@@ -0,0 +1,245 @@
+import argparse
+import os
+import time
+import numpy as np
+from bot.cache import fingerprint
+from wordle.patterns import win_code
+from wordle.words import ANSWERS_PATH, GUESSES_PATH, get_dictionary, letter_masks
+
+
+def pool_codes(guesses: np.ndarray, pool: np.ndarray) -> np.ndarray:
+    """
+    Given encoded guesses of shape (g, length) and an encoded pool of shape
+    (n, length), returns the (g, n) pattern codes of every guess against
+    every word of the pool, scored like GameState.attempt_guess
+    """
+    powers = 3 ** np.arange(guesses.shape[1], dtype=np.int32)
+    shifts = guesses.astype(np.uint64)
+    codes = np.empty((len(guesses), len(pool)), dtype=np.int32)
+    for j, (word, mask) in enumerate(zip(pool, letter_masks(pool))):
+        present = (mask >> shifts) & np.uint64(1)
+        codes[:, j] = np.where(guesses == word, 2, present).astype(np.int32) @ powers
+    return codes
+
+
+def lower_bound(size: int) -> float:
+    """
+    Returns the fewest guesses a pool of size words can take on average: one
+    for the word guessed first, two for every other word
+    """
+    return (2 * size - 1) / size
+
+
+def better(lose: float, expected: float, best_lose: float, best_expected: float):
+    """
+    Returns whether losing with chance lose in expected guesses beats the
+    best so far: a lower chance of losing first, then fewer guesses
+    """
+    if abs(lose - best_lose) > 1e-9:
+        return lose < best_lose
+    return expected < best_expected - 1e-9
+
+
+class EndgameSolver:
+    def __init__(self, max_pool=8, path=None, dictionary=None) -> None:
+        """
+        Plays small pools of possible answers perfectly. For a pool of up to
+        max_pool words and a number of turns left, it searches every guess
+        for the one that first minimizes the chance of running out of turns
+        and then the expected number of guesses, assuming every word of the
+        pool is equally likely.
+
+        Guesses splitting the pool the same way are searched once, and
+        guesses are tried best lower bound first so most are never expanded.
+        Solutions are memoized by the sorted pool, and kept on disk at path
+        (a file per dictionary by default) when save is called.
+        """
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+        self.max_pool = max_pool
+        if path is None:
+            path = dictionary.cache_path("endgame", "npz")
+        self.path = path
+        self.word_ids = {word: i for i, word in enumerate(dictionary.guesses)}
+        self.win_code = win_code(dictionary.word_length)
+
+        # solutions maps a fingerprint of (guesses allowed, turns left, pool)
+        # to (guess, chance of losing, expected guesses)
+        self.solutions = {}
+        self.unsaved = 0
+        if os.path.exists(path):
+            self.load(path)
+
+        # counters reported by __repr__
+        self.hits = 0
+        self.searched = 0
+
+    def solve(self, words, turns_left: int, all_guesses=True):
+        """
+        Returns the best guess when the answer is one of words, or None if
+        there are more than max_pool words (or none, or no turns left).
+
+        all_guesses: if False, only guesses from words are considered. Words
+        still possible are always legal in hard mode, so hard mode bots
+        should pass False.
+        """
+        if not 0 < len(words) <= self.max_pool or turns_left <= 0:
+            return None
+        if any(word not in self.word_ids for word in words):
+            return None
+        pool = np.array(sorted(self.word_ids[word] for word in words))
+        if all_guesses:
+            options = np.arange(len(self.dictionary.guesses))
+        else:
+            options = pool
+        encoded = self.dictionary.encoded_guesses
+        codes = pool_codes(encoded[options], encoded[pool])
+        # with as many turns as words, guessing them one by one never loses
+        turns = min(turns_left, len(pool))
+        return self.search(pool, options, codes, turns, all_guesses)[0]
+
+    def search(self, pool, options, codes, turns: int, all_guesses: bool):
+        """
+        Returns (guess, chance of losing, expected guesses) for pool, given
+        the codes of every option against it
+        """
+        n = len(pool)
+        if n == 1:
+            return self.dictionary.guesses[pool[0]], 0.0, 1.0
+        if turns == 1:
+            return self.dictionary.guesses[pool[0]], (n - 1) / n, 1.0
+        key = fingerprint("endgame-2", all_guesses, turns, pool)
+        if key in self.solutions:
+            self.hits += 1
+            return self.solutions[key]
+        self.searched += 1
+        # in hard mode options is the pool itself, and each part of it is
+        # searched with its own words only, the ones the feedback leaves
+        # legal: the solution then only depends on the pool, as its key does
+        pool_by_pool = codes
+
+        # guesses with the same codes against the pool play the same from
+        # here on, so only the first (answers come first) of each is kept,
+        # for this pool and every smaller pool searched from it
+        signatures, firsts = np.unique(codes, axis=0, return_index=True)
+        order = np.argsort(firsts)
+        options, codes = options[firsts[order]], signatures[order]
+        candidates = []
+        for first, signature in enumerate(codes):
+            parts = {}
+            for column, code in enumerate(signature.tolist()):
+                parts.setdefault(code, []).append(column)
+            if len(parts) == 1 and self.win_code not in parts:
+                continue
+            bound = 1 + sum(
+                len(columns) / n * lower_bound(len(columns))
+                for code, columns in parts.items()
+                if code != self.win_code
+            )
+            candidates.append((bound, self.win_code not in parts, first, parts))
+        candidates.sort(key=lambda candidate: candidate[:3])
+
+        best = None
+        for bound, _, first, parts in candidates:
+            if best is not None and best[1] == 0 and bound >= best[2] - 1e-9:
+                break
+            lose, expected = 0.0, 1.0
+            for code, columns in parts.items():
+                if code == self.win_code:
+                    continue
+                if all_guesses:
+                    part_options, part_codes = options, codes[:, columns]
+                else:
+                    part_options = pool[columns]
+                    part_codes = pool_by_pool[np.ix_(columns, columns)]
+                _, part_lose, part_expected = self.search(
+                    pool[columns], part_options, part_codes, turns - 1, all_guesses
+                )
+                lose += len(columns) / n * part_lose
+                expected += len(columns) / n * part_expected
+            if best is None or better(lose, expected, best[1], best[2]):
+                best = (self.dictionary.guesses[options[first]], lose, expected)
+
+        self.solutions[key] = best
+        self.unsaved += 1
+        return best
+
+    def save(self, path=None) -> None:
+        """
+        Writes the solutions to path (self.path by default) if any are new
+        """
+        path = self.path if path is None else path
+        if self.unsaved == 0:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # write to a temporary file first so a concurrent reader never sees a
+        # half-written table
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        # keys are kept as raw bytes, as a bytes dtype strips trailing zeros
+        keys = np.frombuffer(b"".join(self.solutions), dtype=np.uint8)
+        np.savez(
+            tmp_path,
+            keys=keys.reshape(-1, 16),
+            guesses=np.array([s[0] for s in self.solutions.values()], dtype=str),
+            lose=np.array([s[1] for s in self.solutions.values()]),
+            expected=np.array([s[2] for s in self.solutions.values()]),
+        )
+        os.replace(tmp_path, path)
+        self.unsaved = 0
+
+    def load(self, path: str) -> None:
+        """
+        Adds the solutions saved at path
+        """
+        with np.load(path) as data:
+            for key, guess, lose, expected in zip(
+                map(bytes, data["keys"]),
+                data["guesses"].tolist(),
+                data["lose"].tolist(),
+                data["expected"].tolist(),
+            ):
+                self.solutions[key] = (guess, lose, expected)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the solver
+        """
+        return (
+            f"solutions: {len(self.solutions)}, searched: {self.searched}, "
+            f"hits: {self.hits}"
+        )
+
+
+_solvers = {}
+
+
+def endgame_solver(dictionary=None) -> EndgameSolver:
+    """
+    Returns the EndgameSolver for dictionary (the default word lists if
+    None), shared by every bot of the process
+    """
+    if dictionary is None:
+        dictionary = get_dictionary()
+    if dictionary.digest not in _solvers:
+        _solvers[dictionary.digest] = EndgameSolver(dictionary=dictionary)
+    return _solvers[dictionary.digest]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("words", nargs="+")
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--hard-mode", action="store_true")
+    parser.add_argument("--answers", default=ANSWERS_PATH)
+    parser.add_argument("--guesses", default=GUESSES_PATH)
+    args = parser.parse_args()
+
+    solver = EndgameSolver(
+        max_pool=len(args.words), dictionary=get_dictionary(args.answers, args.guesses)
+    )
+    start = time.perf_counter()
+    guess = solver.solve(args.words, args.turns, not args.hard_mode)
+    seconds = time.perf_counter() - start
+    print(f"guess {guess} ({round(seconds * 1000)}ms, {solver})")
+    solver.save()
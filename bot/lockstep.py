@@ -0,0 +1,180 @@
+import argparse
+import time
+import numpy as np
+from bot.main import MinimaxBot, MinimaxBotExpected, MiddleBotTf
+from wordle.patterns import feedback_codes, pattern_table
+from wordle.words import ANSWERS_PATH, GUESSES_PATH, get_dictionary
+
+# bots the simulator can run. Outside hard mode their guess only depends on
+# the words still possible, which is what lets games be grouped: the answers
+# left for the MinimaxBots, and every guess consistent with the feedback so
+# far for MiddleBotTf.
+LOCKSTEP_BOTS = {
+    "MinimaxBot": MinimaxBot,
+    "MinimaxBotExpected": MinimaxBotExpected,
+    "MiddleBotTf": MiddleBotTf,
+}
+
+
+def candidate_guess(bot, candidates: np.ndarray, turn: int) -> str:
+    """
+    Returns the guess bot makes on turn when the words still possible are
+    candidates, given as indices into the dictionary's guesses
+    """
+    if isinstance(bot, MinimaxBot):
+        if turn == 0:
+            bot.warm_up()
+            return bot.opener
+        bot.candidates = candidates
+        return bot.next_guess(None)
+    words = bot.dictionary.guesses
+    bot.possible_words = {words[i] for i in candidates.tolist()}
+    return bot.generate_word_with_tf()
+
+
+class LockstepSimulator:
+    def __init__(self, bot_name="MinimaxBotExpected", max_turns=6, dictionary=None):
+        """
+        Plays many games of Wordle at once, one turn at a time. Games with
+        the same words still possible form a group, whose guess is chosen
+        once per turn; the feedback of every game is then a single lookup in
+        the pattern table.
+
+        Games share their candidate arrays through their group, so the
+        per-game state is a few integers (see run).
+        """
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+        self.patterns = pattern_table(dictionary)
+        self.bot = LOCKSTEP_BOTS[bot_name](dictionary=dictionary)
+        self.max_turns = max_turns
+
+        # the words a group starts with: the answers for the MinimaxBots, and
+        # every guess for MiddleBotTf
+        if isinstance(self.bot, MinimaxBot):
+            self.universe = np.arange(len(dictionary.answers))
+        else:
+            self.universe = np.arange(len(dictionary.guesses))
+
+        # counters reported by __repr__
+        self.games = 0
+        self.guesses_chosen = 0
+        self.guesses_made = 0
+
+    def run(self, answers: np.ndarray) -> dict:
+        """
+        Plays one game per answer id and returns the arrays describing them:
+        "answers", "turns" (guesses made), "wins", "history", the guess id
+        of each turn (-1 after the game ended) and "codes", the pattern code
+        of each turn
+        """
+        n = len(answers)
+        answers = np.asarray(answers)
+        turns = np.zeros(n, dtype=np.int8)
+        wins = np.zeros(n, dtype=bool)
+        history = np.full((n, self.max_turns), -1, dtype=np.int32)
+        feedback = np.zeros((n, self.max_turns), dtype=np.uint16)
+
+        # active holds the games still being played and group the group of
+        # each of them, an index into groups (candidate id arrays)
+        active = np.arange(n)
+        group = np.zeros(n, dtype=np.int64)
+        groups = [self.universe]
+
+        for turn in range(self.max_turns):
+            if len(active) == 0:
+                break
+            used, group = np.unique(group, return_inverse=True)
+            guess_ids = np.array(
+                [
+                    self.patterns.guess_ids[
+                        candidate_guess(self.bot, groups[g], turn)
+                    ]
+                    for g in used
+                ]
+            )
+            self.guesses_chosen += len(used)
+            self.guesses_made += len(active)
+
+            game_guesses = guess_ids[group]
+            codes = self.patterns.table[game_guesses, answers[active]].astype(np.int64)
+            history[active, turn] = game_guesses
+            feedback[active, turn] = codes
+            turns[active] = turn + 1
+            won = codes == self.patterns.win_code
+            wins[active[won]] = True
+
+            # split every group by the feedback its games got, merging the
+            # parts left with the same candidates
+            playing = ~won
+            active, group, codes = active[playing], group[playing], codes[playing]
+            splits, group = np.unique(
+                group * self.patterns.num_codes + codes, return_inverse=True
+            )
+            next_groups, seen = [], {}
+            merged = np.empty(len(splits), dtype=np.int64)
+            group_codes = {}
+            for i, split in enumerate(splits.tolist()):
+                g, code = divmod(split, self.patterns.num_codes)
+                candidates = groups[used[g]]
+                if g not in group_codes:
+                    guess = self.dictionary.encoded_guesses[guess_ids[g]]
+                    group_codes[g] = feedback_codes(
+                        guess, self.dictionary.encoded_guesses[candidates]
+                    )
+                candidates = candidates[group_codes[g] == code]
+                key = candidates.tobytes()
+                if key not in seen:
+                    seen[key] = len(next_groups)
+                    next_groups.append(candidates)
+                merged[i] = seen[key]
+            group = merged[group]
+            groups = next_groups
+
+        self.games += n
+        return {
+            "answers": answers,
+            "turns": turns,
+            "wins": wins,
+            "history": history,
+            "codes": feedback,
+        }
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the simulator
+        """
+        return (
+            f"games: {self.games}, guesses made: {self.guesses_made}, "
+            f"guesses chosen: {self.guesses_chosen} "
+            f"({round(self.guesses_chosen / max(self.guesses_made, 1), 4)})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--bot", choices=list(LOCKSTEP_BOTS), default="MinimaxBotExpected"
+    )
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--max-turns", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--answers", default=ANSWERS_PATH)
+    parser.add_argument("--guesses", default=GUESSES_PATH)
+    args = parser.parse_args()
+
+    dictionary = get_dictionary(args.answers, args.guesses)
+    simulator = LockstepSimulator(args.bot, args.max_turns, dictionary)
+    rng = np.random.default_rng(args.seed)
+    answers = rng.integers(len(dictionary.answers), size=args.games)
+
+    start = time.perf_counter()
+    results = simulator.run(answers)
+    seconds = time.perf_counter() - start
+    wins = results["wins"]
+    print(f"{args.bot}: {args.games} games in {round(seconds, 2)}s")
+    print(f"games per minute: {round(args.games / seconds * 60)}")
+    print(f"win rate: {round(wins.mean(), 4)}")
+    print(f"avg turns to win: {round(results['turns'][wins].mean(), 3)}")
+    print(simulator)
@@ -1,14 +1,52 @@
-from wordle.main import GameState, Feedback
+from wordle.main import GameState, Feedback, encode_feedback
+from wordle.patterns import pattern_table
+from wordle.hard_mode import HardModeIndex
+from wordle.gamelog import GameLog
+from wordle.words import get_dictionary
+from bot.tree import DecisionTree, tree_path
+from bot.cache import GuessCache, fingerprint
+from bot.endgame import endgame_solver
 import random
-import string
+import numpy as np
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+def top_k(scores: np.ndarray, ties: np.ndarray, k: int, higher_is_better=True):
+    """
+    Returns the positions of the k best scores, best first, breaking ties by
+    the lowest value in ties. The k best are picked out with np.argpartition,
+    so only they (and any scores tied with the k-th) are sorted. A handful
+    of scores is sorted outright, which is cheaper.
+    """
+    if k <= 0:
+        return np.arange(0)
+    keys = -scores if higher_is_better else scores
+    chosen = np.arange(len(keys))
+    if len(keys) > max(64, 4 * k):
+        threshold = keys[np.argpartition(keys, k - 1)[:k]].max()
+        chosen = np.flatnonzero(keys <= threshold)
+    return chosen[np.lexsort((ties[chosen], keys[chosen]))[:k]]
 
 
 class BotInterface(ABC):
-    def __init__(self) -> None:
+    # whether a higher score from guess_scores is better
+    higher_is_better = True
+
+    def __init__(self, hard_mode=False, dictionary=None) -> None:
         """
         Initializes a friendly AI bot to play Wordle!
+
+        hard_mode: play by hard mode rules, where every guess must keep the
+        green letters in place and use the yellow letters revealed so far
+        dictionary: the wordle.words.Dictionary games are played with (the
+        standard 5-letter lists if None)
         """
+        # dictionary holds the word lists the bot guesses from
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+
         # games is the list of all games that were played by the bot
         self.games = []
 
@@ -22,17 +60,73 @@ class BotInterface(ABC):
         # bot won
         self.total_turns_won = 0
 
-    def play_game(self, max_turns=6, word=None) -> GameState:
+        self.hard_mode = hard_mode
+
+        # hard_mode_index tracks the legal guesses of the current game in hard
+        # mode. It is only built once it is needed.
+        self.hard_mode_index = None
+
+        # max_turns is the number of guesses allowed in the current game
+        self.max_turns = 6
+
+        # guess_cache memoizes guesses that only depend on the candidate set
+        # (see cached_guess). Games often reach the same candidates.
+        self.guess_cache = GuessCache()
+
+        # word_ids maps each word of the dictionary to its index, to turn a
+        # set of words into a bitset. It is only built once it is needed.
+        self.word_ids = None
+
+        # game_state is the class of the games play_game creates. Use
+        # wordle.main.CompactGameState to keep many finished games small.
+        self.game_state = GameState
+
+        # game_log records every finished game when set (see log_games)
+        self.game_log = None
+
+        # endgame plays small pools of possible words perfectly in bots that
+        # use it (see endgame_guess). Set it to None to play without it.
+        self.endgame = None
+
+        # alphabetical is the rank of each of the dictionary's guesses in
+        # alphabetical order, to break ties. It is only built once it is
+        # needed.
+        self.alphabetical = None
+
+        # tf_scoring is the last (key, ids, scores, tie breakers) of
+        # guess_scores, so suggest can rank the words generate_word_with_tf
+        # just scored without scoring them again
+        self.tf_scoring = None
+
+        # possible_words_mask is the last (possible words, their number,
+        # mask) of words_mask
+        self.possible_words_mask = None
+
+    def play_game(self, max_turns=6, word=None, game=None) -> GameState:
         """
         Non-interactively plays a game of Wordle and returns the finished game state
+
+        game: an optional new game to play instead of a fresh self.game_state,
+        such as a wordle.absurdle.AbsurdleGameState
         """
-        game = GameState(word=word)
+        if self.game_log is not None and max_turns > self.game_log.max_turns:
+            raise ValueError(
+                f"The log has room for {self.game_log.max_turns} turns, "
+                f"not {max_turns}"
+            )
+        if game is None:
+            game = self.game_state(
+                word=word, hard_mode=self.hard_mode, dictionary=self.dictionary
+            )
+        self.max_turns = max_turns
         while not game.is_finished(max_turns):
             guess = self.generate_word(game)
             game.attempt_guess(guess)
 
         # Add to games, update win rate, and reset possible words
         self.games.append(game)
+        if self.game_log is not None:
+            self.game_log.append(game)
 
         # Accumulate average number of turns and recompute average
         if game.win:
@@ -58,6 +152,12 @@ class BotInterface(ABC):
         else:
             for _ in range(n):
                 self.play_game(max_turns)
+        if self.guess_cache.path is not None:
+            self.guess_cache.save()
+        if self.game_log is not None:
+            self.game_log.flush()
+        if self.endgame is not None:
+            self.endgame.save()
 
     def __repr__(self) -> str:
         """
@@ -71,6 +171,13 @@ class BotInterface(ABC):
             f"avg turns to win: {round(self.total_turns_won / self.games_won, 2)}\n"
         )
 
+    def warm_up(self) -> None:
+        """
+        Does any slow setup the first guess needs ahead of time, e.g. while
+        the player is still choosing options. Most bots have none.
+        """
+        pass
+
     @abstractmethod
     def generate_word(self, game: GameState) -> str:
         """
@@ -87,31 +194,213 @@ class BotInterface(ABC):
         """
         pass
 
+    def suggest(self, game: GameState, k=5) -> list[tuple[str, float, float]]:
+        """
+        Returns up to k guesses for game, best first, as (guess, score,
+        expected number of answers left after its feedback). The first is the
+        guess generate_word makes, and the rest are the bot's best scored
+        guesses (see guess_scores). Like generate_word, this moves the bot on
+        to the latest feedback of game, so call one or the other each turn.
+        Raises ValueError if k is less than 1.
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, not {k}")
+        return self.rank(game, self.generate_word(game), k)
+
+    def rank(self, game: GameState, pick: str, k=5) -> list[tuple[str, float, float]]:
+        """
+        Returns pick followed by up to k - 1 of the bot's best scored guesses
+        for game, in the format of suggest. The bot must already be on the
+        latest feedback of game, as after generate_word or search. Raises
+        ValueError if k is less than 1.
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, not {k}")
+        ids, scores, ties = self.guess_scores(game)
+        ranked = [
+            (self.dictionary.guesses[ids[i]], scores[i])
+            for i in top_k(scores, ties, k, self.higher_is_better).tolist()
+        ]
+        if pick not in [guess for guess, _ in ranked]:
+            # the pick is random or from the endgame solver, so look its
+            # score up among every guess scored
+            where = np.flatnonzero(ids == self.word_index(pick))
+            score = scores[where[0]] if len(where) > 0 else np.nan
+            ranked = [(pick, score)] + ranked[: k - 1]
+        else:
+            ranked.sort(key=lambda entry: entry[0] != pick)
+
+        left = self.left_after(ranked, self.answers_left(game))
+        return [
+            (guess, float(score), left[i]) for i, (guess, score) in enumerate(ranked)
+        ]
+
+    def search(self, game: GameState):
+        """
+        Yields better and better guesses for game, the first as soon as
+        possible, and moves the bot on to the latest feedback of game like
+        generate_word. The search can be stopped after any guess, the last
+        one yielded being the best so far (see bot.anytime). By default it
+        only yields the guess of generate_word.
+        """
+        yield self.generate_word(game)
+
+    def guess_scores(self, game: GameState) -> tuple[np.ndarray, ...]:
+        """
+        Returns the guesses the bot chooses between, as ids into the
+        dictionary's guesses, with the score of each and a tie breaker
+        (lowest first). By default these are the words of self.possible_words
+        scored by letter frequency (see generate_word_with_tf), with ties
+        going to the first word alphabetically.
+        """
+        mask = self.words_mask(self.possible_words)
+        key = fingerprint("tf", mask)
+        if self.tf_scoring is None or self.tf_scoring[0] != key:
+            ids = np.flatnonzero(mask)
+            if self.alphabetical is None:
+                order = np.argsort(np.array(self.dictionary.guesses))
+                self.alphabetical = np.empty(len(order), dtype=np.int64)
+                self.alphabetical[order] = np.arange(len(order))
+            self.tf_scoring = (key, ids, self.tf_scores(ids), self.alphabetical[ids])
+        return self.tf_scoring[1:]
+
+    def answers_left(self, game: GameState) -> np.ndarray:
+        """
+        Returns the ids of the answers still consistent with the feedback of
+        game
+        """
+        patterns = pattern_table(self.dictionary)
+        answers = np.arange(len(patterns.answers))
+        for guess, feedback in zip(game.guesses, game.feedback):
+            codes = patterns.codes("".join(guess), answers)
+            answers = answers[codes == encode_feedback(feedback)]
+        return answers
+
+    def expected_left(self, guesses: list[str], answers: np.ndarray) -> list[float]:
+        """
+        Returns, for each guess, the expected number of the given answers
+        still possible after its feedback, each answer being equally likely.
+        Guessing the answer leaves none.
+        """
+        if len(answers) == 0:
+            return [0.0] * len(guesses)
+        patterns = pattern_table(self.dictionary)
+        left = []
+        for guess in guesses:
+            counts = np.bincount(
+                patterns.codes(guess, answers), minlength=patterns.num_codes
+            )
+            counts[patterns.win_code] = 0
+            left.append(float((counts * counts).sum() / len(answers)))
+        return left
+
+    def left_after(self, ranked: list[tuple], answers: np.ndarray) -> list[float]:
+        """
+        Returns expected_left for each (guess, score) of ranked. Bots whose
+        scores already count the answers left override it to reuse them.
+        """
+        return self.expected_left([guess for guess, _ in ranked], answers)
+
     # HELPER FUNCTIONS
 
-    def all_words(self) -> set[str]:
+    def legal_mask(self, game: GameState):
         """
-        All possible legal words to guess from
+        In hard mode, returns a boolean array over the words of HardModeIndex
+        (the same order as the pattern table's guesses) marking the legal
+        guesses of game. Outside hard mode, returns None.
         """
-        # word list found here: https://gist.github.com/scholtes/94f3c0303ba6a7768b47583aff36654d#file-wordle-la-txt
-        # La words that can be guessed and which can be the word of the day
-        # Ta words that can be guessed but are never selected as the word of the day
+        if not self.hard_mode:
+            return None
+        if self.hard_mode_index is None:
+            self.hard_mode_index = HardModeIndex(self.dictionary)
+        return self.hard_mode_index.sync(game)
 
-        # opening the file in read mode
-        valid_word_list_file = open("public/wordle-La.txt", "r")
-        invalid_word_list_file = open("public/wordle-Ta.txt", "r")
+    def restrict_to_legal(self, words: set[str], game: GameState) -> set[str]:
+        """
+        In hard mode, returns the words that are legal guesses in game.
+        Outside hard mode, returns words unchanged.
+        """
+        if not self.hard_mode:
+            return words
+        self.legal_mask(game)
+        return words & self.hard_mode_index.legal_set(game)
 
-        # reading the file
-        valid_data = valid_word_list_file.read()
-        invalid_data = invalid_word_list_file.read()
+    def endgame_guess(self, words: set[str], game: GameState):
+        """
+        Returns the guess of self.endgame when the answer is one of words,
+        or None if there is no endgame solver or too many words
+        """
+        if self.endgame is None:
+            return None
+        turns_left = self.max_turns - game.turn
+        return self.endgame.solve(words, turns_left, all_guesses=not self.hard_mode)
 
-        # replacing end splitting the text
-        # when newline ('\n') is seen.
-        data_into_list = valid_data.split("\n") + invalid_data.split("\n")
+    def persist_cache(self, path=None, max_entries=4096) -> None:
+        """
+        Loads self.guess_cache from path, and saves it back there after every
+        play_games. path defaults to a file per bot class and dictionary.
+        """
+        if path is None:
+            name = f"guesses-{type(self).__name__}"
+            path = self.dictionary.cache_path(name, "npz")
+        self.guess_cache = GuessCache(max_entries, path)
 
-        valid_word_list_file.close()
-        invalid_word_list_file.close()
-        return set(data_into_list)
+    def log_games(self, path: str, max_turns=6) -> None:
+        """
+        Appends every game the bot finishes to the wordle.gamelog log at
+        path. Games are written at the end of every play_games.
+
+        max_turns: the most turns a logged game can take, for a new log (an
+        existing log keeps its own). Games with a higher turn limit are
+        refused before they are played.
+        """
+        self.game_log = GameLog(path, self.dictionary, max_turns)
+
+    def words_mask(self, words: set[str]) -> np.ndarray:
+        """
+        Returns words as a boolean mask over the dictionary's guesses, which
+        must not be modified.
+
+        The mask of self.possible_words is memoized, so generate_word_with_tf
+        and suggest build it once per turn. Bots only ever remove words from
+        that set in place or replace it, so while it is the same set of the
+        same size it holds the same words.
+        """
+        if self.word_ids is None:
+            self.word_ids = {w: i for i, w in enumerate(self.dictionary.guesses)}
+        memo = self.possible_words_mask
+        if memo is not None and memo[0] is words and memo[1] == len(words):
+            return memo[2]
+        mask = np.zeros(len(self.dictionary.guesses), dtype=bool)
+        mask[[self.word_ids[word] for word in words if word in self.word_ids]] = True
+        if words is self.possible_words:
+            self.possible_words_mask = (words, len(words), mask)
+        return mask
+
+    def word_index(self, word: str) -> int:
+        """
+        Returns the index of word in the dictionary's guesses, or -1
+        """
+        if self.word_ids is None:
+            self.word_ids = {w: i for i, w in enumerate(self.dictionary.guesses)}
+        return self.word_ids.get(word, -1)
+
+    def cached_guess(self, key: bytes, score_guesses) -> str:
+        """
+        Returns the guess stored in self.guess_cache for key. On a miss,
+        score_guesses() is called for the (guess, score) to store.
+        """
+        entry = self.guess_cache.get(key)
+        if entry is None:
+            entry = score_guesses()
+            self.guess_cache.put(key, *entry)
+        return entry[0]
+
+    def all_words(self) -> set[str]:
+        """
+        All possible legal words to guess from
+        """
+        return set(self.dictionary.guess_set)
 
     def possible_words_tf(self) -> dict[str, int]:
         """
@@ -121,7 +410,7 @@ class BotInterface(ABC):
 
         Example: tf = { "a": 5, "b": 3, ... }
         """
-        alphabet = list(string.ascii_lowercase)
+        alphabet = list(self.dictionary.alphabet)
         result = {}
         for letter in alphabet:
             words_with_letter = {word for word in self.possible_words if letter in word}
@@ -151,23 +440,35 @@ class BotInterface(ABC):
 
         We make scores for every possible word and choose the word with the highest
         score.
+
+        The choice only depends on self.possible_words, so it is memoized in
+        self.guess_cache.
         """
-        possible_tf = self.possible_words_tf()
-        scores = []  # ex: [ ("stair": 140), ... ]
-        for word in self.possible_words:
-            unique_letters = set(word)
-            score = 0
-            for letter in unique_letters:
-                score += possible_tf[letter]
-            scores.append((word, score))
+        key = fingerprint("tf", self.words_mask(self.possible_words))
+        return self.cached_guess(key, self.score_words_with_tf)
 
-        scores_sorted = sorted(scores, reverse=True, key=lambda x: x[1])
-        # print(scores_sorted[:10])
-        # print(scores_sorted[-10:])
-        # print(scores_sorted[0])
+    def score_words_with_tf(self) -> tuple[str, int]:
+        """
+        Returns the word with the top letter frequency score and its score
+        (see generate_word_with_tf)
+        """
+        # ties go to the first word alphabetically, so the choice does not
+        # depend on the order of the set
+        ids, scores, ties = BotInterface.guess_scores(self, None)
+        best = top_k(scores, ties, 1)[0]
+        return self.dictionary.guesses[ids[best]], int(scores[best])
 
-        # Return word with top score
-        return scores_sorted[0][0]
+    def tf_scores(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Returns the letter frequency score of each of the dictionary's
+        guesses with the given ids, counting letter frequencies over those
+        same words: the sum, over the distinct letters of a word, of the
+        number of words containing the letter
+        """
+        letters = np.arange(len(self.dictionary.alphabet), dtype=np.uint64)
+        masks = self.dictionary.guess_masks[ids]
+        has_letter = ((masks[:, None] >> letters) & np.uint64(1)).astype(np.int64)
+        return has_letter @ has_letter.sum(axis=0)
 
     def generate_word_with_genetic(self, game: GameState, n=100) -> str:
         """
@@ -198,6 +499,16 @@ class BotInterface(ABC):
 
         5. Mutate the child randomly
         """
+        for best_word in self.evolve(game, n):
+            pass
+        return best_word
+
+    def evolve(self, game: GameState, n=100):
+        """
+        Runs the genetic algorithm of generate_word_with_genetic, yielding the
+        fittest valid word of each generation as it goes (when it has one) and
+        last the word generate_word_with_genetic returns
+        """
         initial_population = random.sample(
             list(self.possible_words), min(n, len(self.possible_words)))
 
@@ -227,6 +538,9 @@ class BotInterface(ABC):
                 # print(f"{gi} {gw} {yi} {yw}")
             return result
 
+        # Words that are valid Wordle words
+        all_words = self.restrict_to_legal(self.all_words(), game)
+
         # Set population to the initial population
         population = initial_population
 
@@ -239,6 +553,14 @@ class BotInterface(ABC):
                 (word, fitness(word))
                 for word in population
             ]
+            # The fittest valid word so far, picked like the final guess
+            legal_fitness = [
+                (word, fitness) for (word, fitness) in population_fitness
+                if word in all_words
+            ]
+            if len(legal_fitness) > 0:
+                yield max(legal_fitness)[0]
+
             surviving_population = sorted(
                 population_fitness, reverse=True)[:len(population) // 2]
             # print(surviving_population)
@@ -274,7 +596,6 @@ class BotInterface(ABC):
             # print(f"hello {population}")
 
         # Filter the final population by words that are valid Wordle words
-        all_words = self.all_words()
         final_population = [
             word
             for word in population
@@ -301,16 +622,17 @@ class BotInterface(ABC):
         else:
             best_word = random.choice(initial_population)
 
-        return best_word
+        yield best_word
 
 
 class DummyBot(BotInterface):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, hard_mode=False, dictionary=None) -> None:
+        super().__init__(hard_mode, dictionary)
 
     def generate_word(self, game: GameState) -> str:
         # Randomly selects a possible word
         self.filter(game)
+        self.possible_words = self.restrict_to_legal(self.possible_words, game)
         return random.choice(list(self.possible_words))
 
     def filter(self, game: GameState) -> None:
@@ -321,8 +643,8 @@ class DummyBot(BotInterface):
 
 
 class SimpleBot(BotInterface):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, hard_mode=False, dictionary=None) -> None:
+        super().__init__(hard_mode, dictionary)
 
     def generate_word(self, game: GameState) -> str:
         """
@@ -335,9 +657,13 @@ class SimpleBot(BotInterface):
         2.  Filter out all remaining words that contain letters used in guess 1.
         3.  Guess with the remaining options. Repeat until we have to stop.
         4.  Make a guess where green letters stay, and we mix around yellow letters.
+
+        In hard mode, words with untried letters stop being legal as soon as a
+        green or yellow letter is revealed, so the bot moves on to step 4.
         """
         # Randomly selects a possible word
-        if len(self.possible_words) != 0 and game.turn != 5:
+        self.possible_words = self.restrict_to_legal(self.possible_words, game)
+        if len(self.possible_words) != 0 and game.turn != self.max_turns - 1:
             # print(
             #     "length of possible words:",
             #     len(self.possible_words),
@@ -348,7 +674,9 @@ class SimpleBot(BotInterface):
             self.filter(next_guess)  # filter out the next guess
         else:
             # last turn or self.possible_words is empty
-            possible_correct_words = self.potential_final_guesses(game)
+            possible_correct_words = self.restrict_to_legal(
+                self.potential_final_guesses(game), game
+            )
             next_guess = random.choice(list(possible_correct_words))
         return next_guess
 
@@ -427,8 +755,9 @@ class SimpleBot(BotInterface):
 
 
 class MiddleBot(BotInterface):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, hard_mode=False, dictionary=None) -> None:
+        super().__init__(hard_mode, dictionary)
+        self.endgame = endgame_solver(self.dictionary)
 
     def generate_word(self, game: GameState) -> str:
         """
@@ -442,9 +771,16 @@ class MiddleBot(BotInterface):
             information we know to make the best possible guess on what the word
             could be.
         3.  Repeat this until we win or lose.
+
+        Once only a few words are possible, the endgame solver picks the
+        guess instead.
         """
         # Randomly selects a possible word
         self.filter(game)
+        self.possible_words = self.restrict_to_legal(self.possible_words, game)
+        endgame_guess = self.endgame_guess(self.possible_words, game)
+        if endgame_guess is not None:
+            return endgame_guess
 
         # print(
         #     "length of possible words:",
@@ -511,30 +847,58 @@ class MiddleBot(BotInterface):
 
 
 class MiddleBotTf(MiddleBot):
-    def __init__(self) -> None:
+    def __init__(self, hard_mode=False, dictionary=None) -> None:
         """
         Bot using letter frequency to generate a word but keeping MiddleBot's
         filter strategy.
         """
-        super().__init__()
+        super().__init__(hard_mode, dictionary)
 
     def generate_word(self, game: GameState) -> str:
         self.filter(game)
+        self.possible_words = self.restrict_to_legal(self.possible_words, game)
         return self.generate_word_with_tf()
 
 
 class MiddleBotGenetic(MiddleBot):
-    def __init__(self) -> None:
+    def __init__(self, hard_mode=False, dictionary=None) -> None:
         """
         Bot using a genetic algorithm to generate a word but keeping MiddleBot's
         filter strategy.
         """
-        super().__init__()
+        super().__init__(hard_mode, dictionary)
+
+        # genetic_runs is how many times search runs the genetic algorithm,
+        # keeping the guess expected to leave the fewest answers
+        self.genetic_runs = 30
 
     def generate_word(self, game: GameState) -> str:
         self.filter(game)
+        self.possible_words = self.restrict_to_legal(self.possible_words, game)
         return self.generate_word_with_genetic(game)
 
+    def search(self, game: GameState):
+        """
+        Yields the fittest word of each generation of the genetic algorithm,
+        up to the guess generate_word makes. Later runs of the algorithm then
+        refine it: after each run, yields the guess of any run so far expected
+        to leave the fewest answers (see expected_left).
+        """
+        self.filter(game)
+        self.possible_words = self.restrict_to_legal(self.possible_words, game)
+        for best_word in self.evolve(game):
+            yield best_word
+
+        answers = self.answers_left(game)
+        fewest = self.expected_left([best_word], answers)[0]
+        for _ in range(self.genetic_runs - 1):
+            for guess in self.evolve(game):
+                pass
+            left = self.expected_left([guess], answers)[0]
+            if left < fewest:
+                best_word, fewest = guess, left
+            yield best_word
+
 
 class HardBot(BotInterface):
     # type: refers to 'aggregate' (green + yellow), 'pool', 'green'
@@ -548,26 +912,35 @@ class HardBot(BotInterface):
     # Ex 3: HardBot(type='pool', metric=10):
     #       The bot will switch to Middle bot's strategy when, if applying
     #       middle bot's strategy, there are 10 or less possible final guesses
-    def __init__(self, type: str, metric: int) -> None:
-        super().__init__()
+    def __init__(self, type: str, metric: int, hard_mode=False, dictionary=None):
+        super().__init__(hard_mode, dictionary)
+        self.endgame = endgame_solver(self.dictionary)
         self.type = type
         self.metric = metric
         self.num_green = 0
         self.num_yellow = 0
         self.metric_met = False
 
-    def play_game(self, max_turns=6, word=None):
+    def play_game(self, max_turns=6, word=None, game=None):
         # reset things
         self.metric_met = False
         self.num_green = 0
         self.num_yellow = 0
         # play the game
-        super().play_game(max_turns, word)
+        return super().play_game(max_turns, word, game)
 
     def generate_word(self, game: GameState) -> str:
         """
         Generates the next word based on the metric.
+
+        In hard mode, words with untried letters stop being legal as soon as a
+        green or yellow letter is revealed, which switches the bot to Middle
+        bot's strategy.
+
+        Once Middle bot's strategy leaves only a few words, the endgame solver
+        picks the guess instead.
         """
+        self.possible_words = self.restrict_to_legal(self.possible_words, game)
         if game.turn == 0:  # first turn: pick a random word, then filter list
             next_guess = random.choice(list(self.possible_words))
             self.filter(next_guess)
@@ -603,7 +976,12 @@ class HardBot(BotInterface):
                     self.metric_met = True
 
         if self.metric_met:
-            possible_correct_words = self.potential_final_guesses(game)
+            possible_correct_words = self.restrict_to_legal(
+                self.potential_final_guesses(game), game
+            )
+            endgame_guess = self.endgame_guess(possible_correct_words, game)
+            if endgame_guess is not None:
+                return endgame_guess
             return random.choice(list(possible_correct_words))
         else:
             # already been filtered
@@ -684,6 +1062,261 @@ class HardBot(BotInterface):
         self.possible_words -= words_to_remove
 
 
+class MinimaxBot(BotInterface):
+    # scores are partition sizes, so lower is better
+    higher_is_better = False
+
+    def __init__(self, all_guesses=True, hard_mode=False, dictionary=None) -> None:
+        """
+        Bot that guesses the word minimizing the largest group of answers that
+        could still be possible after seeing its feedback, which bounds the
+        number of turns the bot can need in the worst case.
+
+        all_guesses: if True, the bot may guess any legal word, including words
+        that cannot be the answer, which often splits the answers better. If
+        False, it only guesses answers that are still possible.
+
+        Partition sizes come from the precomputed pattern table in
+        wordle.patterns, so scoring every guess is a single bincount.
+        """
+        super().__init__(hard_mode, dictionary)
+        self.all_guesses = all_guesses
+        self.patterns = pattern_table(self.dictionary)
+
+        # candidates are the indices of the answers that are still possible
+        self.candidates = np.arange(len(self.patterns.answers))
+
+        # the first guess only depends on the word lists, so it is computed
+        # once and reused for every game
+        self.opener = None
+
+        # scorings memoizes the last few (guess ids, scores, tie breakers) of
+        # score_guesses by candidates, so suggest can rank the guesses the
+        # pick was made from without scoring them again. The scoring of the
+        # first guess is kept for good in opener_scoring.
+        self.scorings = OrderedDict()
+        self.opener_scoring = None
+
+    def warm_up(self) -> None:
+        """
+        Computes the first guess, the slowest one to score
+        """
+        if self.opener is None:
+            self.candidates = np.arange(len(self.patterns.answers))
+            self.opener = self.best_guess()
+
+    def generate_word(self, game: GameState) -> str:
+        if len(game.guesses) == 0:
+            self.candidates = np.arange(len(self.patterns.answers))
+            self.warm_up()
+            return self.opener
+
+        self.filter(game)
+        return self.next_guess(game)
+
+    def next_guess(self, game: GameState) -> str:
+        """
+        Returns the guess to make in game once self.candidates holds the
+        answers still consistent with its feedback
+        """
+        if len(self.candidates) == 0:
+            # the answer is not in the answer list, so nothing is known
+            return random.choice(list(self.possible_words))
+        if len(self.candidates) <= 2:
+            return self.patterns.answers[self.candidates[0]]
+        return self.best_guess(game)
+
+    def filter(self, game: GameState) -> None:
+        """
+        Keeps only the answers that would have produced the latest feedback
+        """
+        if len(game.guesses) > 0:
+            guess = "".join(game.guesses[-1])
+            code = encode_feedback(game.feedback[-1])
+            codes = self.patterns.codes(guess, self.candidates)
+            self.candidates = self.candidates[codes == code]
+
+    def scores(self, counts: np.ndarray) -> np.ndarray:
+        """
+        Given the partition sizes of each guess, returns the score of each
+        guess, lower being better: the size of its largest partition
+        """
+        return counts.max(axis=1)
+
+    def best_guess(self, game=None) -> str:
+        """
+        Returns the guess with the lowest score, preferring guesses that could
+        be the answer when scores are tied. In hard mode, only the legal
+        guesses of game are scored.
+
+        Results are memoized in self.guess_cache by the candidates (and legal
+        guesses in hard mode).
+        """
+        legal = None
+        if game is not None and self.hard_mode:
+            legal = self.legal_mask(game)
+        key = fingerprint(
+            type(self).__name__, self.all_guesses, self.candidates, legal
+        )
+        return self.cached_guess(key, lambda: self.score_guesses(legal))
+
+    def score_guesses(self, legal=None) -> tuple[str, int]:
+        """
+        Scores the guesses against self.candidates and returns the best one
+        with its score (see best_guess). legal is an optional mask of the
+        guesses allowed in hard mode.
+        """
+        guess_ids, scores, ties = self.scored_guesses(legal)
+        best = top_k(scores, ties, 1, higher_is_better=False)[0]
+        return self.patterns.guesses[guess_ids[best]], scores[best]
+
+    def scored_guesses(self, legal=None) -> tuple[np.ndarray, ...]:
+        """
+        Returns the ids of the guesses scored against self.candidates, their
+        scores and a tie breaker preferring guesses that could be the answer
+        (see guess_scores). The last few results are memoized.
+        """
+        opening = legal is None and len(self.candidates) == len(self.patterns.answers)
+        if opening and self.opener_scoring is not None:
+            return self.opener_scoring
+        key = fingerprint(self.all_guesses, self.candidates, legal)
+        if key in self.scorings:
+            self.scorings.move_to_end(key)
+            return self.scorings[key]
+
+        if self.all_guesses:
+            guess_ids = np.arange(len(self.patterns.guesses))
+        else:
+            guess_ids = self.candidates
+        if legal is not None:
+            guess_ids = guess_ids[legal[guess_ids]]
+        if len(self.candidates) <= 8:
+            counts = self.small_partition_sizes(guess_ids)
+        else:
+            counts = self.patterns.partition_sizes(guess_ids, self.candidates)
+            # guessing the answer ends the game, so that partition is free
+            counts[:, self.patterns.win_code] = 0
+        scores = self.scores(counts)
+        ties = ~np.isin(guess_ids, self.candidates)
+
+        self.scorings[key] = (guess_ids, scores, ties)
+        if len(self.scorings) > 4:
+            self.scorings.popitem(last=False)
+        if opening:
+            self.opener_scoring = (guess_ids, scores, ties)
+        return guess_ids, scores, ties
+
+    def small_partition_sizes(self, guess_ids: np.ndarray) -> np.ndarray:
+        """
+        Returns the partition sizes of each guess against a handful of
+        candidates, as a (len(guess_ids), len(candidates)) array with a column
+        per candidate holding the size of its partition if it is the first
+        candidate in it, else 0. The winning partition is left out, as in
+        scored_guesses. Comparing every pair of candidates is much cheaper
+        than a bincount over every pattern for so few.
+        """
+        codes = self.patterns.table[np.ix_(guess_ids, self.candidates)]
+        same = codes[:, :, None] == codes[:, None, :]
+        first = ~np.tril(same, -1).any(axis=2)
+        return np.where(first & (codes != self.patterns.win_code), same.sum(axis=2), 0)
+
+    def guess_scores(self, game: GameState) -> tuple[np.ndarray, ...]:
+        """
+        Returns the guesses scored against the answers still possible, lower
+        scores being better (see scores). With two candidates or fewer, no
+        guess beats them and next_guess picks one without scoring, so only
+        they are scored.
+        """
+        if 0 < len(self.candidates) <= 2:
+            counts = self.small_partition_sizes(self.candidates)
+            return self.candidates, self.scores(counts), np.zeros(len(counts), bool)
+        legal = None
+        if game is not None and self.hard_mode:
+            legal = self.legal_mask(game)
+        return self.scored_guesses(legal)
+
+    def answers_left(self, game: GameState) -> np.ndarray:
+        """
+        Returns self.candidates, which generate_word keeps filtered
+        """
+        return self.candidates
+
+
+class MinimaxBotExpected(MinimaxBot):
+    def __init__(self, all_guesses=True, hard_mode=False, dictionary=None) -> None:
+        """
+        Bot that guesses the word minimizing the expected number of answers
+        left after its feedback, keeping MinimaxBot's filter strategy.
+        """
+        super().__init__(all_guesses, hard_mode, dictionary)
+
+    def scores(self, counts: np.ndarray) -> np.ndarray:
+        """
+        An answer lands in a partition of size c with probability c / n and
+        then leaves c answers, so the expected number of answers left is
+        sum(c^2) / n. n is the same for every guess, so it is left out.
+        """
+        return (counts * counts).sum(axis=1)
+
+    def left_after(self, ranked: list[tuple], answers: np.ndarray) -> list[float]:
+        """
+        The scores of guesses ranked against self.candidates are already the
+        expected number of answers left, times the number of candidates
+        """
+        scores = [score for _, score in ranked]
+        if answers is not self.candidates or np.isnan(scores).any():
+            return super().left_after(ranked, answers)
+        return [float(score) / len(answers) for score in scores]
+
+
+class TreeBot(MinimaxBotExpected):
+    def __init__(self, path=None, hard_mode=False, dictionary=None) -> None:
+        """
+        Bot that plays a strategy tree built offline by `python -m bot.tree`.
+        Every turn is a single lookup of the feedback in the tree. path
+        defaults to where bot.tree saves the tree of the bot's dictionary.
+
+        If the game leaves the tree (e.g. a player guessed something other
+        than the suggestion), the bot falls back to MinimaxBotExpected, whose
+        candidates are kept filtered every turn for that purpose. The tree is
+        built for normal mode, so in hard mode the bot also leaves the tree
+        when its next guess would break the rules.
+        """
+        super().__init__(hard_mode=hard_mode, dictionary=dictionary)
+        if path is None:
+            path = tree_path(self.dictionary)
+        self.tree = DecisionTree.load(path)
+
+        # node is where in the tree the current game is, or None off the tree
+        self.node = 0
+
+    def warm_up(self) -> None:
+        """
+        The first guess comes from the tree, so there is nothing to compute
+        """
+        pass
+
+    def generate_word(self, game: GameState) -> str:
+        if len(game.guesses) == 0:
+            self.candidates = np.arange(len(self.patterns.answers))
+            self.node = 0
+            return self.tree.guess(self.node)
+
+        self.filter(game)
+        if self.node is not None:
+            if "".join(game.guesses[-1]) == self.tree.guess(self.node):
+                code = encode_feedback(game.feedback[-1])
+                self.node = self.tree.child(self.node, code)
+            else:
+                self.node = None
+        if self.node is not None and self.hard_mode:
+            if game.hard_mode_violation(self.tree.guess(self.node)) is not None:
+                self.node = None
+        if self.node is not None:
+            return self.tree.guess(self.node)
+        return self.next_guess(game)
+
+
 def generate_word(num_words) -> str:
     """
     Returns a new valid 5-letter Wordle word
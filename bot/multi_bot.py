@@ -1,14 +1,24 @@
 from wordle.main import GameState, Feedback
+from bot.endgame import endgame_solver
 import random
 from wordle.multi_wordle import Multi_Wordle
+from wordle.words import get_dictionary
 from abc import ABC, abstractmethod
 
 
 class BotInterface(ABC):
-    def __init__(self) -> None:
+    def __init__(self, dictionary=None) -> None:
         """
         Initializes a friendly AI bot to play Multi-Wordle!
+
+        dictionary: the wordle.words.Dictionary games are played with (the
+        standard 5-letter lists if None)
         """
+        # dictionary holds the word lists the bot guesses from
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+
         # games is the list of all games that were played by the bot
         self.games = []
 
@@ -25,13 +35,23 @@ class BotInterface(ABC):
         # keeps track of which game to attempt to solve
         self.to_solve = 0  # start by trying to solve 0th game
 
+        # max_turns is the number of guesses allowed in the current game
+        self.max_turns = 8
+
+        # endgame plays the game being solved perfectly once only a few words
+        # are possible (see endgame_guess). Set it to None to play without it.
+        self.endgame = endgame_solver(self.dictionary)
+
     def play_game(self, max_turns=8, num_games=2, words=None) -> Multi_Wordle:
         """
         Non-interactively plays a game of Wordle and returns the finished game state
 
         words: the list of words for this game
         """
-        game = Multi_Wordle(num_games=num_games, words=words)
+        game = Multi_Wordle(
+            num_games=num_games, words=words, dictionary=self.dictionary
+        )
+        self.max_turns = max_turns
         while not game.is_finished(max_turns=max_turns):
             guess = self.generate_word(game)
             if guess is None:
@@ -69,6 +89,8 @@ class BotInterface(ABC):
             # print(game.answers)
             # print(f"Turns: {game.xturn}")
             # game.print_game_state()
+        if self.endgame is not None:
+            self.endgame.save()
 
     def __repr__(self) -> str:
         """
@@ -94,31 +116,31 @@ class BotInterface(ABC):
         """
         pass
 
+    def search(self, game: Multi_Wordle):
+        """
+        Yields better and better guesses for game, as
+        bot.main.BotInterface.search does. By default it only yields the
+        guess of generate_word.
+        """
+        yield self.generate_word(game)
+
     # HELPER FUNCTIONS
 
+    def endgame_guess(self, game: Multi_Wordle):
+        """
+        Returns the guess of self.endgame for the game being solved, or None
+        if there is no endgame solver or too many words are possible
+        """
+        if self.endgame is None:
+            return None
+        turns_left = self.max_turns - game.xturn
+        return self.endgame.solve(self.possible_words, turns_left)
+
     def all_words(self) -> set[str]:
         """
         All possible legal words to guess from
         """
-        # word list found here: https://gist.github.com/scholtes/94f3c0303ba6a7768b47583aff36654d#file-wordle-la-txt
-        # La words that can be guessed and which can be the word of the day
-        # Ta words that can be guessed but are never selected as the word of the day
-
-        # opening the file in read mode
-        valid_word_list_file = open("public/wordle-La.txt", "r")
-        invalid_word_list_file = open("public/wordle-Ta.txt", "r")
-
-        # reading the file
-        valid_data = valid_word_list_file.read()
-        invalid_data = invalid_word_list_file.read()
-
-        # replacing end splitting the text
-        # when newline ('\n') is seen.
-        data_into_list = valid_data.split("\n") + invalid_data.split("\n")
-
-        valid_word_list_file.close()
-        invalid_word_list_file.close()
-        return set(data_into_list)
+        return set(self.dictionary.guess_set)
 
     def filter(self, game: Multi_Wordle) -> None:
         """
@@ -196,7 +218,7 @@ class BotInterface(ABC):
 
 class NaiveBot(BotInterface):
 
-    def __init__(self):
+    def __init__(self, dictionary=None):
         """
         NaiveBot specifically targets one game at a time in order; it does not care about
         the other games occuring and does not attempt to solve them until they've solved
@@ -204,7 +226,7 @@ class NaiveBot(BotInterface):
         In other words, NaiveBot does not aim to solve the 'closest to finished' game;
         instead always goes in order
         """
-        super().__init__()
+        super().__init__(dictionary)
 
     def generate_word(self, game: Multi_Wordle) -> str:
         if game.wins != self.to_solve:
@@ -213,25 +235,31 @@ class NaiveBot(BotInterface):
             if game.wins == game.num_games:
                 return None
         self.filter(game)
+        endgame_guess = self.endgame_guess(game)
+        if endgame_guess is not None:
+            return endgame_guess
         return random.choice(list(self.possible_words))
 
 
 class GreedyBot(BotInterface):
 
-    def __init__(self):
+    def __init__(self, dictionary=None):
         """
         GreedyBot scores each wordle game within Multi_Wordle, and greedily solves.
         Scores are based on the feedback (according to Enum values)
         """
-        super().__init__()
+        super().__init__(dictionary)
         self.scores = []
 
     def play_game(self, max_turns=8, num_games=2, words=None) -> Multi_Wordle:
         """
         Non-interactively plays a game of Wordle and returns the finished game state
         """
-        game = Multi_Wordle(num_games=num_games, words=words)
+        game = Multi_Wordle(
+            num_games=num_games, words=words, dictionary=self.dictionary
+        )
         self.scores = [0] * num_games
+        self.max_turns = max_turns
         while not game.is_finished(max_turns=max_turns):
             guess = self.generate_word(game)
             if guess is None:
@@ -264,6 +292,9 @@ class GreedyBot(BotInterface):
             return None
 
         self.filter(game)
+        endgame_guess = self.endgame_guess(game)
+        if endgame_guess is not None:
+            return endgame_guess
         return random.choice(list(self.possible_words))
 
     def min_score_idx(self):
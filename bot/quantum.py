@@ -1,14 +1,34 @@
-from wordle.quantum import GameState, Feedback
+from wordle.quantum import (
+    GameState,
+    Feedback,
+    encode_feedback,
+    feedback_codes,
+    num_codes,
+    win_code,
+)
+from wordle.pairs import disjoint_index
+from wordle.words import get_dictionary
+from collections import Counter
 import random
 import itertools
+import time
+import numpy as np
 from abc import ABC, abstractmethod
 
 
 class BotInterface(ABC):
-    def __init__(self) -> None:
+    def __init__(self, dictionary=None) -> None:
         """
         Initializes a friendly AI bot to play Wordle!
+
+        dictionary: the wordle.words.Dictionary games are played with (the
+        standard 5-letter lists if None)
         """
+        # dictionary holds the word lists the bot guesses from
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+
         # games is the list of all games that were played by the bot
         self.games = []
 
@@ -36,12 +56,32 @@ class BotInterface(ABC):
 
         self.changed = False
 
-    def play_game(self) -> GameState:
+        # turn_counts maps a number of turns to the number of games won in
+        # exactly that many turns
+        self.turn_counts = Counter()
+
+        # games_timed_out is the number of games stopped by a timeout
+        self.games_timed_out = 0
+
+    def play_game(self, max_turns=None, words=None, timeout=None) -> GameState:
         """
         Non-interactively plays a game of Wordle and returns the finished game state
+
+        max_turns: stop after this many guesses (no cap by default)
+        words: an optional (word1, word2) answer pair
+        timeout: stop once the game has run for this many seconds. The clock is
+        checked between guesses, so a single guess is never interrupted.
         """
-        game = GameState()
-        while (not game.is_finished()):
+        if words is None:
+            game = GameState(dictionary=self.dictionary)
+        else:
+            game = GameState(*words, dictionary=self.dictionary)
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        timed_out = False
+        while (not game.is_finished(max_turns)):
+            if deadline is not None and time.perf_counter() > deadline:
+                timed_out = True
+                break
             guess = self.generate_word(game)
             game.attempt_guess(guess)
 
@@ -59,24 +99,32 @@ class BotInterface(ABC):
             
             self.win_rate += 1
             self.total_turns_won += game.turn
+            self.turn_counts[game.turn] += 1
+        elif timed_out:
+            self.games_timed_out += 1
         return game
 
-    def play_games(self, n: int) -> None:
+    def play_games(self, n: int, max_turns=None, timeout=None) -> None:
         """
         Non-interactively plays n games of Wordle
         """
         for _ in range(n):
-            self.play_game()
+            self.play_game(max_turns=max_turns, timeout=timeout)
 
-    def __repr__(self) -> str:
+    def turn_histogram(self) -> str:
         """
-        Returns a string representation of Bot
+        Returns one line per number of turns taken to win, with a bar
+        proportional to the number of games won in that many turns
         """
-        return (
-            f"games: {self.games}\n"
-            f"win rate: {self.win_rate}\n"
-            f"number of possible words: {len(self.possible_words)}"
-        )
+        if len(self.turn_counts) == 0:
+            return ""
+        most = max(self.turn_counts.values())
+        lines = []
+        for turns in range(min(self.turn_counts), max(self.turn_counts) + 1):
+            count = self.turn_counts[turns]
+            bar = "#" * round(40 * count / most)
+            lines.append(f"{turns:>3} | {bar} {count}")
+        return "\n".join(lines) + "\n"
 
     @abstractmethod
     def generate_word(self, game: GameState) -> str:
@@ -125,9 +173,10 @@ class BotInterface(ABC):
         Returns a string representation of Bot
         """
         return (
-            f'games: {self.games}\n'
-            f'win rate: {self.win_rate}\n'
-            f'number of possible words: {len(self.possible_words)}'
+            f'number of games: {len(self.games)}\n'
+            f'games won: {self.win_rate}\n'
+            f'games timed out: {self.games_timed_out}\n'
+            f'turns to win:\n{self.turn_histogram()}'
         )
 
     # HELPER FUNCTIONS
@@ -136,30 +185,12 @@ class BotInterface(ABC):
         """
         All possible legal words to guess from
         """
-        # word list found here: https://gist.github.com/scholtes/94f3c0303ba6a7768b47583aff36654d#file-wordle-la-txt
-        # La words that can be guessed and which can be the word of the day
-        # Ta words that can be guessed but are never selected as the word of the day
-
-        # opening the file in read mode
-        valid_word_list_file = open("public/wordle-La.txt", "r")
-        invalid_word_list_file = open("public/wordle-Ta.txt", "r")
-
-        # reading the file
-        valid_data = valid_word_list_file.read()
-        invalid_data = invalid_word_list_file.read()
-
-        # replacing end splitting the text
-        # when newline ('\n') is seen.
-        data_into_list = valid_data.split("\n") + invalid_data.split("\n")
-
-        valid_word_list_file.close()
-        invalid_word_list_file.close()
-        return set(data_into_list)
+        return set(self.dictionary.guess_set)
 
 
 class DummyBot(BotInterface):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, dictionary=None) -> None:
+        super().__init__(dictionary)
 
     def generate_word(self, game: GameState) -> str:
         # Randomly selects a possible word
@@ -178,8 +209,8 @@ class DummyBot(BotInterface):
 
 
 class QuantumBot(BotInterface):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, dictionary=None) -> None:
+        super().__init__(dictionary)
 
     def __repr__(self) -> str:
         """
@@ -191,12 +222,12 @@ class QuantumBot(BotInterface):
             avg_turns = round(self.total_turns_won / self.win_rate, 2)
         return (
             # f"games: {self.games}\n"
-            f'games: {self.games}\n'
             f"number of games: {len(self.games)}\n"
             f"win rate: {self.win_rate/len(self.games)}\n"
             # f"number of possible words: {len(self.possible_words)}\n"
             f"avg turns to win: {avg_turns}\n"
-            f"testing: {self.testing}\n"
+            f"games timed out: {self.games_timed_out}\n"
+            f"turns to win:\n{self.turn_histogram()}"
         )
 
     def generate_word(self, game: GameState) -> str:
@@ -370,6 +401,101 @@ class QuantumBot(BotInterface):
             self.possible_words = self.possible_words - words_to_remove
 
 
+class QuantumPairBot(QuantumBot):
+    def __init__(self, sample_size=1000, num_candidates=500, dictionary=None) -> None:
+        """
+        Bot that tracks every (word1, word2) answer pair still consistent with
+        the feedback instead of a single set of possible words.
+
+        Answers are letter-disjoint, so the candidate pairs are stored as pair
+        ids into two parallel arrays (self.first, self.second) of answer
+        indices. self.live holds the ids of the pairs that are still possible.
+
+        sample_size: the number of live pairs used to score guesses while many
+        pairs remain
+        num_candidates: the number of guesses scored each turn
+        """
+        super().__init__(dictionary)
+        self.sample_size = sample_size
+        self.num_candidates = num_candidates
+
+        # guess_words starts with the answers, so an answer's index is also
+        # its index in guess_words
+        index = disjoint_index(self.dictionary)
+        self.answers = index.words
+        self.encoded_answers = self.dictionary.encoded_answers
+        self.guess_words = self.dictionary.guesses
+        self.encoded_guesses = self.dictionary.encoded_guesses
+        self.num_codes = num_codes(self.dictionary.word_length)
+        self.win_code = win_code(self.dictionary.word_length)
+
+        self.first, self.second = index.pairs()
+        self.live = np.arange(len(self.first))
+
+    def generate_word(self, game: GameState) -> str:
+        """
+        Narrows the live pairs with the latest feedback row, then picks the
+        guess that splits the live pairs into the smallest expected group.
+
+        A guess is scored by sum(b^2) over the feedback groups b it splits the
+        pairs into, which is proportional to the expected number of pairs left
+        after guessing it. Pairs containing the guess itself end the game, so
+        that group does not count against it, which makes the bot prefer
+        guessing a possible answer once that splits the pairs as well.
+        """
+        if game.turn == 0:
+            self.live = np.arange(len(self.first))
+        self.filter(game)
+
+        if len(self.live) == 0:
+            return random.choice(list(self.possible_words))
+
+        if len(self.live) > self.sample_size:
+            sample = self.live[random.sample(range(len(self.live)), self.sample_size)]
+        else:
+            sample = self.live
+        # re-index the sampled pairs over just the answers they use, so each
+        # candidate is only compared against those answers
+        live_words, inverse = np.unique(
+            np.concatenate((self.first[sample], self.second[sample])),
+            return_inverse=True,
+        )
+        first, second = inverse[: len(sample)], inverse[len(sample) :]
+        live_answers = self.encoded_answers[live_words]
+
+        if len(live_words) <= self.num_candidates:
+            candidates = live_words
+        else:
+            candidates = random.sample(range(len(self.guess_words)), self.num_candidates)
+
+        best_word, best_score = None, None
+        for candidate in candidates:
+            codes = feedback_codes(
+                self.encoded_guesses[candidate], live_answers, first, second
+            )
+            counts = np.bincount(codes, minlength=self.num_codes)
+            score = int((counts * counts).sum() - counts[self.win_code] ** 2)
+            if best_score is None or score < best_score:
+                best_word, best_score = candidate, score
+
+        return self.guess_words[best_word]
+
+    def filter(self, game: GameState) -> None:
+        """
+        Keeps only the pairs that would have produced the latest feedback row
+        """
+        if len(game.guesses) > 0:
+            guess = self.dictionary.encode(["".join(game.guesses[-1])])[0]
+            code = encode_feedback(game.feedback[-1])
+            codes = feedback_codes(
+                guess,
+                self.encoded_answers,
+                self.first[self.live],
+                self.second[self.live],
+            )
+            self.live = self.live[codes == code]
+
+
 if __name__ == "__main__":
     b = QuantumBot()
     b.play_games(10)
@@ -0,0 +1,385 @@
+import argparse
+import asyncio
+import collections
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from bot.main import MinimaxBot, MinimaxBotExpected
+from wordle.main import GameState, Feedback, encode_feedback
+from wordle.patterns import pattern_table
+from wordle.words import ANSWERS_PATH, GUESSES_PATH, get_dictionary
+
+# bots the server can run. Their guesses only depend on the answers still
+# possible (and the hard mode hints), which is what lets requests for
+# different games share one result. Other bots, which keep their own state
+# from turn to turn, are not served.
+SERVER_BOTS = {
+    "MinimaxBot": MinimaxBot,
+    "MinimaxBotExpected": MinimaxBotExpected,
+}
+
+
+def replay(guesses: list[str], feedback: list[str], hard_mode: bool, dictionary):
+    """
+    Returns a GameState holding the given guesses and feedback, where each
+    feedback row is a string of Feedback values such as "20100"
+    """
+    game = GameState(word="", hard_mode=hard_mode, dictionary=dictionary)
+    for guess, row in zip(guesses, feedback):
+        game.guesses.append(list(guess))
+        game.feedback.append([Feedback(int(value)) for value in row])
+        game.turn += 1
+    return game
+
+
+# the bot of a worker process, shared by every batch that worker scores
+_bot = None
+
+
+def init_worker(bot_name: str, answers_path: str, guesses_path: str) -> None:
+    """
+    Creates the worker's bot. The pattern table is memory-mapped, so every
+    worker shares one copy of it.
+    """
+    global _bot
+    dictionary = get_dictionary(answers_path, guesses_path)
+    _bot = SERVER_BOTS[bot_name](dictionary=dictionary)
+
+
+def score_tasks(tasks: list) -> list[str]:
+    """
+    Picks the next guess for each task of a batch in a worker process, one
+    task at a time. A task is (candidate answer ids, guesses, feedback, hard
+    mode). Batching saves a process pool round trip per task; the tasks have
+    different answers left, so each is scored on its own.
+    """
+    suggestions = []
+    for candidates, guesses, feedback, hard_mode in tasks:
+        _bot.hard_mode = hard_mode
+        game = replay(guesses, feedback, hard_mode, _bot.dictionary)
+        if len(guesses) == 0:
+            suggestions.append(_bot.generate_word(game))
+        else:
+            _bot.candidates = candidates
+            suggestions.append(_bot.next_guess(game))
+    return suggestions
+
+
+class SuggestionServer:
+    def __init__(
+        self,
+        bot_name="MinimaxBotExpected",
+        processes=None,
+        batch_window=0.002,
+        max_batch=64,
+        dictionary=None,
+    ) -> None:
+        """
+        Serves next-guess suggestions over a local socket, one JSON object per
+        line. A request looks like
+
+            {"id": 7, "guesses": ["crane"], "feedback": ["01020"]}
+
+        with an optional "hard_mode": true, and is answered with
+
+            {"id": 7, "suggestion": "spilt", "candidates": 12}
+
+        {"metrics": true} is answered with the server's metrics instead.
+
+        The answers still possible are worked out on the event loop, which
+        only takes a few pattern table lookups. Requests whose games have the
+        same answers left (and hard mode hints) share one pending result, so
+        they are scored once. Distinct requests wait up to batch_window
+        seconds to be sent to the process pool together, at most max_batch
+        at a time.
+        """
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+        self.patterns = pattern_table(dictionary)
+        self.bot_name = bot_name
+        self.processes = processes
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+
+        # queue holds the (key, task) pairs waiting to be batched, and pending
+        # maps the key of every queued or running task to its future
+        self.queue = None
+        self.pending = {}
+        self.pool = None
+        self.server = None
+        self.batcher = None
+
+        # running holds the tasks of the batches being scored, so they are
+        # not garbage collected before they finish
+        self.running = set()
+
+        # writers maps each open connection's writer to its handler task
+        self.writers = {}
+
+        # counters reported by metrics
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.batched_tasks = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+
+        # latencies holds the seconds taken by the most recent requests
+        self.latencies = collections.deque(maxlen=10000)
+
+    async def start(self, host="127.0.0.1", port=8765) -> None:
+        """
+        Starts the worker processes and listens on host and port. Port 0 picks
+        a free port, which is then in self.port.
+        """
+        self.queue = asyncio.Queue()
+        self.pool = ProcessPoolExecutor(
+            self.processes,
+            initializer=init_worker,
+            initargs=(
+                self.bot_name,
+                self.dictionary.answers_path,
+                self.dictionary.guesses_path,
+            ),
+        )
+        self.batcher = asyncio.create_task(self.batch_loop())
+        self.server = await asyncio.start_server(self.handle, host, port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Stops listening and shuts the worker processes down
+        """
+        self.server.close()
+        # closing a connection ends its handler once its requests are answered
+        handlers = list(self.writers.values())
+        for writer in list(self.writers):
+            writer.close()
+        if len(handlers) > 0:
+            await asyncio.wait(handlers)
+        await self.server.wait_closed()
+        self.batcher.cancel()
+        self.pool.shutdown()
+
+    async def handle(self, reader, writer) -> None:
+        """
+        Answers the requests of one connection. Each line is answered as soon
+        as it is ready, so a client can send several requests without waiting.
+        """
+        self.writers[writer] = asyncio.current_task()
+        tasks = set()
+        while True:
+            try:
+                line = await reader.readline()
+            except ConnectionError:
+                break
+            if not line:
+                break
+            task = asyncio.create_task(self.respond(line, writer))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if len(tasks) > 0:
+            await asyncio.wait(tasks)
+        del self.writers[writer]
+        writer.close()
+
+    async def respond(self, line: bytes, writer) -> None:
+        """
+        Answers a single request line
+        """
+        request = None
+        try:
+            request = json.loads(line)
+            if request.get("metrics"):
+                response = self.metrics()
+            else:
+                response = await self.suggest(
+                    request["guesses"],
+                    request["feedback"],
+                    request.get("hard_mode", False),
+                )
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            response = {"error": str(error)}
+        except Exception as error:
+            # the batch failed in the process pool, as when a worker crashed
+            # (BrokenProcessPool), so the client is told instead of waiting
+            response = {"error": f"{type(error).__name__}: {error}"}
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        if not writer.is_closing():
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    def candidates(self, guesses: list[str], feedback: list[str]) -> np.ndarray:
+        """
+        Returns the ids of the answers consistent with the given feedback.
+        Raises ValueError for malformed feedback.
+        """
+        if len(guesses) != len(feedback):
+            raise ValueError("guesses and feedback must have the same length")
+        ids = np.arange(len(self.patterns.answers))
+        for guess, row in zip(guesses, feedback):
+            if len(guess) != self.dictionary.word_length or len(row) != len(guess):
+                raise ValueError(
+                    f"{guess} and {row} must both have "
+                    f"{self.dictionary.word_length} letters"
+                )
+            if any(value not in "012" for value in row):
+                raise ValueError(f"Feedback {row} must only use 0, 1 and 2")
+            code = encode_feedback([Feedback(int(value)) for value in row])
+            ids = ids[self.patterns.codes(guess, ids) == code]
+        return ids
+
+    def hints(self, guesses: list[str], feedback: list[str]) -> tuple:
+        """
+        Returns the hard mode hints revealed by the feedback: the green letters
+        with their positions and the yellow letters. Two games with the same
+        hints have the same legal guesses.
+        """
+        greens = set()
+        yellows = set()
+        for guess, row in zip(guesses, feedback):
+            for i, value in enumerate(row):
+                if value == "2":
+                    greens.add((i, guess[i]))
+                elif value == "1":
+                    yellows.add(guess[i])
+        return tuple(sorted(greens)), tuple(sorted(yellows))
+
+    async def suggest(self, guesses, feedback, hard_mode=False) -> dict:
+        """
+        Returns the suggestion for a game, sharing the result with every other
+        request for a game with the same answers left
+        """
+        start = time.perf_counter()
+        self.requests += 1
+        ids = self.candidates(guesses, feedback)
+
+        mask = np.zeros(len(self.patterns.answers), dtype=bool)
+        mask[ids] = True
+        key = (np.packbits(mask).tobytes(), len(guesses) == 0)
+        if hard_mode:
+            key += self.hints(guesses, feedback)
+
+        if key in self.pending:
+            self.coalesced += 1
+            future = self.pending[key]
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self.pending[key] = future
+            await self.queue.put((key, (ids, guesses, feedback, hard_mode)))
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+        suggestion = await future
+        self.latencies.append(time.perf_counter() - start)
+        return {"suggestion": suggestion, "candidates": len(ids)}
+
+    async def batch_loop(self) -> None:
+        """
+        Collects queued tasks into batches and sends each batch to the process
+        pool in a single call, where its tasks are scored one by one
+        """
+        while True:
+            batch = [await self.queue.get()]
+            await asyncio.sleep(self.batch_window)
+            while not self.queue.empty() and len(batch) < self.max_batch:
+                batch.append(self.queue.get_nowait())
+            task = asyncio.create_task(self.run_batch(batch))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+    async def run_batch(self, batch: list) -> None:
+        """
+        Scores a batch in the process pool and resolves its futures
+        """
+        self.batches += 1
+        self.batched_tasks += len(batch)
+        self.in_flight += len(batch)
+        loop = asyncio.get_running_loop()
+        try:
+            suggestions = await loop.run_in_executor(
+                self.pool, score_tasks, [task for _, task in batch]
+            )
+        except Exception as error:
+            for key, _ in batch:
+                self.pending.pop(key).set_exception(error)
+        else:
+            for (key, _), suggestion in zip(batch, suggestions):
+                self.pending.pop(key).set_result(suggestion)
+        finally:
+            self.in_flight -= len(batch)
+
+    def metrics(self) -> dict:
+        """
+        Returns the queue depth, throughput counters and latency percentiles
+        (in milliseconds, over the most recent requests)
+        """
+        latencies = np.array(self.latencies) * 1000
+        if len(latencies) > 0:
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            latency = {
+                "p50": round(p50, 2),
+                "p95": round(p95, 2),
+                "p99": round(p99, 2),
+                "max": round(float(latencies.max()), 2),
+            }
+        else:
+            latency = {}
+        return {
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_tasks / max(self.batches, 1), 2),
+            "latency_ms": latency,
+        }
+
+
+async def request(reader, writer, message: dict) -> dict:
+    """
+    Sends one request on an open connection to a SuggestionServer and
+    returns its response
+    """
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def serve(args) -> None:
+    """
+    Runs a SuggestionServer until interrupted
+    """
+    server = SuggestionServer(
+        bot_name=args.bot,
+        processes=args.processes,
+        batch_window=args.batch_window,
+        dictionary=get_dictionary(args.answers, args.guesses),
+    )
+    await server.start(args.host, args.port)
+    print(f"Serving {args.bot} suggestions on {args.host}:{server.port}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--bot", choices=list(SERVER_BOTS), default="MinimaxBotExpected"
+    )
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--batch-window", type=float, default=0.002)
+    parser.add_argument("--answers", default=ANSWERS_PATH)
+    parser.add_argument("--guesses", default=GUESSES_PATH)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
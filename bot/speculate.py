@@ -0,0 +1,298 @@
+import copy
+import heapq
+import threading
+from abc import ABC, abstractmethod
+import numpy as np
+from wordle.main import encode_feedback
+from wordle.patterns import pattern_table
+
+
+def branch_bot(helper):
+    """
+    Returns a copy of helper that can play on from the current game without
+    changing helper. Its sets and lists (the possible words and the rest of
+    its per-game state) are copied, while the word lists, tables and caches
+    are shared.
+    """
+    clone = copy.copy(helper)
+    for name, value in vars(helper).items():
+        if isinstance(value, (set, list)):
+            setattr(clone, name, copy.copy(value))
+    return clone
+
+
+def answers_left(game, dictionary) -> np.ndarray:
+    """
+    Returns the ids of the answers still consistent with the feedback of a
+    classic game
+    """
+    patterns = pattern_table(dictionary)
+    answers = np.arange(len(patterns.answers))
+    for guess, feedback in zip(game.guesses, game.feedback):
+        codes = patterns.codes("".join(guess), answers)
+        answers = answers[codes == encode_feedback(feedback)]
+    return answers
+
+
+def likeliest_codes(codes: np.ndarray, num_codes: int, win_code: int, n: int):
+    """
+    Returns up to n (probability, code) of the pattern codes in codes, the
+    most frequent first. The win code is left out if win_code is not None.
+    """
+    if len(codes) == 0:
+        return []
+    counts = np.bincount(codes, minlength=num_codes)
+    if win_code is not None:
+        counts[win_code] = 0
+    order = np.argsort(-counts, kind="stable")[:n]
+    return [(counts[c] / len(codes), int(c)) for c in order if counts[c] > 0]
+
+
+def most_likely(choices: list, n: int) -> list[tuple]:
+    """
+    Given the (probability, value) options of each position, most likely
+    first, or None for a position without options, returns up to n tuples
+    with a value per position (None where there are no options), the most
+    likely first. Positions are independent, so the tuples are enumerated
+    best first from the most likely option of each.
+    """
+    open_positions = [i for i, options in enumerate(choices) if options is not None]
+    if any(len(choices[i]) == 0 for i in open_positions):
+        return []
+
+    def probability(indices: tuple) -> float:
+        p = 1.0
+        for i, index in zip(open_positions, indices):
+            p *= choices[i][index][0]
+        return p
+
+    start = (0,) * len(open_positions)
+    heap = [(-probability(start), start)]
+    seen = {start}
+    result = []
+    while len(heap) > 0 and len(result) < n:
+        _, indices = heapq.heappop(heap)
+        values = [None] * len(choices)
+        for i, index in zip(open_positions, indices):
+            values[i] = choices[i][index][1]
+        result.append(tuple(values))
+        for j in range(len(indices)):
+            if indices[j] + 1 < len(choices[open_positions[j]]):
+                after = indices[:j] + (indices[j] + 1,) + indices[j + 1 :]
+                if after not in seen:
+                    seen.add(after)
+                    heapq.heappush(heap, (-probability(after), after))
+    return result
+
+
+class Speculator(ABC):
+    def __init__(self, helper, max_outcomes=64) -> None:
+        """
+        Works out the helper bot's next suggestion in a background thread
+        while the player types their guess. For each guess they are likely to
+        make (the bot's suggestions, best first) and each feedback it is
+        likely to get (most likely first), a copy of the bot (see branch_bot)
+        plays on from that outcome. Once the real guess and feedback are in,
+        result looks the suggestion up, and the copy that made it takes over
+        from the helper.
+
+        helper: the bot suggesting guesses, replaced by a copy after each hit
+        max_outcomes: the most feedbacks speculated on per guess
+        """
+        self.helper = helper
+        self.max_outcomes = max_outcomes
+
+        # results maps (guess, outcome) to the (copy of the helper,
+        # suggestion) speculated for it
+        self.results = {}
+
+        # turn is how many turns the game speculated on had been played, or
+        # None when nothing is speculated on
+        self.turn = None
+
+        self.thread = None
+        self.stopping = threading.Event()
+
+        # counters reported by __repr__
+        self.hits = 0
+        self.misses = 0
+        self.speculated = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"hits: {self.hits}, misses: {self.misses}, "
+            f"outcomes speculated on: {self.speculated}"
+        )
+
+    def start(self, game, guesses: list[str], after=None) -> None:
+        """
+        Stops any speculation still running and starts speculating on the
+        next turn of game, for guesses in order. after is a thread to wait for
+        first, such as a bot.anytime search still using the helper; guesses
+        can still be added to until it finishes.
+        """
+        self.stop()
+        self.results = {}
+        self.turn = self.turns(game)
+        self.stopping.clear()
+        # the speculation plays on from its own copy of game (sharing the
+        # word lists), so the game can move on while it finishes
+        game = copy.deepcopy(game, {id(game.dictionary): game.dictionary})
+        self.thread = threading.Thread(
+            target=self.run, args=(game, guesses, after), daemon=True
+        )
+        self.thread.start()
+
+    def run(self, game, guesses: list[str], after) -> None:
+        """
+        Speculates on each outcome of each guess until done or asked to stop.
+        Runs in the speculation thread.
+        """
+        if after is not None:
+            after.join()
+        try:
+            for guess in guesses:
+                for outcome in self.outcomes(game, guess):
+                    if self.stopping.is_set():
+                        return
+                    if (guess, outcome) in self.results:
+                        continue
+                    helper = branch_bot(self.helper)
+                    suggestion = self.suggestion(helper, game.branch(guess, outcome))
+                    self.results[(guess, outcome)] = (helper, suggestion)
+                    self.speculated += 1
+        except Exception:
+            # a failed speculation is only a miss: the suggestion is then
+            # worked out again, which shows the error
+            return
+
+    def result(self, game):
+        """
+        Returns the suggestion speculated on for the latest guess and feedback
+        of game, or None if there is none. On a hit, the copy of the helper
+        that made it becomes self.helper, and the speculation is left to stop
+        after the outcome it is on: the next start or stop waits for it. On a
+        miss, it is stopped first, so the helper is free to work out the
+        suggestion.
+        """
+        self.stopping.set()
+        entry = None
+        if self.turn is not None and self.turns(game) == self.turn + 1:
+            entry = self.results.get(self.outcome(game))
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        self.turn = None
+        if entry is None:
+            self.stop()
+            return None
+        self.helper = entry[0]
+        return entry[1]
+
+    def stop(self) -> None:
+        """
+        Asks the speculation to stop after the outcome it is on and waits for
+        it
+        """
+        if self.thread is not None:
+            self.stopping.set()
+            self.thread.join()
+            self.thread = None
+
+    def suggestion(self, helper, game):
+        """
+        Returns what helper suggests in game. By default its next guess.
+        """
+        return helper.generate_word(game)
+
+    @abstractmethod
+    def turns(self, game) -> int:
+        """
+        Returns the number of turns played in game
+        """
+        pass
+
+    @abstractmethod
+    def outcomes(self, game, guess: str) -> list:
+        """
+        Returns the feedbacks guess could get in game, most likely first, up
+        to self.max_outcomes, in the form the game's branch takes them.
+        Feedbacks that end the game are left out.
+        """
+        pass
+
+    @abstractmethod
+    def outcome(self, game) -> tuple:
+        """
+        Returns the (guess, outcome) of the latest turn of game
+        """
+        pass
+
+
+class ClassicSpeculator(Speculator):
+    def __init__(self, helper, suggestions=3, max_outcomes=64) -> None:
+        """
+        Speculates on the next suggestions of a bot.main bot in a
+        wordle.main game, as lists of suggestions (see
+        bot.main.BotInterface.suggest)
+        """
+        super().__init__(helper, max_outcomes)
+        self.suggestions = suggestions
+
+    def suggestion(self, helper, game):
+        return helper.suggest(game, self.suggestions)
+
+    def turns(self, game) -> int:
+        return len(game.guesses)
+
+    def outcomes(self, game, guess: str) -> list:
+        patterns = pattern_table(self.helper.dictionary)
+        codes = patterns.codes(guess, answers_left(game, self.helper.dictionary))
+        options = likeliest_codes(
+            codes, patterns.num_codes, patterns.win_code, self.max_outcomes
+        )
+        return [code for _, code in options]
+
+    def outcome(self, game) -> tuple:
+        return "".join(game.guesses[-1]), encode_feedback(game.feedback[-1])
+
+
+class MultiSpeculator(Speculator):
+    def __init__(self, helper, max_outcomes=64) -> None:
+        """
+        Speculates on the next guess of a bot.multi_bot bot in a
+        wordle.multi_wordle game. An outcome has a pattern code per board,
+        or None for boards already won, and the boards are taken to be
+        independent.
+        """
+        super().__init__(helper, max_outcomes)
+
+    def turns(self, game) -> int:
+        return game.xturn
+
+    def outcomes(self, game, guess: str) -> list:
+        patterns = pattern_table(self.helper.dictionary)
+        choices = []
+        for board in game.games:
+            if board.win:
+                choices.append(None)
+                continue
+            codes = patterns.codes(guess, answers_left(board, self.helper.dictionary))
+            choices.append(
+                likeliest_codes(codes, patterns.num_codes, None, self.max_outcomes)
+            )
+        return [
+            outcome
+            for outcome in most_likely(choices, self.max_outcomes)
+            if any(code not in (None, patterns.win_code) for code in outcome)
+        ]
+
+    def outcome(self, game) -> tuple:
+        # the boards played on last turn are the ones with a row per turn
+        played = [board for board in game.games if len(board.guesses) == game.xturn]
+        codes = tuple(
+            encode_feedback(board.feedback[-1]) if board in played else None
+            for board in game.games
+        )
+        return "".join(played[0].guesses[-1]), codes
@@ -0,0 +1,306 @@
+import argparse
+import os
+import time
+import numpy as np
+from wordle.words import ANSWERS_PATH, GUESSES_PATH, get_dictionary
+from wordle.patterns import pattern_table
+from wordle.shared import worker_pool
+
+# cost of a subtree that cannot finish within the depth limit
+INFINITY = float("inf")
+
+
+def tree_path(dictionary=None) -> str:
+    """
+    Returns the default file the strategy tree for dictionary (the default
+    word lists if None) is written to and read from
+    """
+    if dictionary is None:
+        dictionary = get_dictionary()
+    return dictionary.cache_path("tree", "npz")
+
+
+class DecisionTree:
+    def __init__(self, guesses: list[str], edges: dict) -> None:
+        """
+        A full Wordle strategy. Node 0 is the first guess, guesses[node] is the
+        word to guess at a node and edges[(node, code)] is the node to move to
+        after seeing the feedback with that pattern code.
+        """
+        self.guesses = guesses
+        self.edges = edges
+
+    def guess(self, node: int) -> str:
+        """
+        Returns the word to guess at node
+        """
+        return self.guesses[node]
+
+    def child(self, node: int, code: int):
+        """
+        Returns the node reached from node after the feedback code, or None if
+        the tree never sees that feedback there
+        """
+        return self.edges.get((node, code))
+
+    def save(self, path: str) -> None:
+        """
+        Writes the tree as four flat arrays: the guess at every node and the
+        (parent, code, child) triple of every edge
+        """
+        edges = sorted(self.edges.items())
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            guesses=np.array(self.guesses, dtype=str),
+            edge_parent=np.array([p for (p, _), _ in edges], dtype=np.int32),
+            edge_code=np.array([c for (_, c), _ in edges], dtype=np.int32),
+            edge_child=np.array([child for _, child in edges], dtype=np.int32),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "DecisionTree":
+        """
+        Reads a tree written by save
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"No strategy tree at {path}. Build one with `python -m bot.tree`."
+            )
+        with np.load(path) as data:
+            guesses = data["guesses"].tolist()
+            edges = dict(
+                zip(
+                    zip(data["edge_parent"].tolist(), data["edge_code"].tolist()),
+                    data["edge_child"].tolist(),
+                )
+            )
+        return cls(guesses, edges)
+
+
+class TreeSearch:
+    def __init__(self, width=10, max_depth=6, dictionary=None) -> None:
+        """
+        Depth-bounded search for the strategy minimizing the total number of
+        guesses needed over a set of answers (so the expected number of turns
+        is that total divided by the number of answers).
+
+        width: the number of guesses tried at each node, picked by the
+        expected number of answers left after them
+        max_depth: the most guesses any answer may need
+
+        A subtree is an (answer id, {code: subtree}) tuple and solved subtrees
+        are memoized on a hash of the bitset of their answers.
+        """
+        self.width = width
+        self.max_depth = max_depth
+        self.patterns = pattern_table(dictionary)
+        self.win_code = self.patterns.win_code
+        self.memo = {}
+
+    def lower_bound(self, size: int, depth: int) -> float:
+        """
+        The fewest guesses that size answers can need from depth on: one guess
+        can only be right for one of them, the rest need at least two
+        """
+        if size == 1:
+            return 1 if depth < self.max_depth else INFINITY
+        if depth + 1 >= self.max_depth:
+            return INFINITY
+        return 2 * size - 1
+
+    def candidate_guesses(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Returns the width most promising guesses for the answers ids, ranked
+        by the expected number of answers left (see MinimaxBotExpected). Ties
+        go to guesses that could be the answer.
+        """
+        guess_ids = np.arange(len(self.patterns.guesses))
+        if len(ids) <= 32:
+            # sum(c^2) over the partitions is the number of ordered pairs of
+            # answers with the same feedback, which is cheaper to count
+            # directly than to bincount for a handful of answers
+            codes = self.patterns.table[:, ids]
+            scores = (codes[:, :, None] == codes[:, None, :]).sum(axis=(1, 2))
+            scores -= (codes == self.win_code).sum(axis=1)
+        else:
+            counts = self.patterns.partition_sizes(guess_ids, ids)
+            counts[:, self.win_code] = 0
+            scores = (counts * counts).sum(axis=1)
+        is_candidate = np.zeros(len(guess_ids), dtype=bool)
+        is_candidate[ids] = True
+        order = np.lexsort((~is_candidate, scores))
+        return order[: self.width]
+
+    def partitions(self, guess: int, ids: np.ndarray) -> list:
+        """
+        Splits ids by their feedback to guess, as (code, ids) pairs with the
+        largest group first and the winning group left out
+        """
+        codes = self.patterns.table[guess, ids]
+        order = np.argsort(codes, kind="stable")
+        codes, ids = codes[order], ids[order]
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        groups = [
+            (int(codes[s]), part)
+            for s, part in zip(starts, np.split(ids, starts[1:]))
+            if codes[s] != self.win_code
+        ]
+        return sorted(groups, key=lambda group: -len(group[1]))
+
+    def solve(self, ids: np.ndarray, depth=0) -> tuple:
+        """
+        Returns (total guesses, subtree) for the best strategy found for the
+        answers ids when depth guesses have already been made
+        """
+        n = len(ids)
+        if n == 1:
+            if depth >= self.max_depth:
+                return INFINITY, None
+            return 1, (int(ids[0]), {})
+        if depth + 1 >= self.max_depth:
+            return INFINITY, None
+        if n == 2:
+            # guess one answer, then the other if that was wrong
+            code = int(self.patterns.table[ids[0], ids[1]])
+            return 3, (int(ids[0]), {code: (int(ids[1]), {})})
+
+        mask = np.zeros(len(self.patterns.answers), dtype=bool)
+        mask[ids] = True
+        key = (np.packbits(mask).tobytes(), depth)
+        if key in self.memo:
+            return self.memo[key]
+
+        best = (INFINITY, None)
+        for guess in self.candidate_guesses(ids):
+            groups = self.partitions(guess, ids)
+            if len(groups) == 1 and len(groups[0][1]) == n:
+                continue  # the guess tells us nothing
+
+            bounds = [self.lower_bound(len(part), depth + 1) for _, part in groups]
+            remaining = sum(bounds)
+            total = n
+            if total + remaining >= best[0]:
+                continue
+
+            children = {}
+            for (code, part), bound in zip(groups, bounds):
+                remaining -= bound
+                cost, subtree = self.solve(part, depth + 1)
+                total += cost
+                if total + remaining >= best[0]:
+                    break  # pruned: this guess cannot beat the best one
+                children[code] = subtree
+            else:
+                best = (total, (int(guess), children))
+
+        self.memo[key] = best
+        return best
+
+
+# the TreeSearch of a worker process, whose memo is shared by all of the
+# subtrees that worker solves
+_search = None
+
+
+def init_worker(width: int, max_depth: int, answers_path: str, guesses_path: str):
+    """
+    Creates the worker's TreeSearch
+    """
+    global _search
+    dictionary = get_dictionary(answers_path, guesses_path)
+    _search = TreeSearch(width, max_depth, dictionary)
+
+
+def solve_subtree(task) -> tuple:
+    """
+    Solves one subtree below the first guess in a worker process. task is
+    (first guess, feedback code, answer ids).
+    """
+    guess, code, ids = task
+    cost, subtree = _search.solve(ids, depth=1)
+    return guess, code, cost, subtree
+
+
+def build_tree(width=10, root_width=None, max_depth=6, processes=None, dictionary=None):
+    """
+    Searches for the best strategy over every answer of dictionary (the
+    default word lists if None). Each of the root_width best first guesses is
+    tried, and every subtree under them is solved in parallel in a pool of
+    worker processes.
+
+    Returns (expected turns, DecisionTree).
+    """
+    if dictionary is None:
+        dictionary = get_dictionary()
+    search = TreeSearch(
+        width if root_width is None else root_width, max_depth, dictionary
+    )
+    patterns = search.patterns
+    ids = np.arange(len(patterns.answers))
+
+    tasks = []
+    for guess in search.candidate_guesses(ids):
+        for code, part in search.partitions(guess, ids):
+            tasks.append((int(guess), code, part))
+
+    results = {}
+    with worker_pool(
+        processes,
+        dictionary,
+        initializer=init_worker,
+        initargs=(width, max_depth, dictionary.answers_path, dictionary.guesses_path),
+    ) as pool:
+        for guess, code, cost, subtree in pool.imap_unordered(solve_subtree, tasks):
+            root = results.setdefault(guess, [len(ids), {}])
+            root[0] += cost
+            root[1][code] = subtree
+
+    guess, (total, children) = min(results.items(), key=lambda item: item[1][0])
+    if total == INFINITY:
+        raise ValueError(f"No strategy finishes within {max_depth} guesses")
+
+    # flatten the nested subtrees into numbered nodes
+    guesses = []
+    edges = {}
+    to_visit = [(None, None, (guess, children))]
+    while len(to_visit) > 0:
+        parent, code, (answer, subtrees) = to_visit.pop()
+        node = len(guesses)
+        guesses.append(patterns.guesses[answer])
+        if parent is not None:
+            edges[(parent, code)] = node
+        for child_code, subtree in subtrees.items():
+            to_visit.append((node, child_code, subtree))
+
+    return total / len(ids), DecisionTree(guesses, edges)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=10)
+    parser.add_argument("--root-width", type=int, default=None)
+    parser.add_argument("--max-depth", type=int, default=6)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--answers", default=ANSWERS_PATH)
+    parser.add_argument("--guesses", default=GUESSES_PATH)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    dictionary = get_dictionary(args.answers, args.guesses)
+    if args.output is None:
+        args.output = tree_path(dictionary)
+
+    start = time.perf_counter()
+    expected_turns, tree = build_tree(
+        width=args.width,
+        root_width=args.root_width,
+        max_depth=args.max_depth,
+        processes=args.processes,
+        dictionary=dictionary,
+    )
+    tree.save(args.output)
+    print(f"expected turns: {round(expected_turns, 4)}")
+    print(f"first guess: {tree.guess(0)}")
+    print(f"nodes: {len(tree.guesses)}")
+    print(f"built in {round(time.perf_counter() - start, 1)}s, saved to {args.output}")
@@ -1,89 +1,208 @@
-import bot.main
-import bot.multi_bot
-import bot.quantum
-import wordle.main
-import wordle.multi_wordle
-import wordle.quantum
+import argparse
+import importlib
+import threading
+
+# Game modes and bots are only imported once they are picked, and NumPy and
+# the precomputed tables load in the background while the player reads the
+# menus, so the first prompt shows up right away.
+
+
+def in_background(target, *args) -> threading.Thread:
+    """
+    Runs target(*args) in a daemon thread and returns the thread
+    """
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def load(modules: list[str], word_lists: dict, tables=(), after=None) -> None:
+    """
+    Imports modules, then loads the dictionary of word_lists and the named
+    precomputed tables ("patterns" or "disjoint") from their caches. after is
+    an earlier loading thread to wait for first.
+    """
+    if after is not None:
+        after.join()
+    for module in modules:
+        importlib.import_module(module)
+    from wordle.words import get_dictionary
+
+    dictionary = get_dictionary(**word_lists)
+    if "patterns" in tables:
+        from wordle.patterns import pattern_table
+
+        pattern_table(dictionary)
+    if "disjoint" in tables:
+        from wordle.pairs import disjoint_index
+
+        disjoint_index(dictionary)
+
+
+def loaded_dictionary(loading: threading.Thread, word_lists: dict):
+    """
+    Waits for loading to finish and returns the dictionary it loaded
+    """
+    loading.join()
+    from wordle.words import get_dictionary
+
+    return get_dictionary(**word_lists)
+
+
+def warm_bot(bots: list, loading, word_lists: dict, module: str, name: str):
+    """
+    Once loading is done, builds the bot called name from module, warms it
+    up and appends it to bots
+    """
+    dictionary = loaded_dictionary(loading, word_lists)
+    helper_bot = getattr(importlib.import_module(module), name)(dictionary=dictionary)
+    helper_bot.warm_up()
+    bots.append(helper_bot)
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", default=None)
+    parser.add_argument("--guesses", default=None)
+    # seconds the helper bot may search each turn before suggesting its best
+    # guess so far, for the Wordle and Multi-Wordle helpers
+    parser.add_argument("--deadline", type=float, default=None)
+    # whether the Wordle and Multi-Wordle helpers work out their next
+    # suggestion while the player types, for the likely guesses and feedback
+    parser.add_argument("--no-speculation", action="store_true")
+    args = parser.parse_args()
+    word_lists = {}
+    if args.answers is not None:
+        word_lists["answers_path"] = args.answers
+    if args.guesses is not None:
+        word_lists["guesses_path"] = args.guesses
+    loading = in_background(load, ["wordle.main"], word_lists)
+
     print(
         """Welcome to Wordle Genius!
 
 [1] - Play a game of Wordle
 [2] - Play a game of Multi-Wordle
 [3] - Play a game of Quantum Wordle
+[4] - Play a game of Absurdle
 """
     )
     game = input("> ")
     match game:
         case "1":
-            print(
-                """Choose a bot to help you!
+            loading = in_background(
+                load, ["bot.main"], word_lists, ["patterns"], loading
+            )
+            dictionary = None
+            helper_bot = None
+            choosing = True
+            while choosing:
+                print(
+                    """Choose a bot to help you!
 [1] - SimpleBot
 [2] - MiddleBot (random)
 [3] - MiddleBot (term frequency)
 [4] - MiddleBot (genetic)
 [5] - HardBot
+[6] - MinimaxBot (worst case)
+[7] - MinimaxBot (expected)
+[8] - TreeBot (run `python -m bot.tree` first)
 """
-            )
-            bot_input = input("> ")
-            helper_bot = None
-            match bot_input:
-                case "1":
-                    helper_bot = bot.main.SimpleBot()
-                case "2":
-                    helper_bot = bot.main.MiddleBot()
-                case "3":
-                    helper_bot = bot.main.MiddleBotTf()
-                case "4":
-                    helper_bot = bot.main.MiddleBotGenetic()
-                case "5":
-                    print(
-                        "What type of metric would you like to use? \n"
-                        + "Green: number of green letters revealed \n"
-                        + "Yellow: number of yellow letters revealed \n"
-                        + "Aggregate: number of green or yellow letters revealed \n"
-                        + "Pool: size of remaining words without any previously-guessed letters"
-                    )
-                    metric = ""
-                    while metric not in ["green", "yellow", "aggregate", "pool"]:
-                        metric = input("> ").lower()
-                        if metric in ["green", "yellow", "aggregate"]:
-                            thresh = -1
-                            while thresh not in [0, 1, 2, 3, 4, 5]:
-                                print("Please choose a threshold: 0, 1, 2, 3, 4, 5")
-                                thresh = int(input("> "))
-                                if thresh not in [0, 1, 2, 3, 4, 5]:
-                                    print("You picked an invalid threshold")
-                        elif metric == "pool":
-                            thresh = -1
-                            while thresh not in [0, 10, 20, 30, 40, 50, 60, 70, 80, 90]:
-                                print(
-                                    "Please choose a threshold: 0, 10, 20, 30, 40, 50, 60, 70, 80, 90"
-                                )
-                                thresh = int(input("> "))
-                                if thresh not in [
-                                    0,
-                                    10,
-                                    20,
-                                    30,
-                                    40,
-                                    50,
-                                    60,
-                                    70,
-                                    80,
-                                    90,
-                                ]:
-                                    print("You picked an invalid threshold")
-                        else:
-                            print("You picked an invalid metric. Please pick again")
-
-                    helper_bot = bot.main.HardBot(metric, thresh)
-                case _:
-                    print("Invalid input.")
+                )
+                bot_input = input("> ")
+                if dictionary is None:
+                    dictionary = loaded_dictionary(loading, word_lists)
+                    import bot.main
+                    import wordle.main
+
+                choosing = False
+                match bot_input:
+                    case "1":
+                        helper_bot = bot.main.SimpleBot(dictionary=dictionary)
+                    case "2":
+                        helper_bot = bot.main.MiddleBot(dictionary=dictionary)
+                    case "3":
+                        helper_bot = bot.main.MiddleBotTf(dictionary=dictionary)
+                    case "4":
+                        helper_bot = bot.main.MiddleBotGenetic(dictionary=dictionary)
+                    case "5":
+                        print(
+                            "What type of metric would you like to use? \n"
+                            + "Green: number of green letters revealed \n"
+                            + "Yellow: number of yellow letters revealed \n"
+                            + "Aggregate: number of green or yellow letters revealed \n"
+                            + "Pool: size of remaining words without any previously-guessed letters"
+                        )
+                        metric = ""
+                        while metric not in ["green", "yellow", "aggregate", "pool"]:
+                            metric = input("> ").lower()
+                            if metric in ["green", "yellow", "aggregate"]:
+                                thresh = -1
+                                while thresh not in [0, 1, 2, 3, 4, 5]:
+                                    print("Please choose a threshold: 0, 1, 2, 3, 4, 5")
+                                    thresh = int(input("> "))
+                                    if thresh not in [0, 1, 2, 3, 4, 5]:
+                                        print("You picked an invalid threshold")
+                            elif metric == "pool":
+                                thresh = -1
+                                while thresh not in [0, 10, 20, 30, 40, 50, 60, 70, 80, 90]:
+                                    print(
+                                        "Please choose a threshold: 0, 10, 20, 30, 40, 50, 60, 70, 80, 90"
+                                    )
+                                    thresh = int(input("> "))
+                                    if thresh not in [
+                                        0,
+                                        10,
+                                        20,
+                                        30,
+                                        40,
+                                        50,
+                                        60,
+                                        70,
+                                        80,
+                                        90,
+                                    ]:
+                                        print("You picked an invalid threshold")
+                            else:
+                                print("You picked an invalid metric. Please pick again")
 
-            wordle.main.play(helper_bot=helper_bot)
+                        helper_bot = bot.main.HardBot(metric, thresh, dictionary=dictionary)
+                    case "6":
+                        helper_bot = bot.main.MinimaxBot(dictionary=dictionary)
+                    case "7":
+                        helper_bot = bot.main.MinimaxBotExpected(dictionary=dictionary)
+                    case "8":
+                        try:
+                            helper_bot = bot.main.TreeBot(dictionary=dictionary)
+                        except FileNotFoundError as error:
+                            # no tree was built for these word lists yet
+                            print(error)
+                            choosing = True
+                    case _:
+                        print("Invalid input.")
+
+            warming_up = None
+            if helper_bot:
+                warming_up = in_background(helper_bot.warm_up)
+            hard_mode = input("Play in hard mode? [y/n]\n> ").lower() == "y"
+            if helper_bot:
+                warming_up.join()
+                helper_bot.hard_mode = hard_mode
+            wordle.main.play(
+                helper_bot=helper_bot,
+                hard_mode=hard_mode,
+                dictionary=dictionary,
+                deadline=args.deadline,
+                speculate=not args.no_speculation,
+            )
         case "2":
+            loading = in_background(
+                load,
+                ["bot.multi_bot", "wordle.multi_wordle"],
+                word_lists,
+                (),
+                loading,
+            )
             num_games = 0
             while num_games <= 0:
                 num_games = int(
@@ -98,26 +217,76 @@ if __name__ == "__main__":
 """
             )
             bot_input = input("> ")
+            dictionary = loaded_dictionary(loading, word_lists)
+            import bot.multi_bot
+            import wordle.multi_wordle
+
             helper_bot = None
             match bot_input:
                 case "1":
-                    helper_bot = bot.multi_bot.NaiveBot()
+                    helper_bot = bot.multi_bot.NaiveBot(dictionary=dictionary)
                 case "2":
-                    helper_bot = bot.multi_bot.GreedyBot()
+                    helper_bot = bot.multi_bot.GreedyBot(dictionary=dictionary)
                     helper_bot.scores = [0] * num_games
                 case _:
                     print("Invalid input.")
 
             multi_wordle = wordle.multi_wordle.Multi_Wordle(
-                num_games=num_games
+                num_games=num_games, dictionary=dictionary
             )  # words=["blitz", "hello", "visit", "manga"])
             turn_limit = max(8, int(num_games) * 2.5)
             wordle.multi_wordle.play(
-                multi_wordle, max_turns=turn_limit, helper_bot=helper_bot
+                multi_wordle,
+                max_turns=turn_limit,
+                helper_bot=helper_bot,
+                deadline=args.deadline,
+                speculate=not args.no_speculation,
             )
         case "3":
-            print("You will be assisted by Quantum Bot!")
-            helper_bot = bot.quantum.QuantumBot()
-            wordle.quantum.play(helper_bot=helper_bot)
+            loading = in_background(
+                load, ["bot.quantum"], word_lists, ["disjoint"], loading
+            )
+            print(
+                """Choose a bot to help you!
+[1] - QuantumBot
+[2] - QuantumPairBot
+"""
+            )
+            bot_input = input("> ")
+            dictionary = loaded_dictionary(loading, word_lists)
+            import bot.quantum
+            import wordle.quantum
+
+            helper_bot = None
+            match bot_input:
+                case "1":
+                    helper_bot = bot.quantum.QuantumBot(dictionary=dictionary)
+                case "2":
+                    helper_bot = bot.quantum.QuantumPairBot(dictionary=dictionary)
+                case _:
+                    print("Invalid input.")
+            wordle.quantum.play(helper_bot=helper_bot, dictionary=dictionary)
+        case "4":
+            loading = in_background(
+                load,
+                ["bot.main", "wordle.absurdle"],
+                word_lists,
+                ["patterns"],
+                loading,
+            )
+            # the helper is built while the player answers, in case they want it
+            bots = []
+            warming_up = in_background(
+                warm_bot, bots, loading, word_lists, "bot.main", "MinimaxBot"
+            )
+            wants_helper = input("Would you like MinimaxBot to help you? [y/n]\n> ")
+            dictionary = loaded_dictionary(loading, word_lists)
+            import wordle.absurdle
+
+            helper_bot = None
+            if wants_helper == "y":
+                warming_up.join()
+                helper_bot = bots[0]
+            wordle.absurdle.play(helper_bot=helper_bot, dictionary=dictionary)
         case _:
             print("Invalid input.")
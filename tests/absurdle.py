@@ -0,0 +1,41 @@
+from bot.main import *
+from wordle.absurdle import *
+import time
+
+
+def feedback_throughput(num_guesses=2000) -> float:
+    """
+    Returns how many guesses per second AbsurdleGameState.attempt_guess
+    buckets against the full answer list
+    """
+    patterns = pattern_table()
+    guesses = random.sample(patterns.guesses, num_guesses)
+    start = time.perf_counter()
+    for guess in guesses:
+        game = AbsurdleGameState()
+        game.attempt_guess(guess)
+    return num_guesses / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print(f"Absurdle feedback: {round(feedback_throughput())} guesses/s\n")
+
+    # Absurdle never lets a bot win early, so every game shows the bot's
+    # worst case. Bots guessing at random are played several times.
+    max_turns = 20
+    bots = [
+        ("Middle Bot with random", MiddleBot(), 20),
+        ("Middle Bot with tf", MiddleBotTf(), 1),
+        ("Minimax Bot", MinimaxBot(), 1),
+        ("Minimax Bot (expected)", MinimaxBotExpected(), 1),
+    ]
+    for name, bot, num_games in bots:
+        turns = []
+        for _ in range(num_games):
+            game = bot.play_game(max_turns=max_turns, game=AbsurdleGameState())
+            turns.append(game.turn + 1 if game.win else None)
+        won = [t for t in turns if t is not None]
+        print(
+            f"{name}: won {len(won)} of {num_games} games, "
+            f"turns: best {min(won, default='-')}, worst {max(won, default='-')}"
+        )
@@ -0,0 +1,83 @@
+from bot.anytime import AnytimeSearch
+from bot.main import MiddleBotGenetic
+from bot.multi_bot import NaiveBot
+from wordle.main import GameState
+from wordle.multi_wordle import Multi_Wordle
+from wordle.words import get_dictionary
+import argparse
+import random
+import statistics
+import time
+
+
+def play(search: AnytimeSearch, game, typing: float, multi: bool) -> dict:
+    """
+    Plays game with the suggestions of search, taking typing seconds to type
+    each guess. A suggestion refined while typing is guessed instead of the
+    one shown. Returns the seconds each suggestion took and the guesses
+    refined.
+    """
+    refined = []
+    search.on_refined = lambda game, guess: refined.append(guess)
+    latencies = []
+    turns_refined = 0
+    while not game.is_finished(max_turns=search.helper.max_turns):
+        refined.clear()
+        start = time.perf_counter()
+        guess = search.best(game)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(typing)
+        search.stop()
+        if len(refined) > 0:
+            guess = refined[-1]
+            turns_refined += 1
+        if multi:
+            game.attempt_guess(guess, search.helper.max_turns)
+        else:
+            game.attempt_guess(guess)
+    return {"latencies": latencies, "refined": turns_refined, "win": game.win}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--deadlines", nargs="+", type=float, default=[0.005, 0.05, 1])
+    parser.add_argument("--typing", type=float, default=0.2)
+    parser.add_argument("--boards", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dictionary = get_dictionary()
+    answers = random.Random(args.seed).sample(dictionary.answers, args.games * args.boards)
+    lines = []
+    for mode in ("classic", "multi"):
+        for deadline in args.deadlines:
+            random.seed(args.seed)
+            results = []
+            for g in range(args.games):
+                if mode == "classic":
+                    helper = MiddleBotGenetic(dictionary=dictionary)
+                    game = GameState(answers[g], dictionary=dictionary)
+                else:
+                    helper = NaiveBot(dictionary=dictionary)
+                    helper.max_turns = args.boards + 6
+                    words = answers[g * args.boards : (g + 1) * args.boards]
+                    game = Multi_Wordle(
+                        num_games=args.boards, words=words, dictionary=dictionary
+                    )
+                search = AnytimeSearch(helper, deadline)
+                results.append(play(search, game, args.typing, mode == "multi"))
+            latencies = [t for result in results for t in result["latencies"]]
+            lines.append(
+                f"{mode} {'MiddleBotGenetic' if mode == 'classic' else 'NaiveBot'}, "
+                f"deadline {deadline}s, {args.typing}s to type: suggestion after "
+                f"median {round(statistics.median(latencies) * 1000, 1)}ms, "
+                f"max {round(max(latencies) * 1000, 1)}ms over {len(latencies)} turns, "
+                f"{sum(result['refined'] for result in results)} refined while typing, "
+                f"win rate {sum(result['win'] for result in results) / len(results)}"
+            )
+            print(lines[-1])
+
+    with open("data/anytime.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
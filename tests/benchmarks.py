@@ -0,0 +1,334 @@
+from bot.main import MiddleBot, MiddleBotTf, MiddleBotGenetic
+from bot.multi_bot import NaiveBot
+from bot.quantum import QuantumBot
+from wordle.lexicon import Lexicon
+from wordle.main import GameState
+from wordle.multi_wordle import Multi_Wordle
+from wordle.words import get_dictionary
+import wordle.quantum
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+# candidate set sizes every benchmark runs at: about every guess, every
+# answer, a mid-game pool and an endgame pool. A benchmark of size n works
+# on the first n guesses of the dictionary (the answers come first).
+SIZES = [12970, 2314, 200, 10]
+
+# the machine-readable results the suite is compared with
+BASELINE_PATH = "data/benchmarks.json"
+
+# the answer and guess every benchmark game is played with. "stair" against
+# "spine" gets a green, a yellow and three grays, so filters have every kind
+# of feedback to check.
+ANSWER = "spine"
+GUESS = "stair"
+
+# BENCHMARKS maps a name to a function of (size, dictionary) returning
+# (setup, run): setup prepares fresh state and is not timed, run is the
+# operation that is timed
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """
+    Adds the decorated function to BENCHMARKS under name
+    """
+
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+@benchmark("GameState.attempt_guess")
+def score_feedback(size: int, dictionary):
+    """
+    Scores GUESS against size answers, one game each
+    """
+    games = []
+
+    def setup():
+        games[:] = [
+            GameState(word, dictionary=dictionary)
+            for word in dictionary.guesses[:size]
+        ]
+
+    def run():
+        for game in games:
+            game.attempt_guess(GUESS)
+
+    return setup, run
+
+
+@benchmark("MiddleBot.filter")
+def filter_middle(size: int, dictionary):
+    """
+    Filters size possible words with the feedback of one guess
+    """
+    helper = MiddleBot(dictionary=dictionary)
+    game = GameState(ANSWER, dictionary=dictionary)
+    game.attempt_guess(GUESS)
+    words = set(dictionary.guesses[:size])
+
+    def setup():
+        helper.possible_words = words
+
+    return setup, lambda: helper.filter(game)
+
+
+@benchmark("multi_bot.BotInterface.filter")
+def filter_multi(size: int, dictionary):
+    """
+    Filters size words with the feedback of one guess on the first board
+    """
+    helper = NaiveBot(dictionary=dictionary)
+    game = Multi_Wordle(words=[ANSWER, "crane"], dictionary=dictionary)
+    game.attempt_guess(GUESS, 8)
+    words = dictionary.guesses[:size]
+    # the multi-board filter always starts over from all_words
+    helper.all_words = lambda: set(words)
+    return lambda: None, lambda: helper.filter(game)
+
+
+@benchmark("QuantumBot.filter")
+def filter_quantum(size: int, dictionary):
+    """
+    Filters size possible words with the feedback of one quantum guess
+    """
+    helper = QuantumBot(dictionary=dictionary)
+    game = wordle.quantum.GameState(ANSWER, "could", dictionary=dictionary)
+    game.attempt_guess(GUESS)
+    words = set(dictionary.guesses[:size])
+
+    def setup():
+        helper.possible_words = words
+
+    return setup, lambda: helper.filter(game)
+
+
+@benchmark("BotInterface.score_words_with_tf")
+def score_tf(size: int, dictionary):
+    """
+    Scores size possible words by letter frequency, bypassing the guess cache
+    and the memoized mask and scoring
+    """
+    helper = MiddleBotTf(dictionary=dictionary)
+    helper.possible_words = set(dictionary.guesses[:size])
+    # the first scoring also sorts the dictionary for tie breaking, which
+    # is done once per bot and not timed
+    helper.score_words_with_tf()
+
+    def setup():
+        helper.possible_words_mask = None
+        helper.tf_scoring = None
+
+    return setup, helper.score_words_with_tf
+
+
+@benchmark("BotInterface.generate_word_with_genetic")
+def genetic_fitness(size: int, dictionary):
+    """
+    Evolves a population of size words against two guesses. The population
+    is sampled from a set, so runs only evolve the same words when
+    PYTHONHASHSEED is set.
+    """
+    helper = MiddleBotGenetic(dictionary=dictionary)
+    game = GameState(ANSWER, dictionary=dictionary)
+    game.attempt_guess(GUESS)
+    game.attempt_guess("clone")
+    helper.possible_words = set(dictionary.guesses[:size])
+
+    def setup():
+        random.seed(0)
+
+    return setup, lambda: helper.generate_word_with_genetic(game, n=size)
+
+
+@benchmark("Lexicon.words")
+def load_lexicon(size: int, dictionary):
+    """
+    Maps the lexicon file and decodes its first size words
+    """
+    path = dictionary.lexicon.path
+    return lambda: None, lambda: Lexicon(path).words(0, size)
+
+
+@benchmark("Multi_Wordle.attempt_guess")
+def apply_multi_guess(size: int, dictionary):
+    """
+    Applies one guess to a game of size boards
+    """
+    games = []
+
+    def setup():
+        games[:] = [
+            Multi_Wordle(
+                num_games=size,
+                words=dictionary.guesses[:size],
+                dictionary=dictionary,
+            )
+        ]
+
+    return setup, lambda: games[0].attempt_guess(GUESS, 8)
+
+
+def reference_work() -> None:
+    """
+    A fixed piece of pure Python set and string work, like the kernels do.
+    Every sample is divided by its time, which cancels out the machine
+    getting faster or slower between runs.
+    """
+    letters = set()
+    for i in range(500):
+        letters |= {(j, letter) for j, letter in enumerate(f"w{i:04d}")}
+
+
+def sample_time(setup, run, number: int) -> float:
+    """
+    Returns the mean time of number runs of run, each after an untimed setup
+    """
+    total = 0.0
+    for _ in range(number):
+        setup()
+        start = time.perf_counter()
+        run()
+        total += time.perf_counter() - start
+    return total / number
+
+
+def measure(setup, run, repeat: int, warmup: int, min_time=0.005) -> dict:
+    """
+    Runs setup and run warmup times untimed, then takes repeat samples of
+    run and returns statistics of the time of one run, in seconds, and of
+    its time relative to reference_work.
+
+    Fast operations are run several times per sample, enough for a sample
+    to take min_time, so timer noise averages out. setup runs before every
+    run but is not timed.
+    """
+    start = time.perf_counter()
+    for _ in range(warmup):
+        setup()
+        run()
+    number = 1
+    if warmup > 0:
+        per_run = (time.perf_counter() - start) / warmup
+        number = max(1, min(1000, int(min_time / max(per_run, 1e-9))))
+
+    times = []
+    relative = []
+    for _ in range(repeat):
+        times.append(sample_time(setup, run, number))
+        reference = sample_time(lambda: None, reference_work, 5)
+        relative.append(times[-1] / reference)
+    quartiles = statistics.quantiles(times, n=4) if len(times) > 1 else times * 3
+    return {
+        "runs": repeat * number,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "iqr": quartiles[2] - quartiles[0],
+        "relative": statistics.median(relative),
+    }
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Returns a line per benchmark whose time relative to reference_work got
+    more than tolerance slower than in baseline. Relative times can be
+    compared between runs on a busy machine, where raw times can not.
+    """
+    lines = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        old = baseline[key]
+        ratio = result["relative"] / old["relative"]
+        if ratio > 1 + tolerance:
+            lines.append(
+                f"REGRESSION {key}: x{round(ratio, 2)} relative to the reference "
+                f"(median {format_time(old['median'])} -> "
+                f"{format_time(result['median'])})"
+            )
+    return lines
+
+
+def format_time(seconds: float) -> str:
+    """
+    Returns seconds in the most readable unit
+    """
+    if seconds >= 1:
+        return f"{seconds:.3f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true")
+    args = parser.parse_args()
+
+    dictionary = get_dictionary()
+    results = {}
+    lines = []
+    for name in args.benchmarks or list(BENCHMARKS):
+        for size in args.sizes:
+            setup, run = BENCHMARKS[name](size, dictionary)
+            result = measure(setup, run, args.repeat, args.warmup)
+            key = f"{name}/{size}"
+            results[key] = result
+            lines.append(
+                f"{key}: median {format_time(result['median'])}, "
+                f"min {format_time(result['min'])}, "
+                f"mean {format_time(result['mean'])} "
+                f"± {format_time(result['stdev'])}, "
+                f"iqr {format_time(result['iqr'])} over {result['runs']} runs, "
+                f"{round(result['relative'], 3)} x reference"
+            )
+            print(lines[-1])
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    failed = regressions(results, baseline, args.tolerance)
+    lines += failed
+
+    if args.update:
+        # keep the baseline of benchmarks that were not run this time
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {
+                    "machine": platform.machine(),
+                    "python": platform.python_version(),
+                    "results": baseline,
+                },
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+        print(f"baseline written to {args.baseline}")
+
+    with open("data/benchmarks.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
+
+    if len(failed) > 0 and not args.update:
+        print("\n".join(failed), file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,60 @@
+from bot.main import *
+from collections import Counter
+import argparse
+import time
+
+
+def sweep(bot, words, max_turns=6) -> tuple[float, Counter, Counter]:
+    """
+    Plays one game per word and returns the seconds taken and the guess cache
+    hits and lookups made on each turn
+    """
+    hits, lookups = Counter(), Counter()
+    generate_word = bot.generate_word
+
+    def counted_generate_word(game):
+        before = (bot.guess_cache.hits, bot.guess_cache.misses)
+        guess = generate_word(game)
+        hits[game.turn] += bot.guess_cache.hits - before[0]
+        lookups[game.turn] += (
+            bot.guess_cache.hits + bot.guess_cache.misses - sum(before)
+        )
+        return guess
+
+    bot.generate_word = counted_generate_word
+    start = time.perf_counter()
+    bot.play_games(len(words), max_turns=max_turns, words=words)
+    return time.perf_counter() - start, hits, lookups
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", type=int, default=None)
+    parser.add_argument("--max-entries", type=int, default=4096)
+    args = parser.parse_args()
+
+    bots = [
+        ("Middle Bot with tf", MiddleBotTf),
+        ("Minimax Bot (expected)", MinimaxBotExpected),
+        ("Minimax Bot (expected, hard mode)", lambda: MinimaxBotExpected(hard_mode=True)),
+    ]
+    words = get_dictionary().answers[: args.answers]
+    for name, make_bot in bots:
+        uncached = make_bot()
+        uncached.guess_cache = GuessCache(max_entries=0)
+        uncached_seconds, _, _ = sweep(uncached, words)
+
+        cached = make_bot()
+        cached.guess_cache = GuessCache(max_entries=args.max_entries)
+        cached_seconds, hits, lookups = sweep(cached, words)
+
+        print(f"{name} over {len(words)} answers:")
+        print(f"uncached: {round(uncached_seconds, 2)}s")
+        print(f"cached: {round(cached_seconds, 2)}s ({cached.guess_cache})")
+        for turn in sorted(lookups):
+            if lookups[turn] > 0:
+                print(
+                    f"turn {turn + 1}: {hits[turn]}/{lookups[turn]} hits "
+                    f"({round(hits[turn] / lookups[turn], 3)})"
+                )
+        print()
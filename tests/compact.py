@@ -0,0 +1,65 @@
+from bot.main import *
+from wordle.main import CompactGameState
+import argparse
+import time
+import tracemalloc
+
+
+def replay(games: list, game_state) -> tuple[list, int]:
+    """
+    Plays the guesses of games again with games of class game_state. Returns
+    the new games and the bytes they take up.
+    """
+    tracemalloc.start()
+    replayed = []
+    for game in games:
+        new_game = game_state(game.word, dictionary=game.dictionary)
+        for guess in game.guesses:
+            new_game.attempt_guess("".join(guess))
+        replayed.append(new_game)
+    game_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return replayed, game_bytes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", type=int, default=None)
+    args = parser.parse_args()
+
+    words = get_dictionary().answers[: args.answers]
+    lines = []
+    for name, make_bot in [
+        ("Simple Bot", SimpleBot),
+        ("Minimax Bot (expected)", MinimaxBotExpected),
+    ]:
+        seconds = {}
+        for game_state in (GameState, CompactGameState):
+            bot = make_bot()
+            bot.game_state = game_state
+            start = time.perf_counter()
+            random.seed(0)
+            bot.play_games(len(words), words=words)
+            seconds[game_state] = time.perf_counter() - start
+            # the bots must play the same games whichever class they are given
+            if game_state is GameState:
+                games = bot.games
+            else:
+                same = [repr(game) for game in games] == [
+                    repr(game) for game in bot.games
+                ]
+
+        _, game_bytes = replay(games, GameState)
+        _, compact_bytes = replay(games, CompactGameState)
+        lines.append(
+            f"{name} over {len(words)} games: GameState "
+            f"{round(game_bytes / len(words))} bytes/game, played in "
+            f"{round(seconds[GameState], 2)}s; CompactGameState "
+            f"{round(compact_bytes / len(words))} bytes/game, played in "
+            f"{round(seconds[CompactGameState], 2)}s; same games: {same}"
+        )
+        print(lines[-1])
+
+    with open("data/compact.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
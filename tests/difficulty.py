@@ -0,0 +1,71 @@
+from bot.difficulty import *
+import argparse
+import time
+
+
+def same_table(first: dict, second: dict) -> bool:
+    """
+    Returns whether two difficulty tables hold the same rows
+    """
+    return all(
+        np.array_equal(first[name], second[name], equal_nan=name == "remaining")
+        for name in COLUMNS
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", type=int, default=200)
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    dictionary = get_dictionary()
+    answer_ids = np.arange(args.answers)
+    lines = []
+
+    # the lockstep simulator must profile deterministic bots like play_game
+    lockstep = play_lockstep("MinimaxBotExpected", answer_ids, 6, dictionary)
+    one_by_one = profile_chunk(
+        (
+            "MinimaxBotExpected",
+            answer_ids.tolist(),
+            [0],
+            6,
+            dictionary.answers_path,
+            dictionary.guesses_path,
+        )
+    )
+    same = all(np.array_equal(lockstep[name], one_by_one[name]) for name in lockstep)
+    lines.append(f"lockstep and play_game profiles match: {same}")
+
+    # seeded games must not depend on how they are split across workers
+    bots = ["SimpleBot", "MiddleBot", "MinimaxBotExpected"]
+    start = time.perf_counter()
+    table = profile(bots, args.seeds, answer_ids=answer_ids, chunk_size=50)
+    seconds = time.perf_counter() - start
+    resplit = profile(bots, args.seeds, answer_ids=answer_ids, chunk_size=17)
+    lines.append(
+        f"{args.answers} answers x {args.seeds} seeds x {len(bots)} bots profiled "
+        f"in {round(seconds, 2)}s, same table when split differently: "
+        f"{same_table(table, resplit)}"
+    )
+
+    path = "cache/test-difficulty"
+    save_table(path, table)
+    loaded = load_table(path)
+    lines.append(f"saved and memory-mapped table matches: {same_table(table, loaded)}")
+    for bot_name in bots:
+        rows = hardest(loaded, bot_name, args.top)
+        words = [
+            f"{dictionary.answers[loaded['answer'][row]]} "
+            f"({round(float(loaded['mean_turns'][row]), 2)})"
+            for row in rows
+        ]
+        lines.append(f"{bot_name} hardest: {', '.join(words)}")
+
+    for line in lines:
+        print(line)
+    with open("data/difficulty.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
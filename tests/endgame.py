@@ -0,0 +1,74 @@
+from bot.main import *
+import bot.multi_bot
+import argparse
+import time
+
+
+def play(make_bot, endgame: bool, play_games, seed=0):
+    """
+    Plays the games with a new bot, with or without its endgame solver, and
+    returns the bot and the seconds taken
+    """
+    bot = make_bot()
+    if not endgame:
+        bot.endgame = None
+    random.seed(seed)
+    start = time.perf_counter()
+    play_games(bot)
+    return bot, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=300)
+    args = parser.parse_args()
+
+    dictionary = get_dictionary()
+    random.seed(0)
+    words = random.sample(dictionary.answers, args.games)
+    # the "-atch" family, where picking at random often runs out of turns
+    atch = [word for word in dictionary.answers if word.endswith("atch")]
+    multi_words = [random.sample(dictionary.answers, 2) for _ in range(args.games)]
+
+    bots = [
+        ("Middle Bot", MiddleBot, lambda b: b.play_games(len(words), words=words)),
+        (
+            "Middle Bot (-atch x 20)",
+            MiddleBot,
+            lambda b: b.play_games(len(atch) * 20, words=atch * 20),
+        ),
+        (
+            "Hard Bot (green 3)",
+            lambda: HardBot("green", 3),
+            lambda b: b.play_games(len(words), words=words),
+        ),
+        (
+            "Naive Bot (2 boards)",
+            bot.multi_bot.NaiveBot,
+            lambda b: b.play_games(len(multi_words), max_turns=8, words=multi_words),
+        ),
+        (
+            "Greedy Bot (2 boards)",
+            bot.multi_bot.GreedyBot,
+            lambda b: b.play_games(len(multi_words), max_turns=8, words=multi_words),
+        ),
+    ]
+    lines = []
+    for name, make_bot, play_games in bots:
+        for endgame in (False, True):
+            helper, seconds = play(make_bot, endgame, play_games)
+            win_rate = helper.games_won / len(helper.games)
+            avg_turns = helper.total_turns_won / max(helper.games_won, 1)
+            lines.append(
+                f"{name}, endgame {'on' if endgame else 'off'}: "
+                f"win rate {round(win_rate, 4)}, avg turns to win "
+                f"{round(avg_turns, 3)} over {len(helper.games)} games "
+                f"({round(seconds, 2)}s)"
+            )
+            print(lines[-1])
+    lines.append(f"endgame solver: {endgame_solver(dictionary)}")
+    print(lines[-1])
+
+    with open("data/endgame.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
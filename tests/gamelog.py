@@ -0,0 +1,75 @@
+from bot.main import *
+from bot.lockstep import LockstepSimulator
+from wordle.gamelog import verify, read_records
+import argparse
+import os
+import time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=1000000)
+    parser.add_argument("--path", default="cache/test-games.wlog")
+    args = parser.parse_args()
+
+    if os.path.exists(args.path):
+        os.remove(args.path)
+    dictionary = get_dictionary()
+
+    # games played one by one and by the lockstep simulator go to one log
+    bot = MiddleBotTf()
+    bot.log_games(args.path)
+    bot.play_games(200, words=dictionary.answers[:200])
+    simulator = LockstepSimulator("MinimaxBotExpected")
+    answers = np.random.default_rng(0).integers(
+        len(dictionary.answers), size=args.games
+    )
+    start = time.perf_counter()
+    bot.game_log.append_results(simulator.run(answers))
+    bot.game_log.flush()
+    written = time.perf_counter() - start
+
+    header, records = read_records(args.path)
+    lines = [
+        f"{len(records)} games logged in {os.path.getsize(args.path)} bytes "
+        f"({header['dtype'].itemsize} bytes/game, {round(written, 2)}s to play "
+        f"and write)"
+    ]
+    for duplicates in (False, True):
+        start = time.perf_counter()
+        stats = verify(args.path, dictionary, duplicates)
+        seconds = time.perf_counter() - start
+        rule = "standard rule" if duplicates else "game rule"
+        lines.append(
+            f"{rule}: verified in {round(seconds, 2)}s "
+            f"({round(stats['games'] / seconds)} games/s), "
+            f"mismatched games: {stats['mismatched games']}, "
+            f"invalid records: {stats['invalid records']}, wins: {stats['wins']}"
+        )
+
+    # a log opened for a longer turn limit takes games of that limit, and a
+    # log with too few turns refuses them before they are played
+    os.remove(args.path)
+    bot = SimpleBot()
+    bot.log_games(args.path, max_turns=10)
+    bot.play_games(30, max_turns=10, words=dictionary.answers[:30])
+    header, records = read_records(args.path)
+    refused = False
+    os.remove(args.path)
+    bot.log_games(args.path)
+    try:
+        bot.play_games(30, max_turns=10, words=dictionary.answers[:30])
+    except ValueError:
+        refused = len(bot.games) == 30
+    lines.append(
+        f"max_turns 10: {len(records)} games logged with room for "
+        f"{header['max_turns']} turns, refused by a 6 turn log: {refused}"
+    )
+
+    for line in lines:
+        print(line)
+    os.remove(args.path)
+
+    with open("data/gamelog.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
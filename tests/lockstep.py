@@ -0,0 +1,46 @@
+from bot.main import *
+from bot.lockstep import LOCKSTEP_BOTS, LockstepSimulator
+import argparse
+import time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", type=int, default=500)
+    parser.add_argument("--games", type=int, default=100000)
+    args = parser.parse_args()
+
+    dictionary = get_dictionary()
+    words = dictionary.answers[: args.answers]
+    answers = np.random.default_rng(0).integers(
+        len(dictionary.answers), size=args.games
+    )
+    lines = []
+    for name, make_bot in LOCKSTEP_BOTS.items():
+        # the simulator must play the same games as play_games
+        bot = make_bot()
+        start = time.perf_counter()
+        bot.play_games(len(words), words=words)
+        one_by_one = time.perf_counter() - start
+        results = LockstepSimulator(name).run(np.arange(len(words)))
+        same = all(
+            ["".join(guess) for guess in game.guesses]
+            == [dictionary.guesses[i] for i in row if i >= 0]
+            for game, row in zip(bot.games, results["history"])
+        )
+
+        simulator = LockstepSimulator(name)
+        start = time.perf_counter()
+        results = simulator.run(answers)
+        seconds = time.perf_counter() - start
+        lines.append(
+            f"{name}: play_games {round(len(words) / one_by_one * 60)} games/min, "
+            f"lockstep {round(args.games / seconds * 60)} games/min over "
+            f"{args.games} games (win rate {round(results['wins'].mean(), 4)}, "
+            f"{simulator}), same games: {same}"
+        )
+        print(lines[-1])
+
+    with open("data/lockstep.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
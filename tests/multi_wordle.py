@@ -1,5 +1,11 @@
 from bot.multi_bot import *
 from wordle.multi_wordle import *
+from wordle.shared import worker_pool
+from wordle.words import get_dictionary
+import argparse
+import math
+import time
+import tracemalloc
 
 
 def generate_word(num_words) -> list:
@@ -35,28 +41,244 @@ def generate_answers_list(num_instances, games_per_instance) -> list:
     return lst
 
 
+# BENCHMARK MODE
+
+
+def multi_bots() -> dict:
+    """
+    Returns every concrete multi-bot in bot.multi_bot keyed by class name, so
+    new bots are picked up by the benchmark without registering them here
+    """
+    bots = {}
+    to_visit = list(BotInterface.__subclasses__())
+    while len(to_visit) > 0:
+        cls = to_visit.pop()
+        bots[cls.__name__] = cls
+        to_visit.extend(cls.__subclasses__())
+    return bots
+
+
+def benchmark_instance(task) -> dict:
+    """
+    Plays a single Multi_Wordle instance in a worker process and returns its
+    measurements. task is (bot name, board count, max turns, answers,
+    trace_memory). Memory is only traced when asked to, since tracemalloc slows
+    down every allocation and would skew the latency numbers.
+    """
+    bot_name, num_boards, max_turns, words, trace_memory = task
+    bot = multi_bots()[bot_name]()
+
+    # time every guess the bot makes without changing how the bot plays
+    guess_times = []
+    generate_word = bot.generate_word
+
+    def timed_generate_word(game):
+        start = time.perf_counter()
+        guess = generate_word(game)
+        guess_times.append(time.perf_counter() - start)
+        return guess
+
+    bot.generate_word = timed_generate_word
+
+    if trace_memory:
+        tracemalloc.start()
+    game = bot.play_game(max_turns=max_turns, num_games=num_boards, words=words)
+    peak_memory = 0
+    if trace_memory:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "bot": bot_name,
+        "boards": num_boards,
+        "max_turns": max_turns,
+        "win": game.win,
+        "turns": game.xturn,
+        "guesses": len(guess_times),
+        "guess_time": sum(guess_times),
+        "peak_memory": peak_memory,
+        "traced": trace_memory,
+    }
+
+
+def turn_limits(boards, turns_per_board) -> list:
+    """
+    The distinct turn limits for n boards, max(8, n * factor) per factor.
+    Small board counts hit the floor of 8 for several factors, which would
+    otherwise play and report the same combination more than once.
+    """
+    return sorted({max(8, int(boards * factor)) for factor in turns_per_board})
+
+
+def benchmark(
+    bot_names,
+    board_counts=(1, 2, 4, 8, 16, 32, 64),
+    turns_per_board=(1.5, 2.5, 4),
+    num_instances=10,
+    processes=None,
+    seed=0,
+) -> list:
+    """
+    Sweeps every combination of bot, board count and turn limit, playing
+    num_instances games each across a pool of worker processes. The turn limit
+    for n boards is max(8, n * turns_per_board), the same rule main.py uses.
+
+    Every bot plays the same seeded answers for a given board count so the
+    bots are compared on identical games. Returns one summary dict per
+    combination.
+    """
+    rng = random.Random(seed)
+    all_answers = get_dictionary().answers
+    answers = {
+        boards: [rng.sample(all_answers, boards) for _ in range(num_instances)]
+        for boards in board_counts
+    }
+
+    tasks = []
+    for bot_name in bot_names:
+        for boards in board_counts:
+            for max_turns in turn_limits(boards, turns_per_board):
+                for i in range(num_instances):
+                    # trace one extra instance per combination for memory
+                    tasks.append(
+                        (bot_name, boards, max_turns, answers[boards][i], False)
+                    )
+                tasks.append((bot_name, boards, max_turns, answers[boards][0], True))
+
+    with worker_pool(processes, tables=()) as pool:
+        results = pool.map(benchmark_instance, tasks, chunksize=1)
+
+    summaries = []
+    for bot_name in bot_names:
+        for boards in board_counts:
+            for max_turns in turn_limits(boards, turns_per_board):
+                runs = [
+                    r
+                    for r in results
+                    if r["bot"] == bot_name
+                    and r["boards"] == boards
+                    and r["max_turns"] == max_turns
+                ]
+                timed = [r for r in runs if not r["traced"]]
+                traced = [r for r in runs if r["traced"]]
+                wins = [r for r in timed if r["win"]]
+                guesses = sum(r["guesses"] for r in timed)
+                summaries.append(
+                    {
+                        "bot": bot_name,
+                        "boards": boards,
+                        "max_turns": max_turns,
+                        "games": len(timed),
+                        "win_rate": len(wins) / len(timed),
+                        "avg_turns": sum(r["turns"] for r in timed) / len(timed),
+                        "turn_cost": sum(r["guess_time"] for r in timed)
+                        / max(guesses, 1),
+                        "memory_per_board": traced[0]["peak_memory"] / boards,
+                    }
+                )
+    return summaries
+
+
+def scaling_exponents(summaries, bot_name, turn_limit_index=0) -> list:
+    """
+    For consecutive board counts n1 < n2 of one bot, returns the exponent k in
+    turn_cost ~ boards^k. k <= 1 is fine; k > 1 means the per-turn cost grows
+    faster than the number of boards.
+    """
+    rows = [s for s in summaries if s["bot"] == bot_name]
+    # keep one turn limit per board count so the curve is not zig-zagging
+    by_boards = {}
+    for s in rows:
+        by_boards.setdefault(s["boards"], []).append(s)
+    curve = [
+        (boards, by_boards[boards][turn_limit_index]["turn_cost"])
+        for boards in sorted(by_boards)
+    ]
+
+    exponents = []
+    for (n1, c1), (n2, c2) in zip(curve, curve[1:]):
+        if c1 <= 0 or c2 <= 0:
+            continue
+        exponents.append((n1, n2, math.log(c2 / c1) / math.log(n2 / n1)))
+    return exponents
+
+
+def print_benchmark(summaries, tolerance=0.25) -> None:
+    """
+    Prints the benchmark table followed by the scaling curve for each bot,
+    flagging super-linear growth of per-turn cost with the board count
+    """
+    print(
+        f"{'bot':<12}{'boards':>7}{'turns':>7}{'games':>7}{'win rate':>10}"
+        f"{'avg turns':>11}{'ms/guess':>10}{'KiB/board':>11}"
+    )
+    for s in summaries:
+        print(
+            f"{s['bot']:<12}{s['boards']:>7}{s['max_turns']:>7}{s['games']:>7}"
+            f"{s['win_rate']:>10.2f}{s['avg_turns']:>11.2f}"
+            f"{s['turn_cost'] * 1000:>10.2f}{s['memory_per_board'] / 1024:>11.1f}"
+        )
+
+    print()
+    for bot_name in dict.fromkeys(s["bot"] for s in summaries):
+        print(f"{bot_name} per-turn cost scaling (cost ~ boards^k):")
+        for n1, n2, k in scaling_exponents(summaries, bot_name):
+            warning = "  <-- super-linear" if k > 1 + tolerance else ""
+            print(f"  {n1:>3} -> {n2:<3} k = {k:.2f}{warning}")
+
+
 if __name__ == "__main__":
-    num_instances = 100
-    games_per_instance = 4
-
-    max_turn = 10
-    words_list = generate_answers_list(num_instances, games_per_instance)
-
-    nb = NaiveBot()
-    nb.play_games(
-        num_instances,
-        max_turns=max_turn,
-        num_games=games_per_instance,
-        words=words_list,
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="sweep board counts and turn limits instead of the default run",
+    )
+    parser.add_argument("--bots", nargs="+", default=None)
+    parser.add_argument(
+        "--boards", nargs="+", type=int, default=[1, 2, 4, 8, 16, 32, 64]
     )
-    print("NaiveBot")
-    print(nb)
-    gb = GreedyBot()
-    gb.play_games(
-        num_instances,
-        max_turns=max_turn,
-        num_games=games_per_instance,
-        words=words_list,
+    parser.add_argument(
+        "--turns-per-board", nargs="+", type=float, default=[1.5, 2.5, 4]
     )
-    print("GreedyBot:")
-    print(gb)
+    parser.add_argument("--instances", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        bot_names = args.bots or list(multi_bots())
+        summaries = benchmark(
+            bot_names,
+            board_counts=args.boards,
+            turns_per_board=args.turns_per_board,
+            num_instances=args.instances,
+            processes=args.processes,
+            seed=args.seed,
+        )
+        print_benchmark(summaries)
+    else:
+        num_instances = 100
+        games_per_instance = 4
+
+        max_turn = 10
+        words_list = generate_answers_list(num_instances, games_per_instance)
+
+        nb = NaiveBot()
+        nb.play_games(
+            num_instances,
+            max_turns=max_turn,
+            num_games=games_per_instance,
+            words=words_list,
+        )
+        print("NaiveBot")
+        print(nb)
+        gb = GreedyBot()
+        gb.play_games(
+            num_instances,
+            max_turns=max_turn,
+            num_games=games_per_instance,
+            words=words_list,
+        )
+        print("GreedyBot:")
+        print(gb)
@@ -0,0 +1,312 @@
+import bot.main
+import bot.multi_bot
+import bot.quantum
+from bot.endgame import EndgameSolver
+from wordle.multi_wordle import Multi_Wordle
+from wordle.patterns import pattern_table
+from wordle.words import get_dictionary
+import argparse
+import cProfile
+import collections
+import functools
+import json
+import os
+import pstats
+import random
+import signal
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+# bots each kind of workload can run
+WORKLOADS = {
+    "classic": {
+        "SimpleBot": bot.main.SimpleBot,
+        "MiddleBot": bot.main.MiddleBot,
+        "MiddleBotTf": bot.main.MiddleBotTf,
+        "MiddleBotGenetic": bot.main.MiddleBotGenetic,
+        "HardBot": functools.partial(bot.main.HardBot, "pool", 10),
+        "MinimaxBotExpected": bot.main.MinimaxBotExpected,
+    },
+    "multi": {
+        "NaiveBot": bot.multi_bot.NaiveBot,
+        "GreedyBot": bot.multi_bot.GreedyBot,
+    },
+    "quantum": {
+        "QuantumBot": bot.quantum.QuantumBot,
+        "QuantumPairBot": bot.quantum.QuantumPairBot,
+    },
+}
+
+# bots run when none are given, chosen so the default workloads reach every
+# function of FOCUS
+DEFAULT_BOTS = {
+    "classic": ["SimpleBot", "MiddleBot", "MiddleBotTf", "MiddleBotGenetic", "HardBot"],
+    "multi": ["NaiveBot"],
+    "quantum": ["QuantumPairBot"],
+}
+
+# functions reported on their own in every profile
+FOCUS = {
+    "MiddleBot.filter": bot.main.MiddleBot.filter,
+    "SimpleBot.potential_final_guesses": bot.main.SimpleBot.potential_final_guesses,
+    "HardBot.potential_final_guesses": bot.main.HardBot.potential_final_guesses,
+    "BotInterface.score_words_with_tf": bot.main.BotInterface.score_words_with_tf,
+    "BotInterface.generate_word_with_genetic": (
+        bot.main.BotInterface.generate_word_with_genetic
+    ),
+    "Multi_Wordle.attempt_guess": Multi_Wordle.attempt_guess,
+    "multi_bot.BotInterface.filter": bot.multi_bot.BotInterface.filter,
+}
+
+
+def run_workload(mode: str, bot_names: list[str], games: int, boards: int, seed: int):
+    """
+    Plays games games with each bot. The answers and the bots' random
+    choices only depend on seed, so every run plays the same games.
+
+    Endgame solvers start empty in a temporary directory, so solutions
+    cached by earlier runs do not make a run look faster.
+    """
+    dictionary = get_dictionary()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for bot_name in bot_names:
+            random.seed(seed)
+            helper = WORKLOADS[mode][bot_name](dictionary=dictionary)
+            if getattr(helper, "endgame", None) is not None:
+                path = os.path.join(tmp_dir, f"endgame-{bot_name}.npz")
+                helper.endgame = EndgameSolver(path=path, dictionary=dictionary)
+            if mode == "classic":
+                words = random.sample(dictionary.answers, games)
+                helper.play_games(games, words=words)
+            elif mode == "multi":
+                words = [random.sample(dictionary.answers, boards) for _ in range(games)]
+                helper.play_games(
+                    games, max_turns=boards + 5, num_games=boards, words=words
+                )
+            else:
+                helper.play_games(games)
+
+
+def function_name(key: tuple) -> str:
+    """
+    Returns the name of a pstats entry, without its line number so entries
+    can be matched between commits
+    """
+    filename, _, name = key
+    if filename == "~":
+        return name
+    if filename.startswith(os.getcwd()):
+        filename = os.path.relpath(filename)
+    return f"{filename}:{name}"
+
+
+def profile_functions(workload: dict) -> tuple[pstats.Stats, float]:
+    """
+    Runs the workload under cProfile and returns the stats and the seconds
+    taken
+    """
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    run_workload(**workload)
+    profiler.disable()
+    return pstats.Stats(profiler), time.perf_counter() - start
+
+
+def profile_allocations(workload: dict) -> tuple[tracemalloc.Snapshot, int]:
+    """
+    Runs the workload under tracemalloc and returns a snapshot of the memory
+    still allocated at the end and the peak memory in bytes
+    """
+    tracemalloc.start()
+    run_workload(**workload)
+    snapshot = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return snapshot, peak
+
+
+def sample_stacks(workload: dict, interval=0.001) -> collections.Counter:
+    """
+    Runs the workload while sampling its call stack every interval seconds
+    of CPU time, and returns how often each stack was seen, root first. The
+    stacks start at run_workload, so they do not depend on how the harness
+    was started.
+    """
+    stacks = collections.Counter()
+    root = run_workload.__code__
+
+    def sample(signum, frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            filename = code.co_filename
+            if filename.startswith(os.getcwd()):
+                filename = os.path.relpath(filename)
+            names.append(f"{filename}:{code.co_qualname}")
+            if code is root:
+                break
+            frame = frame.f_back
+        stacks[";".join(reversed(names))] += 1
+
+    previous = signal.signal(signal.SIGPROF, sample)
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    try:
+        run_workload(**workload)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, previous)
+    return stacks
+
+
+def summarize(stats: pstats.Stats, seconds: float, peak: int, workload: dict):
+    """
+    Returns the summary of a profile saved as summary.json: the workload, the
+    commit it ran on, the FOCUS functions and the time of every function
+    """
+    functions = {}
+    for key, (_, calls, tottime, cumtime, _) in stats.stats.items():
+        name = function_name(key)
+        entry = functions.setdefault(name, [0, 0.0, 0.0])
+        entry[0] += calls
+        entry[1] += tottime
+        entry[2] += cumtime
+
+    focus = {}
+    for label, function in FOCUS.items():
+        code = function.__code__
+        key = (code.co_filename, code.co_firstlineno, code.co_name)
+        if key in stats.stats:
+            _, calls, tottime, cumtime, _ = stats.stats[key]
+            focus[label] = [calls, tottime, cumtime]
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "workload": workload,
+        "seconds": seconds,
+        "peak_memory": peak,
+        "focus": focus,
+        "functions": functions,
+    }
+
+
+def write_reports(path: str, stats, snapshot, stacks, summary: dict, top: int):
+    """
+    Writes the reports of a profile to the directory path
+    """
+    os.makedirs(path, exist_ok=True)
+    stats.dump_stats(os.path.join(path, "profile.pstats"))
+    with open(os.path.join(path, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=1, sort_keys=True)
+
+    functions = sorted(summary["functions"].items(), key=lambda item: -item[1][1])
+    with open(os.path.join(path, "functions.txt"), "w") as f:
+        f.write(f"{'calls':>10} {'tottime':>9} {'cumtime':>9}  function\n")
+        for name, (calls, tottime, cumtime) in functions[:top]:
+            f.write(f"{calls:>10} {tottime:>9.3f} {cumtime:>9.3f}  {name}\n")
+
+    with open(os.path.join(path, "allocations.txt"), "w") as f:
+        f.write(f"peak: {summary['peak_memory']} bytes\n")
+        f.write(f"{'bytes':>12} {'blocks':>9}  line (still allocated at the end)\n")
+        for statistic in snapshot.statistics("lineno")[:top]:
+            frame = statistic.traceback[0]
+            filename = frame.filename
+            if filename.startswith(os.getcwd()):
+                filename = os.path.relpath(filename)
+            f.write(
+                f"{statistic.size:>12} {statistic.count:>9}  "
+                f"{filename}:{frame.lineno}\n"
+            )
+
+    # the collapsed format read by flamegraph.pl, speedscope and inferno
+    with open(os.path.join(path, "stacks.collapsed"), "w") as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+
+def compare(summary: dict, baseline: dict, top: int) -> list[str]:
+    """
+    Returns report lines comparing the cumulative time of the FOCUS functions
+    and the slowest functions with a baseline summary
+    """
+    lines = [
+        f"compared with {baseline['commit']}: total "
+        f"{round(baseline['seconds'], 2)}s -> {round(summary['seconds'], 2)}s, "
+        f"peak memory {baseline['peak_memory']} -> {summary['peak_memory']} bytes"
+    ]
+    names = list(summary["focus"])
+    slowest = sorted(summary["functions"].items(), key=lambda item: -item[1][1])
+    names += [name for name, _ in slowest[:top] if name not in names]
+    for name in names:
+        new = summary["focus"].get(name) or summary["functions"].get(name)
+        old = baseline["focus"].get(name) or baseline["functions"].get(name)
+        if old is None:
+            lines.append(f"{name}: new, {round(new[2], 3)}s")
+        else:
+            ratio = new[2] / old[2] if old[2] > 0 else float("inf")
+            lines.append(
+                f"{name}: {round(old[2], 3)}s -> {round(new[2], 3)}s (x{round(ratio, 2)})"
+            )
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=list(WORKLOADS), default="classic")
+    parser.add_argument("--bots", nargs="+", default=None)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--boards", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=40)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", default=None)
+    args = parser.parse_args()
+
+    workload = {
+        "mode": args.mode,
+        "bot_names": args.bots or DEFAULT_BOTS[args.mode],
+        "games": args.games,
+        "boards": args.boards,
+        "seed": args.seed,
+    }
+    # load the word lists and tables first so no pass is charged for them
+    pattern_table(get_dictionary())
+
+    stats, seconds = profile_functions(workload)
+    snapshot, peak = profile_allocations(workload)
+    stacks = sample_stacks(workload)
+    summary = summarize(stats, seconds, peak, workload)
+    if args.output is None:
+        label = summary["commit"] or time.strftime("%Y%m%d-%H%M%S")
+        args.output = os.path.join("cache", "profiles", f"{args.mode}-{label}")
+    write_reports(args.output, stats, snapshot, stacks, summary, args.top)
+
+    lines = [
+        f"{args.mode} {' '.join(workload['bot_names'])}, {args.games} games "
+        f"at {summary['commit']}: {round(seconds, 2)}s under cProfile, "
+        f"peak memory {peak} bytes, {sum(stacks.values())} stack samples"
+    ]
+    for label, (calls, tottime, cumtime) in summary["focus"].items():
+        lines.append(
+            f"{label}: {calls} calls, {round(tottime, 3)}s own, {round(cumtime, 3)}s"
+        )
+    if args.compare is not None:
+        with open(args.compare) as f:
+            lines += compare(summary, json.load(f), 10)
+    print("\n".join(lines))
+    print(f"reports written to {args.output}")
+
+    with open("data/profiling.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
@@ -0,0 +1,109 @@
+from bot.quantum import *
+from wordle.quantum import *
+from wordle.shared import worker_pool
+from collections import Counter
+import argparse
+import time
+
+QUANTUM_BOTS = {
+    "QuantumBot": QuantumBot,
+    "QuantumPairBot": QuantumPairBot,
+}
+
+
+def simulate_chunk(task) -> dict:
+    """
+    Plays a chunk of Quantum Wordle games in a worker process. task is (bot
+    name, first game number, number of games, seed, max turns, timeout).
+
+    Game number g is played right after random.seed(seed + g), so both its
+    answer pair and the bot's random choices only depend on the seed and g,
+    never on how the games were split across workers.
+    """
+    bot_name, start, n, seed, max_turns, timeout = task
+    bot = QUANTUM_BOTS[bot_name]()
+    for g in range(start, start + n):
+        random.seed(seed + g)
+        bot.play_game(max_turns=max_turns, timeout=timeout)
+        # only the counters are reported back, so drop the finished games
+        bot.games.clear()
+        bot.testing.clear()
+
+    return {
+        "games": n,
+        "won": bot.win_rate,
+        "timed_out": bot.games_timed_out,
+        "turn_counts": bot.turn_counts,
+    }
+
+
+def simulate(
+    bot_name, n, max_turns=20, timeout=10.0, processes=None, seed=0, chunk_size=50
+):
+    """
+    Plays n seeded Quantum Wordle games with the given bot across a pool of
+    worker processes and returns their merged win, timeout and turn counts
+    """
+    tasks = [
+        (bot_name, start, min(chunk_size, n - start), seed, max_turns, timeout)
+        for start in range(0, n, chunk_size)
+    ]
+    with worker_pool(processes, tables=("disjoint",)) as pool:
+        results = pool.map(simulate_chunk, tasks, chunksize=1)
+
+    totals = {"games": 0, "won": 0, "timed_out": 0, "turn_counts": Counter()}
+    for result in results:
+        totals["games"] += result["games"]
+        totals["won"] += result["won"]
+        totals["timed_out"] += result["timed_out"]
+        totals["turn_counts"] += result["turn_counts"]
+    return totals
+
+
+def print_simulation(bot_name, totals, max_turns, seconds) -> None:
+    """
+    Prints a compact summary of a simulation instead of every game
+    """
+    won = totals["won"]
+    capped = totals["games"] - won - totals["timed_out"]
+    turns = sum(t * c for t, c in totals["turn_counts"].items())
+    avg_turns = round(turns / won, 2) if won > 0 else 0
+    most = max(totals["turn_counts"].values(), default=0)
+
+    print(f"{bot_name}:")
+    print(f"number of games: {totals['games']}")
+    print(f"win rate: {won / totals['games']}")
+    print(f"avg turns to win: {avg_turns}")
+    print(f"games capped at {max_turns} turns: {capped}")
+    print(f"games timed out: {totals['timed_out']}")
+    print(f"games per second: {round(totals['games'] / seconds, 1)}")
+    print("turns to win:")
+    for t in sorted(totals["turn_counts"]):
+        count = totals["turn_counts"][t]
+        print(f"{t:>3} | {'#' * round(40 * count / most)} {count}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bots", nargs="+", default=list(QUANTUM_BOTS))
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--max-turns", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for bot_name in args.bots:
+        start = time.perf_counter()
+        totals = simulate(
+            bot_name,
+            args.games,
+            max_turns=args.max_turns,
+            timeout=args.timeout,
+            processes=args.processes,
+            seed=args.seed,
+        )
+        print_simulation(
+            bot_name, totals, args.max_turns, time.perf_counter() - start
+        )
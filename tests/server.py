@@ -0,0 +1,67 @@
+from bot.server import *
+import random
+
+
+async def play_remote(host: str, port: int, word: str, hard_mode=False) -> GameState:
+    """
+    Plays one game against a running SuggestionServer over its own
+    connection, always guessing the server's suggestion
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    game = GameState(word=word, hard_mode=hard_mode)
+    while not game.is_finished():
+        response = await request(
+            reader,
+            writer,
+            {
+                "guesses": ["".join(guess) for guess in game.guesses],
+                "feedback": [
+                    "".join(str(f.value) for f in row) for row in game.feedback
+                ],
+                "hard_mode": hard_mode,
+            },
+        )
+        game.attempt_guess(response["suggestion"])
+    writer.close()
+    await writer.wait_closed()
+    return game
+
+
+async def load_test(num_games=1000, processes=None, hard_mode=False, seed=0):
+    """
+    Starts a SuggestionServer on a free localhost port, plays num_games
+    concurrent games against it and prints the results and server metrics
+    """
+    server = SuggestionServer(processes=processes)
+    await server.start(port=0)
+    random.seed(seed)
+    words = random.choices(server.dictionary.answers, k=num_games)
+
+    start = time.perf_counter()
+    games = await asyncio.gather(
+        *(play_remote("127.0.0.1", server.port, word, hard_mode) for word in words)
+    )
+    seconds = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    metrics = await request(reader, writer, {"metrics": True})
+    writer.close()
+    await server.stop()
+
+    won = [game for game in games if game.win]
+    print(f"games: {num_games} (hard mode: {hard_mode})")
+    print(f"win rate: {len(won) / num_games}")
+    print(f"avg turns to win: {round(sum(g.turn + 1 for g in won) / len(won), 2)}")
+    print(f"requests per second: {round(metrics['requests'] / seconds, 1)}")
+    print(f"metrics: {json.dumps(metrics, indent=2)}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--hard-mode", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(load_test(args.games, args.processes, args.hard_mode, args.seed))
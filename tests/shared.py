@@ -0,0 +1,109 @@
+from bot.main import HardBot
+from bot.multi_bot import NaiveBot
+from bot.quantum import QuantumPairBot
+from wordle.shared import worker_pool
+from wordle.words import get_dictionary
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+# the workloads each worker plays, as (tables the workload reads, function of
+# (number of games, seed) playing them)
+WORKLOADS = {
+    "hardbot": (
+        ("patterns",),
+        lambda games, seed: HardBot("green", 3).play_games(
+            games, words=random.Random(seed).sample(get_dictionary().answers, games)
+        ),
+    ),
+    "multi": (
+        (),
+        lambda games, seed: NaiveBot().play_games(
+            games,
+            max_turns=12,
+            num_games=4,
+            words=[random.Random(seed + g).sample(get_dictionary().answers, 4) for g in range(games)],
+        ),
+    ),
+    "quantum": (
+        ("disjoint",),
+        lambda games, seed: QuantumPairBot().play_games(games, max_turns=20),
+    ),
+}
+
+
+def memory() -> dict:
+    """
+    Returns the resident memory of this process in kB: all of it (rss), its
+    proportional share of pages mapped by several processes (pss) and the
+    pages only it maps (uss)
+    """
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def play_chunk(task) -> tuple[int, dict]:
+    """
+    Plays a chunk of games of a workload in a worker process and returns the
+    worker's pid and memory afterwards. task is (workload, games, seed).
+    """
+    workload, games, seed = task
+    random.seed(seed)
+    WORKLOADS[workload][1](games, seed)
+    return os.getpid(), memory()
+
+
+def measure(workload: str, processes: int, games: int, shared: bool) -> dict:
+    """
+    Plays a chunk of games per process, in a plain multiprocessing.Pool or
+    in a wordle.shared.worker_pool, and returns the mean memory of a worker
+    """
+    tasks = [(workload, games, seed) for seed in range(processes)]
+    if shared:
+        pool = worker_pool(processes, tables=WORKLOADS[workload][0])
+    else:
+        pool = multiprocessing.Pool(processes)
+    with pool:
+        workers = dict(pool.map(play_chunk, tasks, chunksize=1))
+    return {
+        name: sum(worker[name] for worker in workers.values()) / len(workers)
+        for name in ("rss", "pss", "uss")
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--processes", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--games", type=int, default=3)
+    args = parser.parse_args()
+
+    lines = []
+    for workload in args.workloads:
+        for shared in (False, True):
+            for processes in args.processes:
+                start = time.perf_counter()
+                result = measure(workload, processes, args.games, shared)
+                seconds = time.perf_counter() - start
+                lines.append(
+                    f"{workload}, {'worker_pool' if shared else 'Pool'}, "
+                    f"{processes} processes: per worker rss {round(result['rss'] / 1024, 1)}MB, "
+                    f"pss {round(result['pss'] / 1024, 1)}MB, "
+                    f"uss {round(result['uss'] / 1024, 1)}MB ({round(seconds, 2)}s)"
+                )
+                print(lines[-1])
+
+    with open("data/shared.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
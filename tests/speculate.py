@@ -0,0 +1,164 @@
+from bot.main import MinimaxBotExpected, MiddleBotTf
+from bot.multi_bot import NaiveBot
+from wordle.multi_wordle import Multi_Wordle
+from wordle.words import get_dictionary
+import argparse
+import bot.speculate
+import builtins
+import contextlib
+import io
+import random
+import re
+import statistics
+import time
+import wordle.main
+import wordle.multi_wordle
+
+# bots each mode is played with. The classic bots are deterministic, so
+# their games must go the same way with or without speculation.
+BOTS = {
+    "classic": {"MinimaxBotExpected": MinimaxBotExpected, "MiddleBotTf": MiddleBotTf},
+    "multi": {"NaiveBot": NaiveBot},
+}
+
+# the speculators the games create, recorded to report their hits
+SPECULATORS = []
+
+
+def recorded(init):
+    """
+    Wraps Speculator.__init__ to record every speculator in SPECULATORS
+    """
+
+    def record(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        SPECULATORS.append(self)
+
+    return record
+
+
+bot.speculate.Speculator.__init__ = recorded(bot.speculate.Speculator.__init__)
+
+
+class Output(io.StringIO):
+    """
+    Captures what a game prints, noting when the latest suggestion was
+    printed
+    """
+
+    suggested = None
+
+    def write(self, text: str) -> int:
+        if "should guess" in text:
+            self.suggested = time.perf_counter()
+        return super().write(text)
+
+
+class Player:
+    def __init__(self, output: Output, typing: float, follow: float, seed: int):
+        """
+        Stands in for input(): reads the suggestions printed to output, takes
+        typing seconds to answer and times how long each suggestion took to
+        be printed after the previous guess. The first suggestion is guessed
+        with probability follow, else another suggested guess (or any answer
+        if there is only one).
+        """
+        self.output = output
+        self.typing = typing
+        self.follow = follow
+        self.random = random.Random(seed)
+        self.answers = get_dictionary().answers
+        # answered is when the last guess was typed, or None
+        self.answered = None
+        self.latencies = []
+
+    def __call__(self, prompt: str) -> str:
+        if self.answered is not None:
+            self.latencies.append(self.output.suggested - self.answered)
+        text = self.output.getvalue()
+        suggestion = re.findall(r"should guess (\w+)!", text)[-1]
+        others = []
+        start = text.rfind("should guess")
+        liked = re.search(r"It also likes: (.*)\n", text[start:])
+        if liked is not None:
+            others = re.findall(r"(\w+) \(", liked.group(1))
+        time.sleep(self.typing)
+        if self.random.random() < self.follow:
+            guess = suggestion
+        elif len(others) > 0:
+            guess = self.random.choice(others)
+        else:
+            guess = self.random.choice(self.answers)
+        self.answered = time.perf_counter()
+        return guess
+
+
+def play(mode: str, make_bot, speculate: bool, args, game_number: int) -> tuple:
+    """
+    Plays a game of mode with the player, and returns the transcript and the
+    seconds each suggestion took after a guess
+    """
+    seed = args.seed + game_number
+    dictionary = get_dictionary()
+    output = Output()
+    player = Player(output, args.typing, args.follow, seed)
+    random.seed(seed)
+    helper = make_bot(dictionary=dictionary)
+    input_function = builtins.input
+    builtins.input = player
+    try:
+        with contextlib.redirect_stdout(output):
+            if mode == "classic":
+                wordle.main.play(helper_bot=helper, dictionary=dictionary, speculate=speculate)
+            else:
+                words = random.Random(seed).sample(dictionary.answers, args.boards)
+                game = Multi_Wordle(args.boards, words, dictionary)
+                wordle.multi_wordle.play(
+                    game, max_turns=args.boards + 6, helper_bot=helper, speculate=speculate
+                )
+    finally:
+        builtins.input = input_function
+    return output.getvalue(), player.latencies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", nargs="+", choices=list(BOTS), default=list(BOTS))
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--typing", type=float, default=2.0)
+    parser.add_argument("--follow", type=float, default=0.7)
+    parser.add_argument("--boards", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lines = []
+    for mode in args.modes:
+        for name, make_bot in BOTS[mode].items():
+            latencies = {}
+            transcripts = {}
+            SPECULATORS.clear()
+            for speculate in (False, True):
+                latencies[speculate] = []
+                transcripts[speculate] = []
+                for g in range(args.games):
+                    transcript, times = play(mode, make_bot, speculate, args, g)
+                    transcripts[speculate].append(transcript)
+                    latencies[speculate] += times
+            line = (
+                f"{mode} {name}, {args.games} games, {args.typing}s to type: "
+                f"suggestion after median {round(statistics.median(latencies[False]) * 1000, 1)}ms "
+                f"(max {round(max(latencies[False]) * 1000, 1)}ms) without speculation, "
+                f"{round(statistics.median(latencies[True]) * 1000, 1)}ms "
+                f"(max {round(max(latencies[True]) * 1000, 1)}ms) with it, "
+                f"{sum(s.hits for s in SPECULATORS)} hits and "
+                f"{sum(s.misses for s in SPECULATORS)} misses, "
+                f"{sum(s.speculated for s in SPECULATORS)} outcomes speculated on"
+            )
+            if mode == "classic":
+                line += f", same games: {transcripts[False] == transcripts[True]}"
+            lines.append(line)
+            print(lines[-1])
+
+    with open("data/speculate.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
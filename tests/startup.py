@@ -0,0 +1,104 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# each scenario is the answers typed into `python -m main`, in order, up to
+# the first helper bot suggestion
+SCENARIOS = {
+    "classic, MinimaxBot (expected)": ["1", "7", "n"],
+    "classic, MiddleBot (term frequency)": ["1", "3", "n"],
+    "classic, TreeBot": ["1", "8", "n"],
+    "quantum, QuantumPairBot": ["3", "2"],
+    "absurdle, MinimaxBot": ["4", "y"],
+}
+
+
+class Session:
+    def __init__(self) -> None:
+        """
+        Runs `python -m main` with its input and output piped
+        """
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", "-m", "main"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self.output = b""
+
+    def wait_for(self, text: bytes, timeout=60.0) -> None:
+        """
+        Reads the output until text shows up after everything read so far
+        """
+        start = len(self.output)
+        deadline = time.perf_counter() + timeout
+        while text not in self.output[start:]:
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"{text} never showed up")
+            chunk = os.read(self.process.stdout.fileno(), 4096)
+            if chunk == b"":
+                raise EOFError(f"main exited before showing {text}")
+            self.output += chunk
+
+    def type(self, answer: str) -> None:
+        """
+        Types an answer to the current prompt
+        """
+        self.process.stdin.write(answer.encode() + b"\n")
+        self.process.stdin.flush()
+
+    def close(self) -> None:
+        """
+        Stops the game
+        """
+        self.process.kill()
+        self.process.wait()
+
+
+def measure(answers: list[str], think_time: float) -> tuple[float, float]:
+    """
+    Returns the seconds until the first prompt, and the seconds from the
+    last answer until the first suggestion. Each answer is typed think_time
+    seconds after its prompt, as a player would.
+    """
+    session = Session()
+    try:
+        start = time.perf_counter()
+        session.wait_for(b"> ")
+        first_prompt = time.perf_counter() - start
+        for i, answer in enumerate(answers):
+            time.sleep(think_time)
+            session.type(answer)
+            answered = time.perf_counter()
+            if i < len(answers) - 1:
+                session.wait_for(b"> ")
+        session.wait_for(b"Your helper bot thinks")
+        first_suggestion = time.perf_counter() - answered
+    finally:
+        session.close()
+    return first_prompt, first_suggestion
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    lines = []
+    for name, answers in SCENARIOS.items():
+        results = [measure(answers, args.think_time) for _ in range(args.runs)]
+        first_prompt = min(prompt for prompt, _ in results)
+        first_suggestion = min(suggestion for _, suggestion in results)
+        lines.append(
+            f"{name}: first prompt {round(first_prompt * 1000)}ms, "
+            f"first suggestion {round(first_suggestion * 1000)}ms "
+            f"(think time {args.think_time}s, best of {args.runs})"
+        )
+        print(lines[-1])
+
+    with open("data/startup.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
@@ -0,0 +1,63 @@
+from bot.cache import GuessCache
+from bot.main import *
+from wordle.main import GameState
+import argparse
+import time
+
+# deterministic bots, whose suggestion must be the guess generate_word makes
+BOTS = {
+    "MiddleBotTf": MiddleBotTf,
+    "MinimaxBot": MinimaxBot,
+    "MinimaxBotExpected": MinimaxBotExpected,
+}
+
+
+def play(helper, answers: list[str], k: int, suggest: bool):
+    """
+    Plays a game per answer, guessing the first suggestion (or the guess of
+    generate_word), and returns the guesses made and the seconds taken
+    """
+    guesses = []
+    start = time.perf_counter()
+    for answer in answers:
+        game = GameState(answer, dictionary=helper.dictionary)
+        while not game.is_finished():
+            if suggest:
+                guess = helper.suggest(game, k)[0][0]
+            else:
+                guess = helper.generate_word(game)
+            guesses.append(guess)
+            game.attempt_guess(guess)
+        helper.possible_words = helper.all_words()
+    return guesses, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dictionary = get_dictionary()
+    answers = random.Random(args.seed).sample(dictionary.answers, args.games)
+    lines = []
+    for name, make_bot in BOTS.items():
+        # without the guess cache every pick is scored, as a new position in
+        # interactive play would be. Each bot warms up first, so both runs
+        # are charged alike.
+        helper = make_bot()
+        helper.guess_cache = GuessCache(0)
+        play(helper, answers[:1], args.k, True)
+        picks, pick_seconds = play(helper, answers, args.k, False)
+        suggested, suggest_seconds = play(helper, answers, args.k, True)
+        lines.append(
+            f"{name}: generate_word {round(pick_seconds / len(picks) * 1000, 2)}ms, "
+            f"suggest top {args.k} {round(suggest_seconds / len(suggested) * 1000, 2)}ms "
+            f"per turn over {args.games} games, same guesses: {picks == suggested}"
+        )
+        print(lines[-1])
+
+    with open("data/suggest.txt", "a") as f:
+        f.write(time.strftime("%Y-%m-%d %H:%M:%S") + "\n")
+        f.write("\n".join(lines) + "\n\n")
@@ -0,0 +1,84 @@
+import numpy as np
+from wordle.main import *
+from wordle.patterns import pattern_table
+
+
+class AbsurdleGameState(GameState):
+    def __init__(self, hard_mode=False, dictionary=None) -> None:
+        """
+        Initializes an adversarial game of Wordle, where the host never picks
+        an answer. Instead it keeps every answer consistent with the feedback
+        so far, and answers each guess with the feedback that keeps the most
+        answers alive.
+        """
+        self.patterns = pattern_table(dictionary)
+
+        # live holds the indices of the answers that are still consistent
+        self.live = np.arange(len(self.patterns.answers))
+
+        super().__init__(
+            word=self.patterns.answers[0],
+            hard_mode=hard_mode,
+            dictionary=self.patterns.dictionary,
+        )
+
+    def attempt_guess(self, guess: str) -> None:
+        """
+        Takes in a guess from the player, increments the turn, and replies with
+        the feedback pattern shared by the largest group of live answers.
+
+        The guess only wins once it is the last live answer. Ties between
+        groups go to the lowest pattern code, i.e. the feedback with the fewest
+        green and yellow letters from the end of the word.
+        """
+        if self.hard_mode:
+            violation = self.hard_mode_violation(guess)
+            if violation is not None:
+                raise ValueError(violation)
+
+        codes = self.patterns.codes(guess, self.live)
+        counts = np.bincount(codes, minlength=self.patterns.num_codes)
+        if counts[self.patterns.win_code] < len(self.live):
+            counts[self.patterns.win_code] = 0
+        code = int(np.argmax(counts))
+        self.live = self.live[codes == code]
+
+        # word is always one of the answers that are still possible
+        self.word = self.patterns.answers[self.live[0]]
+
+        self.guesses.append(list(guess))
+        self.feedback.append(decode_feedback(code, len(guess)))
+        if code == self.patterns.win_code:
+            self.win = True
+        else:
+            self.turn += 1
+
+
+def play(max_turns=6, helper_bot=None, dictionary=None):
+    """
+    Plays an interactive game of Absurdle.
+    """
+    # Intro
+    print("Welcome to Absurdle! The host is out to get you.\n")
+    game = AbsurdleGameState(dictionary=dictionary)
+
+    # Play game
+    while not game.is_finished(max_turns=max_turns):
+        if helper_bot:
+            suggestion = helper_bot.generate_word(game)
+            print(f"Your helper bot thinks you should guess {suggestion}!")
+        guess = input("What is your guess?\n> ")
+        game.attempt_guess(guess)
+        game.print_game_state()
+        print(f"{len(game.live)} possible answers left")
+
+    # End game
+    print("Thanks for playing absurdle!")
+    if game.win:
+        print("Congratulations! You beat Absurdle!")
+    else:
+        print("You lost. Better luck next time! Sad.")
+
+
+if __name__ == "__main__":
+    play()
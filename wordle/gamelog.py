@@ -0,0 +1,264 @@
+import argparse
+import os
+import struct
+import time
+from collections import Counter
+import numpy as np
+from wordle.main import encode_feedback
+from wordle.patterns import num_codes, pair_codes, win_code
+from wordle.words import ANSWERS_PATH, GUESSES_PATH, get_dictionary
+
+# A game log is a fixed-size header and then one fixed-width record per game,
+# appended as games finish. The header holds the magic bytes, format version,
+# word length, most turns a record has room for, the bytes of a word id and
+# of a pattern code, and the hash of the lexicon the ids index into (see
+# wordle.lexicon). A record is the answer id, the number of guesses, whether
+# the game was won and then the guess id and pattern code of each turn, zero
+# after the last guess.
+MAGIC = b"WLOG"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHBB16s")
+
+
+def record_dtype(max_turns: int, id_size: int, code_size: int) -> np.dtype:
+    """
+    Returns the numpy dtype of a record
+    """
+    ids = f"<u{id_size}"
+    codes = f"<u{code_size}"
+    return np.dtype(
+        [
+            ("answer", ids),
+            ("turns", "u1"),
+            ("win", "u1"),
+            ("guesses", ids, (max_turns,)),
+            ("codes", codes, (max_turns,)),
+        ]
+    )
+
+
+def read_header(path: str) -> dict:
+    """
+    Returns the fields of the header of the log at path, with the record
+    dtype as "dtype"
+    """
+    with open(path, "rb") as f:
+        data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a game log")
+    magic, version, length, max_turns, id_size, code_size, sha = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} game log")
+    return {
+        "word_length": length,
+        "max_turns": max_turns,
+        "id_size": id_size,
+        "code_size": code_size,
+        "sha": sha,
+        "dtype": record_dtype(max_turns, id_size, code_size),
+    }
+
+
+def read_records(path: str) -> tuple[dict, np.ndarray]:
+    """
+    Returns the header of the log at path and its records, memory-mapped so
+    only the records that are read are loaded. A record torn by a crash
+    while it was appended is left out.
+    """
+    header = read_header(path)
+    count = (os.path.getsize(path) - HEADER.size) // header["dtype"].itemsize
+    if count == 0:
+        return header, np.zeros(0, dtype=header["dtype"])
+    records = np.memmap(
+        path, dtype=header["dtype"], mode="r", offset=HEADER.size, shape=(count,)
+    )
+    return header, records
+
+
+class GameLog:
+    def __init__(self, path: str, dictionary=None, max_turns=6) -> None:
+        """
+        Appends finished games to the log at path, creating it if needed.
+        Records are buffered until flush is called.
+
+        An existing log must have been written with the same word lists. Its
+        max_turns is kept, and a torn last record is cut off.
+        """
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+        self.path = path
+        self.word_ids = {word: i for i, word in enumerate(dictionary.guesses)}
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            header = read_header(path)
+            if header["sha"] != dictionary.lexicon.sha:
+                raise ValueError(f"{path} was written with other word lists")
+            self.dtype = header["dtype"]
+            self.max_turns = header["max_turns"]
+            size = os.path.getsize(path) - HEADER.size
+            with open(path, "r+b") as f:
+                f.truncate(HEADER.size + size - size % self.dtype.itemsize)
+        else:
+            id_size = 2 if len(dictionary.guesses) <= 2**16 else 4
+            code_size = 1 if num_codes(dictionary.word_length) <= 256 else 2
+            self.dtype = record_dtype(max_turns, id_size, code_size)
+            self.max_turns = max_turns
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(
+                    HEADER.pack(
+                        MAGIC,
+                        VERSION,
+                        dictionary.word_length,
+                        max_turns,
+                        id_size,
+                        code_size,
+                        dictionary.lexicon.sha,
+                    )
+                )
+
+        # pending holds the records appended since the last flush
+        self.pending = []
+
+    def append(self, game) -> None:
+        """
+        Adds a finished GameState (or CompactGameState) to the log. Every
+        guess and the answer must be words of the dictionary.
+        """
+        if len(game.guesses) > self.max_turns:
+            raise ValueError(f"The log has room for {self.max_turns} turns")
+        record = np.zeros((), dtype=self.dtype)
+        record["answer"] = self.word_id(game.word)
+        record["turns"] = len(game.guesses)
+        record["win"] = game.win
+        for turn, (guess, feedback) in enumerate(zip(game.guesses, game.feedback)):
+            record["guesses"][turn] = self.word_id("".join(guess))
+            record["codes"][turn] = encode_feedback(feedback)
+        self.pending.append(record.tobytes())
+
+    def append_results(self, results: dict) -> None:
+        """
+        Adds the games played by bot.lockstep.LockstepSimulator.run, which
+        must have the same max_turns as the log
+        """
+        turns = results["history"].shape[1]
+        if turns != self.max_turns:
+            raise ValueError(
+                f"The log has room for {self.max_turns} turns, but the results "
+                f"have {turns}"
+            )
+        records = np.zeros(len(results["answers"]), dtype=self.dtype)
+        records["answer"] = results["answers"]
+        records["turns"] = results["turns"]
+        records["win"] = results["wins"]
+        played = np.arange(self.max_turns) < results["turns"][:, None]
+        records["guesses"] = np.where(played, results["history"], 0)
+        records["codes"] = np.where(played, results["codes"], 0)
+        self.pending.append(records.tobytes())
+
+    def word_id(self, word: str) -> int:
+        """
+        Returns the index of word in the dictionary's guesses
+        """
+        if word not in self.word_ids:
+            raise ValueError(f"{word} is not in the dictionary")
+        return self.word_ids[word]
+
+    def flush(self) -> None:
+        """
+        Writes the pending records to the end of the log
+        """
+        if len(self.pending) > 0:
+            with open(self.path, "ab") as f:
+                f.write(b"".join(self.pending))
+            self.pending = []
+
+
+def verify(path: str, dictionary=None, duplicates=False, chunk=1 << 16) -> Counter:
+    """
+    Streams the log at path, scoring every guess again against the answer,
+    and returns a Counter of games, wins, turns won in, mismatched feedback
+    and invalid records.
+
+    duplicates: score with the standard game's rule for repeated letters
+    instead of GameState's (see wordle.patterns.pair_codes), to count the
+    games whose feedback the two rules disagree on
+    """
+    if dictionary is None:
+        dictionary = get_dictionary()
+    header, records = read_records(path)
+    if header["sha"] != dictionary.lexicon.sha:
+        raise ValueError(f"{path} was written with other word lists")
+    encoded = dictionary.encoded_guesses
+    winning_code = win_code(header["word_length"])
+
+    stats = Counter()
+    for start in range(0, len(records), chunk):
+        block = records[start : start + chunk]
+        answers = block["answer"].astype(np.int64)
+        turns = block["turns"].astype(np.int64)
+        wins = block["win"].astype(bool)
+        guesses = block["guesses"].astype(np.int64)
+        codes = block["codes"].astype(np.int64)
+
+        invalid = (
+            (turns > header["max_turns"])
+            | (answers >= len(encoded))
+            | (guesses >= len(encoded)).any(axis=1)
+        )
+        valid = ~invalid
+        answers, turns, wins = answers[valid], turns[valid], wins[valid]
+        guesses, codes = guesses[valid], codes[valid]
+
+        mismatched = np.zeros(len(answers), dtype=bool)
+        for turn in range(header["max_turns"]):
+            played = np.flatnonzero(turn < turns)
+            if len(played) == 0:
+                break
+            expected = pair_codes(
+                encoded[guesses[played, turn]], encoded[answers[played]], duplicates
+            )
+            mismatched[played] |= expected != codes[played, turn]
+
+        # a game is won exactly when its last guess is the answer
+        last = guesses[np.arange(len(turns)), np.maximum(turns - 1, 0)]
+        invalid_win = wins != ((turns > 0) & (last == answers))
+        last_code = codes[np.arange(len(turns)), np.maximum(turns - 1, 0)]
+        invalid_win |= wins & (last_code != winning_code)
+
+        stats["games"] += len(block)
+        stats["invalid records"] += int(invalid.sum() + invalid_win.sum())
+        stats["mismatched games"] += int(mismatched.sum())
+        stats["wins"] += int(wins.sum())
+        for won_in, count in zip(*np.unique(turns[wins], return_counts=True)):
+            stats[f"won in {won_in}"] += int(count)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--duplicates", action="store_true")
+    parser.add_argument("--answers", default=ANSWERS_PATH)
+    parser.add_argument("--guesses", default=GUESSES_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = verify(args.path, get_dictionary(args.answers, args.guesses), args.duplicates)
+    seconds = time.perf_counter() - start
+    won_in = {
+        int(name.split()[-1]): count
+        for name, count in stats.items()
+        if name.startswith("won in")
+    }
+    print(f"games: {stats['games']} (verified in {round(seconds, 2)}s)")
+    print(f"mismatched games: {stats['mismatched games']}")
+    print(f"invalid records: {stats['invalid records']}")
+    if stats["games"] > 0:
+        print(f"win rate: {round(stats['wins'] / stats['games'], 4)}")
+    if stats["wins"] > 0:
+        turns = sum(turn * count for turn, count in won_in.items())
+        print(f"avg turns to win: {round(turns / stats['wins'], 3)}")
+    for turn in sorted(won_in):
+        print(f"won in {turn}: {won_in[turn]}")
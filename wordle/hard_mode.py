@@ -0,0 +1,63 @@
+import numpy as np
+from wordle.main import GameState, Feedback
+from wordle.words import get_dictionary
+
+
+class HardModeIndex:
+    def __init__(self, dictionary=None):
+        """
+        Tracks which words are legal hard mode guesses in a game.
+
+        Every legal guess starts marked in self.legal. Each new feedback row
+        only ever adds constraints, so instead of re-checking every word
+        against every row, each row is applied once to the words still legal
+        as a couple of array operations per green or yellow letter.
+
+        words starts with the answers, so it is in the same order as the
+        guesses of wordle.patterns.PatternTable.
+        """
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+        self.words = dictionary.guesses
+        self.encoded = dictionary.encoded_guesses
+        self.masks = dictionary.guess_masks
+        self.reset(None)
+
+    def reset(self, game) -> None:
+        """
+        Starts tracking game, with every word legal
+        """
+        self.game = game
+        self.rows = 0
+        self.legal = np.ones(len(self.words), dtype=bool)
+        self.legal_words = None
+
+    def sync(self, game: GameState) -> np.ndarray:
+        """
+        Applies the feedback rows of game not seen yet and returns the mask of
+        legal words. Moving on to another game starts over.
+        """
+        if game is not self.game or len(game.guesses) < self.rows:
+            self.reset(game)
+
+        for turn in range(self.rows, len(game.guesses)):
+            for i in range(len(game.guesses[turn])):
+                code = self.dictionary.letter_index(game.guesses[turn][i])
+                if game.feedback[turn][i] == Feedback.GREEN:
+                    self.legal &= self.encoded[:, i] == code
+                elif game.feedback[turn][i] == Feedback.YELLOW:
+                    self.legal &= ((self.masks >> code) & 1).astype(bool)
+            self.legal_words = None
+        self.rows = len(game.guesses)
+        return self.legal
+
+    def legal_set(self, game: GameState) -> set[str]:
+        """
+        Returns the set of legal guesses in game, only rebuilt when a new
+        feedback row narrows it
+        """
+        self.sync(game)
+        if self.legal_words is None:
+            self.legal_words = {self.words[i] for i in np.flatnonzero(self.legal)}
+        return self.legal_words
@@ -0,0 +1,204 @@
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import time
+import unicodedata
+from collections import Counter
+import numpy as np
+
+# A lexicon file is a fixed-size header, the alphabet as UTF-32 code points
+# and then every word as word_length uint8 letter codes, answers first. The
+# header holds the magic bytes, format version, word length, alphabet size,
+# number of answers, number of guess-only words and a sha1 of everything
+# after the header (truncated to 16 bytes).
+MAGIC = b"WLEX"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHII16s")
+
+
+def normalize(word: str) -> str:
+    """
+    Returns word as it is stored: stripped, lowercase and NFC-normalized so
+    accented letters typed in different ways are the same letter
+    """
+    return unicodedata.normalize("NFC", word.strip().lower())
+
+
+def ingest(answers_text: str, guesses_text: str) -> tuple[list, list, Counter]:
+    """
+    Validates and dedupes two newline separated word lists. Returns the
+    answers, the guess-only words and a Counter of what was cleaned up.
+
+    Blank lines are skipped, repeated words are kept once and words in both
+    lists are tagged as answers. Every word must be made of letters and have
+    the same length as the first answer; raises ValueError otherwise.
+    """
+    report = Counter()
+    seen = set()
+    lists = ([], [])
+    for tag, text in enumerate((answers_text, guesses_text)):
+        for line in text.splitlines():
+            word = normalize(line)
+            if word == "":
+                report["blank lines"] += 1
+            elif word in seen:
+                report["duplicates"] += 1
+            else:
+                seen.add(word)
+                lists[tag].append(word)
+    answers, guess_only = lists
+    if len(answers) == 0:
+        raise ValueError("There are no answers")
+
+    word_length = len(answers[0])
+    invalid = [
+        word
+        for word in answers + guess_only
+        if len(word) != word_length or not word.isalpha()
+    ]
+    if len(invalid) > 0:
+        raise ValueError(
+            f"{len(invalid)} words are not made of {word_length} letters, "
+            f"e.g. {invalid[:5]}"
+        )
+    report["answers"] = len(answers)
+    report["guess-only words"] = len(guess_only)
+    return answers, guess_only, report
+
+
+def write_lexicon(path: str, answers: list[str], guess_only: list[str]) -> None:
+    """
+    Writes validated word lists (see ingest) as a lexicon file
+    """
+    words = answers + guess_only
+    alphabet = "".join(sorted(set("".join(words))))
+    if len(alphabet) > 255:
+        raise ValueError("Alphabets of over 255 letters do not fit in a byte")
+    letters = np.array([ord(letter) for letter in alphabet], dtype=np.uint32)
+    code_points = np.frombuffer("".join(words).encode("utf-32-le"), dtype=np.uint32)
+    codes = np.searchsorted(letters, code_points).astype(np.uint8)
+
+    payload = letters.astype("<u4").tobytes() + codes.tobytes()
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(words[0]),
+        len(alphabet),
+        len(answers),
+        len(guess_only),
+        hashlib.sha1(payload).digest()[:16],
+    )
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # write to a temporary file first so a concurrent reader never sees a
+    # half-written lexicon
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header + payload)
+    os.replace(tmp_path, path)
+
+
+def build_lexicon(answers_path: str, guesses_path: str, path: str) -> Counter:
+    """
+    Ingests the text word lists and writes them to path as a lexicon file.
+    Returns the cleanup report of ingest.
+    """
+    with open(answers_path, "r", encoding="utf-8") as f:
+        answers_text = f.read()
+    with open(guesses_path, "r", encoding="utf-8") as f:
+        guesses_text = f.read()
+    answers, guess_only, report = ingest(answers_text, guesses_text)
+    write_lexicon(path, answers, guess_only)
+    return report
+
+
+class Lexicon:
+    def __init__(self, path: str) -> None:
+        """
+        A lexicon file mapped into memory. Reading it only parses the header,
+        so loading takes microseconds however many words it has.
+
+        codes is an (n, word length) uint8 array of letter indices into
+        alphabet, the same layout as wordle.words.encode_words, with the
+        num_answers answers first.
+        """
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buffer) < HEADER.size:
+            raise ValueError(f"{path} is not a lexicon file")
+        magic, version, length, alphabet_size, num_answers, num_guess_only, sha = (
+            HEADER.unpack_from(self.buffer)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} lexicon file")
+        num_words = num_answers + num_guess_only
+        if len(self.buffer) != HEADER.size + 4 * alphabet_size + num_words * length:
+            raise ValueError(f"{path} is truncated")
+
+        self.path = path
+        self.word_length = length
+        self.num_answers = num_answers
+        self.num_guess_only = num_guess_only
+        self.sha = sha
+        letters = np.frombuffer(
+            self.buffer, dtype="<u4", count=alphabet_size, offset=HEADER.size
+        )
+        self.alphabet = "".join(map(chr, letters.tolist()))
+        self.codes = np.frombuffer(
+            self.buffer,
+            dtype=np.uint8,
+            count=num_words * length,
+            offset=HEADER.size + 4 * alphabet_size,
+        ).reshape(num_words, length)
+
+    def verify(self) -> bool:
+        """
+        Returns whether the words still match the hash in the header
+        """
+        return hashlib.sha1(self.buffer[HEADER.size :]).digest()[:16] == self.sha
+
+    def words(self, start=0, stop=None) -> list[str]:
+        """
+        Decodes the words from start to stop (every word by default)
+        """
+        codes = self.codes[start:stop]
+        letters = np.array(list(self.alphabet))[codes]
+        words = np.ascontiguousarray(letters).view(f"<U{self.word_length}")
+        return words.ravel().tolist()
+
+    def answers(self) -> list[str]:
+        """
+        Decodes the answers
+        """
+        return self.words(0, self.num_answers)
+
+    def guesses(self) -> list[str]:
+        """
+        Decodes every word that can be guessed, answers first
+        """
+        return self.words()
+
+
+if __name__ == "__main__":
+    from wordle.words import ANSWERS_PATH, GUESSES_PATH, CACHE_DIR, file_digest
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", default=ANSWERS_PATH)
+    parser.add_argument("--guesses", default=GUESSES_PATH)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    if args.output is None:
+        # where wordle.words.Dictionary looks for the lexicon of these lists
+        digest = file_digest(args.answers, args.guesses)
+        args.output = os.path.join(CACHE_DIR, f"lexicon-{digest}.bin")
+
+    report = build_lexicon(args.answers, args.guesses, args.output)
+    for name, count in report.items():
+        print(f"{name}: {count}")
+
+    start = time.perf_counter()
+    lexicon = Lexicon(args.output)
+    seconds = time.perf_counter() - start
+    print(f"{os.path.getsize(args.output)} bytes written to {args.output}")
+    print(f"loaded in {round(seconds * 1e6)}us, hash ok: {lexicon.verify()}")
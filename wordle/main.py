@@ -1,6 +1,9 @@
 from enum import Enum
+import array
+import copy
 import random
 from termcolor import cprint, colored
+from wordle.words import get_dictionary
 
 # import numpy as np
 
@@ -11,13 +14,45 @@ class Feedback(Enum):
     GREEN = 2
 
 
+def encode_feedback(feedback: list[Feedback]) -> int:
+    """
+    Packs a row of Feedback enums into one pattern code, with the feedback of
+    letter i as the i-th base-3 digit (see wordle.patterns)
+    """
+    code = 0
+    for f in reversed(feedback):
+        code = code * 3 + f.value
+    return code
+
+
+def decode_feedback(code: int, length=5) -> list[Feedback]:
+    """
+    Unpacks a pattern code into a row of Feedback enums
+    """
+    feedback = []
+    for _ in range(length):
+        feedback.append(Feedback(code % 3))
+        code //= 3
+    return feedback
+
+
 class GameState:
-    def __init__(self, word=None) -> None:
+    def __init__(self, word=None, hard_mode=False, dictionary=None) -> None:
         """
         Initializes a new empty game state
 
-        Can optionally set the correct answer beforehand
+        Can optionally set the correct answer beforehand, and play by hard
+        mode rules: every revealed green letter must stay in place and every
+        revealed yellow letter must be used in later guesses
+
+        dictionary: the wordle.words.Dictionary answers are drawn from, which
+        also sets the word length (the standard 5-letter lists if None)
         """
+        # dictionary holds the word lists this game is played with
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+
         # word is a list of chars for each letter in the actual word
         #
         # Example: [s, p, a, i, n]
@@ -54,26 +89,15 @@ class GameState:
         # win is a boolean that describes whether the player has won the game
         self.win = False
 
+        # hard_mode is whether guesses must use the hints revealed so far
+        self.hard_mode = hard_mode
+
     def generate_word(self) -> str:
         """
-        Returns a new valid 5-letter Wordle word
+        Returns a new valid Wordle word, picked from the answers of the
+        game's dictionary
         """
-        # word list found here: https://gist.github.com/scholtes/94f3c0303ba6a7768b47583aff36654d#file-wordle-la-txt
-        # La words that can be guessed and which can be the word of the day
-        # Ta words that can be guessed but are never selected as the word of the day
-
-        # opening the file in read mode
-        word_list_file = open("public/wordle-La.txt", "r")
-
-        # reading the file
-        data = word_list_file.read()
-
-        # replacing end splitting the text
-        # when newline ('\n') is seen.
-        data_into_list = data.split("\n")
-
-        word_list_file.close()
-        return random.choice(data_into_list)
+        return random.choice(self.dictionary.answers)
 
     def print_game_state(self) -> None:
         """
@@ -93,14 +117,34 @@ class GameState:
             # for the new line
             print()
 
+    def hard_mode_violation(self, guess: str):
+        """
+        Returns why guess breaks the hard mode rules given the feedback so far,
+        or None if it does not
+        """
+        for turn in range(len(self.guesses)):
+            for i in range(len(self.guesses[turn])):
+                letter = self.guesses[turn][i]
+                if self.feedback[turn][i] == Feedback.GREEN and guess[i] != letter:
+                    return f"Letter {i + 1} must be {letter}"
+                if self.feedback[turn][i] == Feedback.YELLOW and letter not in guess:
+                    return f"Guess must contain {letter}"
+        return None
+
     def attempt_guess(self, guess: str) -> None:
         """
         Takes in a guess from the player, increments the turn, updates the game
         state, and updates the feedback
+
+        In hard mode, raises ValueError for a guess breaking the rules
         """
+        if self.hard_mode:
+            violation = self.hard_mode_violation(guess)
+            if violation is not None:
+                raise ValueError(violation)
 
-        guesses_temp = [0 for i in range(5)]
-        feedback_temp = [0 for i in range(5)]
+        guesses_temp = [0 for i in range(len(guess))]
+        feedback_temp = [0 for i in range(len(guess))]
 
         index = 0
         for l in guess:
@@ -120,6 +164,22 @@ class GameState:
         else:
             self.turn += 1
 
+    def branch(self, guess: str, code: int) -> "GameState":
+        """
+        Returns a copy of the game after guess, had its feedback been the
+        pattern code (see encode_feedback). Nothing is checked against the
+        answer, so bots can look ahead at feedback they have not seen yet.
+        """
+        game = copy.copy(self)
+        feedback = decode_feedback(code, len(guess))
+        game.guesses = self.guesses + [list(guess)]
+        game.feedback = self.feedback + [feedback]
+        if all(f == Feedback.GREEN for f in feedback):
+            game.win = True
+        else:
+            game.turn += 1
+        return game
+
     def is_finished(self, max_turns=6) -> bool:
         """
         Returns whether the game is over or not. The game is over if the player
@@ -146,23 +206,245 @@ class GameState:
         return ret
 
 
-def play(max_turns=6, helper_bot=None):
+class Rows:
+    __slots__ = ("game", "decode")
+
+    def __init__(self, game, decode) -> None:
+        """
+        A read-only list of a CompactGameState's rows, each decoded by
+        decode(game, turn) only when it is read
+        """
+        self.game = game
+        self.decode = decode
+
+    def __len__(self) -> int:
+        """
+        Returns the number of turns played
+        """
+        return len(self.game.codes)
+
+    def __getitem__(self, turn):
+        """
+        Decodes the row of turn, or a list of rows for a slice
+        """
+        if isinstance(turn, slice):
+            return [self.decode(self.game, t) for t in range(len(self))[turn]]
+        return self.decode(self.game, range(len(self))[turn])
+
+    def __iter__(self):
+        """
+        Decodes the rows in order
+        """
+        for turn in range(len(self)):
+            yield self.decode(self.game, turn)
+
+
+class CompactGameState:
+    # No per-instance __dict__: a finished game is a few small byte buffers
+    __slots__ = ("dictionary", "answer", "letters", "codes", "turn", "win", "hard_mode")
+
+    def __init__(self, word=None, hard_mode=False, dictionary=None) -> None:
+        """
+        A GameState that stores its history as integers instead of lists of
+        chars and Feedback enums, for keeping many simulated games in memory.
+
+        word, guesses and feedback are decoded when they are read, so bots and
+        print_game_state work with either class. Guesses must be made of the
+        dictionary's letters and be as long as its words.
+        """
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+
+        # answer is the letter codes of the word (see Dictionary.letter_index)
+        if word is None:
+            word = random.choice(self.dictionary.answers)
+        self.word = word
+
+        # letters is the letter codes of every guess, one after the other
+        self.letters = bytearray()
+
+        # codes has the pattern code of each guess's feedback (see
+        # encode_feedback)
+        self.codes = array.array("I")
+
+        self.turn = 0
+        self.win = False
+        self.hard_mode = hard_mode
+
+    def encode(self, word: str) -> bytes:
+        """
+        Returns the letter codes of word, or raises ValueError if it cannot be
+        stored
+        """
+        if len(word) != self.dictionary.word_length:
+            raise ValueError(f"{word} is not {self.dictionary.word_length} letters")
+        codes = [self.dictionary.alphabet.find(letter) for letter in word]
+        if -1 in codes:
+            raise ValueError(f"{word} has letters outside the dictionary")
+        return bytes(codes)
+
+    @property
+    def word(self) -> str:
+        """
+        Decodes the answer
+        """
+        return "".join(self.dictionary.alphabet[code] for code in self.answer)
+
+    @word.setter
+    def word(self, word: str) -> None:
+        self.answer = self.encode(word)
+
+    def guess_row(self, turn: int) -> list[str]:
+        """
+        Decodes the guess made on turn into a list of chars
+        """
+        length = self.dictionary.word_length
+        codes = self.letters[turn * length : (turn + 1) * length]
+        return [self.dictionary.alphabet[code] for code in codes]
+
+    def feedback_row(self, turn: int) -> list[Feedback]:
+        """
+        Decodes the feedback of turn into a list of Feedback enums
+        """
+        return decode_feedback(self.codes[turn], self.dictionary.word_length)
+
+    @property
+    def guesses(self) -> Rows:
+        """
+        The guesses as rows of chars, like GameState.guesses
+        """
+        return Rows(self, CompactGameState.guess_row)
+
+    @property
+    def feedback(self) -> Rows:
+        """
+        The feedback as rows of Feedback enums, like GameState.feedback
+        """
+        return Rows(self, CompactGameState.feedback_row)
+
+    # these only read word, guesses and feedback, so they work unchanged
+    generate_word = GameState.generate_word
+    print_game_state = GameState.print_game_state
+    hard_mode_violation = GameState.hard_mode_violation
+    is_finished = GameState.is_finished
+    __repr__ = GameState.__repr__
+
+    def attempt_guess(self, guess: str) -> None:
+        """
+        Same as GameState.attempt_guess, scoring the letter codes directly
+        """
+        if self.hard_mode:
+            violation = self.hard_mode_violation(guess)
+            if violation is not None:
+                raise ValueError(violation)
+
+        letters = self.encode(guess)
+        code = 0
+        for i in reversed(range(len(letters))):
+            if letters[i] == self.answer[i]:
+                level = Feedback.GREEN.value
+            elif letters[i] in self.answer:
+                level = Feedback.YELLOW.value
+            else:
+                level = Feedback.GRAY.value
+            code = code * 3 + level
+        self.letters += letters
+        self.codes.append(code)
+        if letters == self.answer:
+            self.win = True
+        else:
+            self.turn += 1
+
+
+def play(
+    max_turns=6,
+    helper_bot=None,
+    hard_mode=False,
+    dictionary=None,
+    suggestions=3,
+    deadline=None,
+    speculate=True,
+):
     """
     Plays an interactive game of Wordle.
+
+    suggestions: how many guesses the helper bot suggests each turn, best
+    first, with the number of answers each is expected to leave
+    deadline: seconds the helper bot may search before suggesting its best
+    guess so far (no limit if None). It keeps searching while you type and
+    tells you if it finds a better guess.
+    speculate: whether the helper bot works out its next suggestions while
+    you type, for the guesses it suggested and their likely feedback
     """
     # Intro
     print("Welcome to Wordle!\n")
-    game = GameState()
+    game = GameState(hard_mode=hard_mode, dictionary=dictionary)
+    search = None
+    speculation = None
+    # speculated is the guesses speculated on this turn
+    speculated = []
+    if helper_bot and deadline is not None:
+        from bot.anytime import AnytimeSearch
+
+        def refined(game, guess):
+            left = helper_bot.expected_left([guess], helper_bot.answers_left(game))[0]
+            print(
+                f"\nYour helper bot thought some more and now suggests {guess}! "
+                f"(about {round(left, 1)} answers left after it)\n> ",
+                end="",
+                flush=True,
+            )
+            speculated.insert(0, guess)
+
+        search = AnytimeSearch(helper_bot, deadline, refined)
+    if helper_bot and speculate:
+        from bot.speculate import ClassicSpeculator
+
+        speculation = ClassicSpeculator(helper_bot, suggestions)
 
     # Play game
     while not game.is_finished(max_turns=max_turns):
         if helper_bot:
-            suggestion = helper_bot.generate_word(game)
-            print(f"Your helper bot thinks you should guess {suggestion}!")
+            ranked = None
+            if speculation is not None:
+                # a hit hands over the copy of the bot that made the
+                # suggestion
+                ranked = speculation.result(game)
+                helper_bot = speculation.helper
+            if ranked is None and search is None:
+                ranked = helper_bot.suggest(game, suggestions)
+            elif ranked is None:
+                search.helper = helper_bot
+                ranked = search.suggest(game, suggestions)
+            suggestion, _, left = ranked[0]
+            print(
+                f"Your helper bot thinks you should guess {suggestion}! "
+                f"(about {round(left, 1)} answers left after it)"
+            )
+            if len(ranked) > 1:
+                others = ", ".join(
+                    f"{guess} ({round(left, 1)} left)" for guess, _, left in ranked[1:]
+                )
+                print(f"It also likes: {others}")
+            if speculation is not None:
+                speculated = [guess for guess, _, _ in ranked]
+                speculation.start(
+                    game, speculated, None if search is None else search.thread
+                )
         guess = input("What is your guess?\n> ")
+        while game.hard_mode and game.hard_mode_violation(guess) is not None:
+            print(f"{game.hard_mode_violation(guess)}! Try again.")
+            guess = input("What is your guess?\n> ")
+        if search is not None:
+            # the search reads the game, so it stops before the guess is made
+            search.stop()
         game.attempt_guess(guess)
         game.print_game_state()
 
+    if speculation is not None:
+        speculation.stop()
+
     # End game
     print("Thanks for playing wordle!")
     if game.win:
@@ -1,14 +1,22 @@
 from wordle.main import *
+import copy
 
 
 class Multi_Wordle(GameState):
-    def __init__(self, num_games=2, words=None):
+    def __init__(self, num_games=2, words=None, dictionary=None):
         """
         Initial num_games number of games to be played simultaneously
 
         words: an optional list of pre-determined answers to this game
+        dictionary: the word lists every game is played with (the standard
+        5-letter lists if None)
         """
         assert words is None or len(words) == num_games
+        # dictionary holds the word lists shared by every game
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+
         # keep track of number of games
         self.num_games = num_games
 
@@ -31,7 +39,7 @@ class Multi_Wordle(GameState):
                 # generate a new answer word (cannot have been selected already)
                 # add the new word to self.answers; add the new_game to self.games
                 # add its feedback and guesses to the respective arrays
-                new_game = GameState()
+                new_game = GameState(dictionary=self.dictionary)
                 new_game.word = self.generate_words(self.answers)
                 self.answers.append(new_game.word)
                 self.games.append(new_game)
@@ -45,7 +53,7 @@ class Multi_Wordle(GameState):
                 # generate a new answer word (cannot have been selected already)
                 # add the new word to self.answers; add the new_game to self.games
                 # add its feedback and guesses to the respective arrays
-                new_game = GameState(self.answers[idx])
+                new_game = GameState(self.answers[idx], dictionary=self.dictionary)
                 self.games.append(new_game)
                 self.guesses.append(new_game.guesses)
                 self.feedback.append(new_game.feedback)
@@ -99,6 +107,24 @@ class Multi_Wordle(GameState):
         self.wins = win_count  # set the win count
         self.win = self.wins == self.num_games  # check if you've won Multi_Wordle
 
+    def branch(self, guess: str, codes: list) -> "Multi_Wordle":
+        """
+        Returns a copy of the game after guess, had the feedback of each
+        board been the pattern code in codes (None for the boards it would not
+        be played on), as GameState.branch does
+        """
+        game = copy.copy(self)
+        game.games = [
+            board if code is None else board.branch(guess, code)
+            for board, code in zip(self.games, codes)
+        ]
+        game.guesses = [board.guesses for board in game.games]
+        game.feedback = [board.feedback for board in game.games]
+        game.xturn += 1
+        game.wins = sum(board.win for board in game.games)
+        game.win = game.wins == game.num_games
+        return game
+
     def is_finished(self, max_turns=8) -> bool:
         """
         Returns whether the game is over or not. The game is over if the player
@@ -128,23 +154,71 @@ class Multi_Wordle(GameState):
         return ret
 
 
-def play(game, max_turns=8, helper_bot=None):
+def play(game, max_turns=8, helper_bot=None, deadline=None, speculate=True):
     """
     Plays an interactive game of Multi_Wordle.
+
+    deadline: seconds the helper bot may search before suggesting its best
+    guess so far (no limit if None). It keeps searching while you type and
+    tells you if it finds a better guess.
+    speculate: whether the helper bot works out its next suggestion while
+    you type, for the guess it suggested and its likely feedback
     """
     # Intro
     num = game.num_games
     print(f"Welcome to {num}-Wordle!\n")
+    search = None
+    speculation = None
+    # speculated is the guesses speculated on this turn
+    speculated = []
+    if helper_bot:
+        # the helper's endgame solver plans for the turns left
+        helper_bot.max_turns = max_turns
+    if helper_bot and deadline is not None:
+        from bot.anytime import AnytimeSearch
+
+        def refined(game, guess):
+            print(
+                f"\nYour helper bot thought some more and now suggests {guess}!\n> ",
+                end="",
+                flush=True,
+            )
+            speculated.insert(0, guess)
+
+        search = AnytimeSearch(helper_bot, deadline, refined)
+    if helper_bot and speculate:
+        from bot.speculate import MultiSpeculator
+
+        speculation = MultiSpeculator(helper_bot)
 
     # Play game
     while not game.is_finished(max_turns=max_turns):
         if helper_bot:
-            suggestion = helper_bot.generate_word(game)
+            suggestion = None
+            if speculation is not None:
+                suggestion = speculation.result(game)
+                helper_bot = speculation.helper
+            if suggestion is None and search is None:
+                suggestion = helper_bot.generate_word(game)
+            elif suggestion is None:
+                search.helper = helper_bot
+                suggestion = search.best(game)
             print(f"Your helper bot thinks you should guess {suggestion}!")
+            if speculation is not None and suggestion is not None:
+                speculated = [suggestion]
+                speculation.start(
+                    game, speculated, None if search is None else search.thread
+                )
         guess = input("What is your guess?\n> ")
+        if search is not None:
+            # the search reads the game, so it stops before the guess is made
+            search.stop()
         game.attempt_guess(guess, max_turns)
         game.print_game_state()
 
+    if speculation is not None:
+        speculation.stop()
+
     # End game
     print(f"Thanks for playing {num}-wordle!")
     if game.win:
@@ -0,0 +1,132 @@
+import random
+import numpy as np
+from wordle.words import Dictionary, cached_array, get_dictionary, letter_masks
+
+
+class DisjointIndex:
+    def __init__(
+        self,
+        dictionary: Dictionary,
+        offsets: np.ndarray,
+        partners: np.ndarray,
+        owners=None,
+    ):
+        """
+        Maps each answer of dictionary to the ids of the answers that share no
+        letters with it. An id is the answer's index in words.
+
+        The partner lists are stored back to back in partners, with the
+        partners of answer i in partners[offsets[i]:offsets[i + 1]].
+        """
+        self.dictionary = dictionary
+        self.words = dictionary.answers
+        self.ids = {word: i for i, word in enumerate(self.words)}
+        self.masks = dictionary.answer_masks
+        self.offsets = offsets
+        self.partners = partners
+
+        # owners[k] is the answer that partners[k] belongs to, so (owners[k],
+        # partners[k]) is the k-th ordered pair
+        if owners is None:
+            owners = np.repeat(
+                np.arange(len(self.words), dtype=partners.dtype), np.diff(offsets)
+            )
+        self.owners = owners
+
+    @classmethod
+    def build(cls, dictionary: Dictionary) -> "DisjointIndex":
+        """
+        Builds the index by comparing the letter masks of every two answers
+        """
+        words = dictionary.answers
+        masks = dictionary.answer_masks
+        offsets = np.zeros(len(words) + 1, dtype=np.int64)
+        partners = []
+        for i in range(len(words)):
+            ids = np.nonzero((masks & masks[i]) == 0)[0]
+            partners.append(ids)
+            offsets[i + 1] = offsets[i] + len(ids)
+        partners = np.concatenate(partners).astype(np.int32)
+        return cls(dictionary, offsets, partners)
+
+    @classmethod
+    def load(cls, dictionary: Dictionary) -> "DisjointIndex":
+        """
+        Returns the index for dictionary, building it and saving it to the
+        cache the first time. Its arrays are memory-mapped, so every process
+        using the index shares them.
+        """
+        built = []
+
+        def cached(name: str) -> np.ndarray:
+            def build():
+                if len(built) == 0:
+                    built.append(cls.build(dictionary))
+                return getattr(built[0], name)
+
+            return cached_array(dictionary.cache_path(f"disjoint-{name}", "npy"), build)
+
+        return cls(dictionary, cached("offsets"), cached("partners"), cached("owners"))
+
+    def partners_of(self, word: str) -> np.ndarray:
+        """
+        Returns the ids of all answers sharing no letters with word
+        """
+        if word in self.ids:
+            i = self.ids[word]
+            return self.partners[self.offsets[i] : self.offsets[i + 1]]
+        mask = letter_masks(self.dictionary.encode([word]))[0]
+        return np.nonzero((self.masks & mask) == 0)[0]
+
+    def random_word(self) -> str:
+        """
+        Returns a random answer that has at least one partner. Raises
+        ValueError if no two answers are letter-disjoint.
+        """
+        has_partners = np.flatnonzero(np.diff(self.offsets) > 0)
+        if len(has_partners) == 0:
+            raise ValueError("No two answers are letter-disjoint")
+        return self.words[has_partners[random.randrange(len(has_partners))]]
+
+    def random_partner(self, word: str) -> str:
+        """
+        Returns a random answer sharing no letters with word
+        """
+        partners = self.partners_of(word)
+        return self.words[partners[random.randrange(len(partners))]]
+
+    def random_pair(self) -> tuple[str, str]:
+        """
+        Returns an ordered pair of letter-disjoint answers, chosen uniformly
+        from all such pairs
+        """
+        k = random.randrange(len(self.partners))
+        return self.words[self.owners[k]], self.words[self.partners[k]]
+
+    def pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns every unordered pair of letter-disjoint answers as two
+        parallel arrays of ids (first[k] < second[k])
+        """
+        pairs = cached_array(
+            self.dictionary.cache_path("disjoint-pairs", "npy"),
+            lambda: np.stack([self.owners, self.partners])[
+                :, self.owners < self.partners
+            ],
+        )
+        return pairs[0], pairs[1]
+
+
+_indexes = {}
+
+
+def disjoint_index(dictionary=None) -> DisjointIndex:
+    """
+    Returns the DisjointIndex for dictionary (the default word lists if None),
+    loading it only once per process
+    """
+    if dictionary is None:
+        dictionary = get_dictionary()
+    if dictionary.digest not in _indexes:
+        _indexes[dictionary.digest] = DisjointIndex.load(dictionary)
+    return _indexes[dictionary.digest]
@@ -0,0 +1,147 @@
+import numpy as np
+from wordle.words import Dictionary, cached_array, get_dictionary, letter_masks
+
+# A classic feedback row is packed into one pattern code, with the feedback of
+# letter i (GRAY = 0, YELLOW = 1, GREEN = 2) as the i-th base-3 digit. Example:
+# [GREEN, GRAY, YELLOW, GRAY, GRAY] is 2 * 1 + 1 * 9 = 11.
+
+
+def num_codes(length: int) -> int:
+    """
+    Returns the number of different pattern codes for words of length letters
+    """
+    return 3**length
+
+
+def win_code(length: int) -> int:
+    """
+    Returns the pattern code of guessing the answer (every letter GREEN)
+    """
+    return num_codes(length) - 1
+
+
+def feedback_codes(guess: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """
+    Batched classic feedback. Given an encoded guess of shape (length,) and
+    encoded answers of shape (n, length), returns the pattern code of the
+    guess against each answer.
+
+    This follows wordle.main.GameState.attempt_guess exactly: a letter is GREEN
+    in the right spot and YELLOW if it is anywhere else in the answer, so a
+    repeated guess letter can be YELLOW more times than it is in the answer.
+    """
+    masks = letter_masks(answers)
+    present = (masks[:, None] >> guess.astype(np.uint64)) & 1
+    levels = np.where(answers == guess, 2, present).astype(np.int32)
+    return levels @ (3 ** np.arange(len(guess), dtype=np.int32))
+
+
+def pair_codes(guesses: np.ndarray, answers: np.ndarray, duplicates=False):
+    """
+    Batched feedback of encoded guesses[k] against encoded answers[k], both
+    of shape (n, length). Returns the n pattern codes.
+
+    By default this follows GameState.attempt_guess like feedback_codes. With
+    duplicates=True it follows the standard game instead: a repeated guess
+    letter is only YELLOW as many times as the letter is in the answer at
+    positions that are not GREEN, counting from the left.
+    """
+    green = guesses == answers
+    # same[k, i, j] is whether letter i of the guess is letter j of the answer
+    same = guesses[:, :, None] == answers[:, None, :]
+    if duplicates:
+        left = (same & ~green[:, None, :]).sum(axis=2)
+        repeats = guesses[:, :, None] == guesses[:, None, :]
+        earlier = np.tril(np.ones(guesses.shape[1:] * 2, dtype=bool), -1)
+        used = (repeats & earlier & ~green[:, None, :]).sum(axis=2)
+        present = used < left
+    else:
+        present = same.any(axis=2)
+    levels = np.where(green, 2, present).astype(np.int32)
+    return levels @ (3 ** np.arange(guesses.shape[1], dtype=np.int32))
+
+
+class PatternTable:
+    def __init__(self, dictionary: Dictionary, table: np.ndarray):
+        """
+        Holds the pattern code of every guess of dictionary against every
+        answer, with table[i, j] the code of guesses[i] against answers[j].
+
+        guesses starts with the answers, so an answer's index is its index in
+        both lists.
+        """
+        self.dictionary = dictionary
+        self.guesses = dictionary.guesses
+        self.answers = dictionary.answers
+        self.table = table
+        self.guess_ids = {word: i for i, word in enumerate(self.guesses)}
+        self.encoded_answers = dictionary.encoded_answers
+        self.num_codes = num_codes(dictionary.word_length)
+        self.win_code = win_code(dictionary.word_length)
+
+    @classmethod
+    def build(cls, dictionary: Dictionary) -> "PatternTable":
+        """
+        Computes the table one guess at a time. Codes of words up to 5 letters
+        fit in a byte; longer words take 2 bytes per code.
+        """
+        encoded_guesses = dictionary.encoded_guesses
+        encoded_answers = dictionary.encoded_answers
+        if num_codes(dictionary.word_length) <= 256:
+            dtype = np.uint8
+        else:
+            dtype = np.uint16
+        table = np.empty((len(encoded_guesses), len(encoded_answers)), dtype=dtype)
+        for i in range(len(encoded_guesses)):
+            table[i] = feedback_codes(encoded_guesses[i], encoded_answers)
+        return cls(dictionary, table)
+
+    @classmethod
+    def load(cls, dictionary: Dictionary) -> "PatternTable":
+        """
+        Returns the table for dictionary, building it and saving it to the
+        cache the first time. The cached table is memory-mapped rather than
+        read, so loading it costs almost nothing and worker processes share
+        its pages.
+        """
+        table = cached_array(
+            dictionary.cache_path("patterns", "npy"),
+            lambda: cls.build(dictionary).table,
+        )
+        return cls(dictionary, table)
+
+    def codes(self, guess: str, answer_ids: np.ndarray) -> np.ndarray:
+        """
+        Returns the pattern codes of guess against the given answers. Guesses
+        missing from the table (e.g. typed by a player) are scored on the fly.
+        """
+        if guess in self.guess_ids:
+            return self.table[self.guess_ids[guess], answer_ids]
+        encoded = self.dictionary.encode([guess])[0]
+        return feedback_codes(encoded, self.encoded_answers[answer_ids])
+
+    def partition_sizes(self, guess_ids: np.ndarray, answer_ids: np.ndarray):
+        """
+        Returns a (len(guess_ids), num_codes) array counting, for each guess,
+        how many of the given answers fall in each feedback pattern. All of
+        the counting is done by a single bincount.
+        """
+        codes = self.table[np.ix_(guess_ids, answer_ids)].astype(np.int64)
+        codes += (np.arange(len(guess_ids)) * self.num_codes)[:, None]
+        counts = np.bincount(codes.ravel(), minlength=len(guess_ids) * self.num_codes)
+        return counts.reshape(len(guess_ids), self.num_codes)
+
+
+_tables = {}
+
+
+def pattern_table(dictionary=None) -> PatternTable:
+    """
+    Returns the PatternTable for dictionary (the default word lists if None),
+    loading it only once per process
+    """
+    if dictionary is None:
+        dictionary = get_dictionary()
+    if dictionary.digest not in _tables:
+        _tables[dictionary.digest] = PatternTable.load(dictionary)
+    return _tables[dictionary.digest]
@@ -1,7 +1,8 @@
 from enum import Enum
-import random
 from termcolor import cprint, colored
 import numpy as np
+from wordle.pairs import disjoint_index
+from wordle.words import get_dictionary
 
 
 class Feedback(Enum):
@@ -12,14 +13,130 @@ class Feedback(Enum):
     GREEN = 4
 
 
+# A feedback row is packed into one pattern code, with the feedback of letter
+# i as the i-th base-5 digit. Example: [GREEN, GRAY, GRAY, GRAY, HALFYELLOW]
+# is 4 * 1 + 1 * 625 = 629.
+
+
+def num_codes(length: int) -> int:
+    """
+    Returns the number of different pattern codes for words of length letters
+    """
+    return 5**length
+
+
+def win_code(length: int) -> int:
+    """
+    Returns the pattern code of a guess that is one of the two answers
+    """
+    return num_codes(length) - 1
+
+
+def feedback_code(guess: str, word1: str, word2: str) -> int:
+    """
+    Returns the pattern code for guess against the answer pair (word1, word2).
+
+    A letter in exactly one answer is GREEN or YELLOW against that answer (word2
+    wins if a letter is in both). If the guess hits letters of both answers,
+    every GREEN becomes HALFGREEN and every YELLOW becomes HALFYELLOW.
+    """
+    levels = [0] * len(guess)
+    found_in_one = False
+    found_in_two = False
+    for i, letter in enumerate(guess):
+        if letter in word1:
+            levels[i] = 4 if letter == word1[i] else 2
+            found_in_one = True
+        if letter in word2:
+            levels[i] = 4 if letter == word2[i] else 2
+            found_in_two = True
+
+    code = 0
+    for i in reversed(range(len(levels))):
+        level = levels[i]
+        if found_in_one and found_in_two and level > 0:
+            level -= 1
+        code = code * 5 + level
+    return code
+
+
+def answer_states(guess: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """
+    Given an encoded guess of shape (length,) and encoded answers of shape
+    (n, length), returns an (n, length) array holding, for each answer and guess letter, 4 if the
+    letter is in the right spot, 2 if it is elsewhere in the answer, else 0
+    """
+    green = answers == guess
+    present = (answers[:, None, :] == guess[:, None]).any(axis=2)
+    return np.where(green, 4, np.where(present, 2, 0)).astype(np.uint8)
+
+
+def feedback_codes(
+    guess: np.ndarray, answers: np.ndarray, first: np.ndarray, second: np.ndarray
+) -> np.ndarray:
+    """
+    Batched feedback_code over many answer pairs. answers is an (n, length) encoded
+    word array and (first[k], second[k]) are the row indices of the k-th pair.
+
+    The per-answer work is done once for the n answers and then gathered for
+    each pair, so scoring a guess against every pair costs a few array
+    operations instead of a Python loop per pair.
+    """
+    states = answer_states(guess, answers)
+    states1 = states[first]
+    states2 = states[second]
+    levels = np.where(states2 > 0, states2, states1)
+    both = states1.any(axis=1) & states2.any(axis=1)
+    levels = levels - (both[:, None] & (levels > 0))
+    powers = 5 ** np.arange(levels.shape[1], dtype=np.int32)
+    return levels.astype(np.int32) @ powers
+
+
+def encode_feedback(feedback: list[Feedback]) -> int:
+    """
+    Packs a row of Feedback enums into its pattern code
+    """
+    code = 0
+    for f in reversed(feedback):
+        code = code * 5 + f.value
+    return code
+
+
+def decode_feedback(code: int, length=5) -> list[Feedback]:
+    """
+    Unpacks a pattern code into a row of Feedback enums
+    """
+    feedback = []
+    for _ in range(length):
+        feedback.append(Feedback(code % 5))
+        code //= 5
+    return feedback
+
+
 class GameState:
-    def __init__(self) -> None:
+    def __init__(self, word1=None, word2=None, dictionary=None) -> None:
         """
         Initializes a new empty game state
+
+        Can optionally set either or both of the correct answers beforehand
+
+        dictionary: the wordle.words.Dictionary answers are drawn from (the
+        standard 5-letter lists if None)
         """
+        # dictionary holds the word lists this game is played with
+        if dictionary is None:
+            dictionary = get_dictionary()
+        self.dictionary = dictionary
+
         # word is a string, generated from a list
-        self.word1 = self.generate_word()
-        self.word2 = self.generate_second_word()
+        if word1 is None:
+            self.word1 = self.generate_word()
+        else:
+            self.word1 = word1
+        if word2 is None:
+            self.word2 = self.generate_second_word()
+        else:
+            self.word2 = word2
 
         # guesses has 6 rows, one for each guess. Each row is a list of chars
         # representing the letters in the guess.
@@ -51,50 +168,15 @@ class GameState:
 
     def generate_word(self) -> str:
         """
-        Returns a new valid 5-letter Wordle word
+        Returns a new valid Wordle word that can be paired with a second one
         """
-        # word list found here: https://gist.github.com/scholtes/94f3c0303ba6a7768b47583aff36654d#file-wordle-la-txt
-        # La words that can be guessed and which can be the word of the day
-        # Ta words that can be guessed but are never selected as the word of the day
-
-        # opening the file in read mode
-        word_list_file = open("public/wordle-La.txt", "r")
-
-        # reading the file
-        data = word_list_file.read()
-
-        # replacing end splitting the text
-        # when newline ('\n') is seen.
-        data_into_list = data.split("\n")
-
-        word_list_file.close()
-        return random.choice(data_into_list)
+        return disjoint_index(self.dictionary).random_word()
 
     def generate_second_word(self) -> str:
         """
-        Returns a new valid 5-letter Wordle word, without letters used in the first generated word
+        Returns a new valid Wordle word, without letters used in the first generated word
         """
-        # word list found here: https://gist.github.com/scholtes/94f3c0303ba6a7768b47583aff36654d#file-wordle-la-txt
-        # La words that can be guessed and which can be the word of the day
-        # Ta words that can be guessed but are never selected as the word of the day
-
-        # opening the file in read mode
-        word_list_file = open("public/wordle-La.txt", "r")
-
-        # reading the file
-        data = word_list_file.read()
-
-        # replacing end splitting the text
-        # when newline ('\n') is seen.
-        data_into_list = data.split("\n")
-
-        word_list_file.close()
-        chosen_word = ""
-        not_found = True
-        while (not_found):
-            chosen_word = random.choice(data_into_list)
-            not_found = not set(self.word1).isdisjoint(chosen_word)
-        return chosen_word
+        return disjoint_index(self.dictionary).random_partner(self.word1)
 
     def print_game_state(self) -> None:
         """
@@ -124,46 +206,22 @@ class GameState:
         state, and updates the feedback
         """
 
-        guesses_temp = [0 for i in range(5)]
-        feedback_temp = [Feedback.GRAY] * 5
-
-        index = 0
-        foundinone = False
-        foundintwo = False
-        for l in guess:
-            guesses_temp[index] = l
-            if l in self.word1:
-                if l == self.word1[index]:
-                    feedback_temp[index] = Feedback.GREEN
-                    foundinone = True
-                else:
-                    feedback_temp[index] = Feedback.YELLOW
-                    foundinone = True
-            if l in self.word2:
-                if l == self.word2[index]:
-                    feedback_temp[index] = Feedback.GREEN
-                    foundintwo = True
-                else:
-                    feedback_temp[index] = Feedback.YELLOW
-                    foundintwo = True
-            index += 1
-        if foundinone and foundintwo:
-            for l in range(len(feedback_temp)):
-                if feedback_temp[l] == Feedback.GREEN:
-                    feedback_temp[l] = Feedback.HALFGREEN
-                elif feedback_temp[l] == Feedback.YELLOW:
-                    feedback_temp[l] = Feedback.HALFYELLOW
+        guesses_temp = list(guess)
+        feedback_temp = decode_feedback(
+            feedback_code(guess, self.word1, self.word2), len(guess)
+        )
         self.guesses.append(guesses_temp)
         self.feedback.append(feedback_temp)
         self.turn += 1
         if guess == self.word1 or guess == self.word2:
             self.win = True
 
-    def is_finished(self) -> bool:
+    def is_finished(self, max_turns=None) -> bool:
         """
-        Returns whether the game is over or not
+        Returns whether the game is over or not. The game is over once either
+        word is guessed, or after max_turns guesses if a cap is given.
         """
-        return self.win
+        return self.win or (max_turns is not None and self.turn >= max_turns)
 
     def __repr__(self) -> str:
         """
@@ -179,13 +237,13 @@ class GameState:
         )
 
 
-def play(helper_bot=None):
+def play(helper_bot=None, dictionary=None):
     """
     Plays an interactive game of Wordle.
     """
     # Intro
     print("Welcome to Quantum Wordle!\n")
-    game = GameState()
+    game = GameState(dictionary=dictionary)
 
     # Play game
     while not game.is_finished():
@@ -0,0 +1,73 @@
+import gc
+import multiprocessing
+from wordle.pairs import disjoint_index
+from wordle.patterns import pattern_table
+from wordle.words import get_dictionary
+
+# Worker processes share the tables of a dictionary rather than each building
+# its own copy: the lexicon, the letter masks, the pattern table and the
+# disjoint index are all cached files mapped read-only into memory (see
+# wordle.words.cached_array), so the kernel keeps a single copy of their pages
+# however many processes map them.
+
+
+def attach(answers_path: str, guesses_path: str, tables=("patterns",)):
+    """
+    Maps the dictionary of the given word lists and its named tables
+    ("patterns" or "disjoint") into this process, building any of them
+    missing from the cache, and returns the dictionary
+    """
+    dictionary = get_dictionary(answers_path, guesses_path)
+    if "patterns" in tables:
+        pattern_table(dictionary)
+    if "disjoint" in tables:
+        disjoint_index(dictionary)
+    return dictionary
+
+
+def initialize_worker(answers_path, guesses_path, tables, initializer, initargs):
+    """
+    Attaches a worker process to the shared tables, then runs the pool's own
+    initializer
+    """
+    attach(answers_path, guesses_path, tables)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def worker_pool(
+    processes=None, dictionary=None, tables=("patterns",), initializer=None, initargs=()
+):
+    """
+    Returns a multiprocessing.Pool whose workers share the tables of
+    dictionary (the default word lists if None) with this process and with
+    each other.
+
+    The tables are loaded here first, so workers never race to build them.
+    Where workers are forked, they inherit everything loaded so far, and
+    gc.freeze keeps the garbage collector of a worker from writing to (and
+    so copying) the pages of the inherited objects. Elsewhere each worker
+    maps the cached files when it starts.
+    """
+    if dictionary is None:
+        dictionary = get_dictionary()
+    attach(dictionary.answers_path, dictionary.guesses_path, tables)
+    initargs = (
+        dictionary.answers_path,
+        dictionary.guesses_path,
+        tuple(tables),
+        initializer,
+        initargs,
+    )
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.Pool(processes, initialize_worker, initargs)
+
+    gc.freeze()
+    try:
+        return multiprocessing.get_context("fork").Pool(
+            processes, initialize_worker, initargs
+        )
+    finally:
+        # the workers were forked with the objects frozen; this process can
+        # collect them again
+        gc.unfreeze()
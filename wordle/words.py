@@ -0,0 +1,161 @@
+import hashlib
+import os
+import string
+import numpy as np
+from wordle.lexicon import Lexicon, build_lexicon
+
+# word list found here: https://gist.github.com/scholtes/94f3c0303ba6a7768b47583aff36654d#file-wordle-la-txt
+# La words that can be guessed and which can be the word of the day
+# Ta words that can be guessed but are never selected as the word of the day
+ANSWERS_PATH = "public/wordle-La.txt"
+GUESSES_PATH = "public/wordle-Ta.txt"
+
+# precomputed tables are stored here, keyed by a hash of the word lists they
+# were built from so editing a word list never serves a stale table
+CACHE_DIR = "cache"
+
+
+def file_digest(*paths: str) -> str:
+    """
+    Returns a short hex digest of the contents of the files at paths
+    """
+    sha = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            sha.update(f.read())
+    return sha.hexdigest()[:16]
+
+
+def encode_words(words: list[str], alphabet=string.ascii_lowercase) -> np.ndarray:
+    """
+    Returns an (n, word length) uint8 array where each entry is the letter's
+    index in the alphabet, so "abc" becomes [0, 1, 2]. This is the layout all
+    of the batched feedback kernels work on.
+
+    alphabet must be sorted. Letters missing from it (e.g. in a word typed by
+    a player) are all encoded as len(alphabet), which no word in the alphabet
+    uses.
+    """
+    if len(words) == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+    letters = np.array([ord(letter) for letter in alphabet], dtype=np.uint32)
+    data = "".join(words).encode("utf-32-le")
+    code_points = np.frombuffer(data, dtype=np.uint32)
+    codes = np.searchsorted(letters, code_points)
+    found = letters[np.minimum(codes, len(letters) - 1)] == code_points
+    codes = np.where(found, codes, len(letters))
+    return codes.astype(np.uint8).reshape(len(words), -1)
+
+
+def letter_masks(encoded: np.ndarray) -> np.ndarray:
+    """
+    Returns a bit mask per encoded word with bit i set if the word contains
+    the i-th letter of the alphabet. Two words share no letters exactly when
+    the AND of their masks is 0.
+    """
+    bits = np.left_shift(np.uint64(1), encoded.astype(np.uint64))
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+def cached_array(path: str, build) -> np.ndarray:
+    """
+    Returns the array cached at path, memory-mapped read-only so that every
+    process using it shares one copy of its pages. The first time, the array
+    is made by calling build and saved.
+    """
+    if not os.path.exists(path):
+        array = build()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # write to a temporary file first so a concurrent reader never sees a
+        # half-written array
+        tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, array)
+        os.replace(tmp_path, path)
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # empty arrays can not be memory-mapped
+        return np.load(path)
+
+
+class Dictionary:
+    def __init__(self, answers_path=ANSWERS_PATH, guesses_path=GUESSES_PATH):
+        """
+        A pair of word lists for one variant of Wordle: the answers, which
+        can be the word of the day, and the words that can only be guessed.
+        Every word must have the same length, which can be anything. Words
+        are normalized and deduped, and a word in both lists is an answer
+        (see wordle.lexicon.ingest).
+
+        guesses starts with the answers, so an answer's index is also its
+        index in guesses. Every table precomputed for a dictionary is cached
+        separately, keyed by digest.
+        """
+        self.answers_path = answers_path
+        self.guesses_path = guesses_path
+        self.digest = file_digest(answers_path, guesses_path)
+
+        # the word lists are validated and packed into a lexicon file once
+        # (see wordle.lexicon), which every later run maps into memory
+        lexicon_path = self.cache_path("lexicon", "bin")
+        if not os.path.exists(lexicon_path):
+            build_lexicon(answers_path, guesses_path, lexicon_path)
+        self.lexicon = Lexicon(lexicon_path)
+
+        self.answers = self.lexicon.answers()
+        self.guesses = self.lexicon.guesses()
+        # every guess as a set, which bots copy instead of hashing every word
+        # again (worker processes forked by wordle.shared.worker_pool share it)
+        self.guess_set = frozenset(self.guesses)
+        self.word_length = self.lexicon.word_length
+
+        # every letter used by the words, sorted. Letter masks are 64 bits,
+        # one of which is kept for letters outside the alphabet.
+        self.alphabet = self.lexicon.alphabet
+        if len(self.alphabet) > 63:
+            raise ValueError("Alphabets of over 63 letters are not supported")
+
+        # the encoded words, straight from the lexicon (see encode_words)
+        self.encoded_guesses = self.lexicon.codes
+        self.encoded_answers = self.lexicon.codes[: len(self.answers)]
+
+        # the letter mask of every word (see letter_masks), cached and mapped
+        # into memory like the lexicon
+        self.guess_masks = cached_array(
+            self.cache_path("masks", "npy"),
+            lambda: letter_masks(self.encoded_guesses),
+        )
+        self.answer_masks = self.guess_masks[: len(self.answers)]
+
+    def encode(self, words: list[str]) -> np.ndarray:
+        """
+        Encodes words with this dictionary's alphabet (see encode_words)
+        """
+        return encode_words(words, self.alphabet)
+
+    def letter_index(self, letter: str) -> int:
+        """
+        Returns the code of letter in encoded words (see encode_words)
+        """
+        index = self.alphabet.find(letter)
+        return len(self.alphabet) if index == -1 else index
+
+    def cache_path(self, name: str, extension: str) -> str:
+        """
+        Returns where the table called name is cached for this dictionary
+        """
+        return os.path.join(CACHE_DIR, f"{name}-{self.digest}.{extension}")
+
+
+_dictionaries = {}
+
+
+def get_dictionary(answers_path=ANSWERS_PATH, guesses_path=GUESSES_PATH):
+    """
+    Returns the Dictionary for the given word lists, reading them only once
+    per process
+    """
+    key = (answers_path, guesses_path)
+    if key not in _dictionaries:
+        _dictionaries[key] = Dictionary(answers_path, guesses_path)
+    return _dictionaries[key]